@@ -0,0 +1,115 @@
+import gc
+import time
+import tracemalloc
+
+import ast_nodes
+from program_generator import generate_program
+
+NUM_STMTS = 100_000
+
+
+class DictConstant:
+    def __init__(self, value):
+        self.value = value
+
+
+class DictName:
+    def __init__(self, id):
+        self.id = id
+
+
+class DictOp:
+    pass
+
+
+class DictUnaryOp:
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+
+class DictBinOp:
+    def __init__(self, left, op, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class DictCall:
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+
+
+class DictExpr:
+    def __init__(self, value):
+        self.value = value
+
+
+class DictAssign:
+    def __init__(self, targets, value):
+        self.targets = targets
+        self.value = value
+
+
+class DictModule:
+    def __init__(self, body):
+        self.body = body
+
+
+def to_dict_nodes(module):
+    def convert(node):
+        match node:
+            case ast_nodes.Constant(value=value):
+                return DictConstant(value)
+            case ast_nodes.Name(id=var):
+                return DictName(var)
+            case ast_nodes.UnaryOp(operand=operand):
+                return DictUnaryOp(DictOp(), convert(operand))
+            case ast_nodes.BinOp(left=left, right=right):
+                return DictBinOp(convert(left), DictOp(), convert(right))
+            case ast_nodes.Call(func=func, args=args):
+                return DictCall(convert(func), [convert(arg) for arg in args])
+            case ast_nodes.Expr(value=value):
+                return DictExpr(convert(value))
+            case ast_nodes.Assign(targets=targets, value=value):
+                return DictAssign([convert(t) for t in targets], convert(value))
+
+    return DictModule([convert(stmt) for stmt in module.body])
+
+
+def count_nodes(module):
+    count = 0
+    stack = list(module.body)
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node._children())
+    return count
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    tree = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, size
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, seed=9)
+    nodes = count_nodes(program)
+    _, slotted_bytes = measure(lambda: generate_program(NUM_STMTS, max_depth=4, seed=9))
+    _, dict_bytes = measure(lambda: to_dict_nodes(program))
+    print(f"{NUM_STMTS} statements, {nodes} nodes")
+    print(f"  plain classes with __dict__  {dict_bytes / nodes:6.1f} bytes/node")
+    print(f"  ast_nodes with __slots__     {slotted_bytes / nodes:6.1f} bytes/node")
+    start = time.perf_counter()
+    hash(program)
+    first_hash = time.perf_counter() - start
+    start = time.perf_counter()
+    hash(program)
+    cached_hash = time.perf_counter() - start
+    print(f"  first hash(module)           {first_hash:8.4f}s")
+    print(f"  cached hash(module)          {cached_hash:8.6f}s")
@@ -0,0 +1,45 @@
+import time
+
+from batch_interpreter_var import BatchInterpreterVar
+from closure_interpreter_var import ClosureInterpreterVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+
+NUM_STMTS = 200
+NUM_STREAMS = 5000
+
+
+def time_separate(program, streams):
+    start = time.perf_counter()
+    for stream in streams:
+        InterpreterVar(program, BufferInput(stream), ListOutput()).interp()
+    return time.perf_counter() - start
+
+
+def time_closures(program, streams):
+    start = time.perf_counter()
+    compiled = ClosureInterpreterVar(program)
+    for stream in streams:
+        compiled.run(stream)
+    return time.perf_counter() - start
+
+
+def time_batch(program, streams):
+    start = time.perf_counter()
+    BatchInterpreterVar(program).run(streams)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, input_rate=0.2, seed=5)
+    streams = [list(range(lane, lane + 400)) for lane in range(NUM_STREAMS)]
+    print(f"{NUM_STMTS} statements, {NUM_STREAMS} input streams")
+    separate = time_separate(program, streams)
+    closures = time_closures(program, streams)
+    batch = time_batch(program, streams)
+    print(f"  InterpreterVar per stream         {separate:8.3f}s")
+    print(f"  ClosureInterpreterVar per stream {closures:8.3f}s")
+    print(
+        f"  BatchInterpreterVar              {batch:8.3f}s  ({separate / batch:.1f}x)"
+    )
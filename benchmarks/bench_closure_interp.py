@@ -0,0 +1,43 @@
+import contextlib
+import io
+import sys
+import time
+
+from closure_interpreter_var import ClosureInterpreterVar
+from interpreter_var import InterpreterVar
+from program_generator import generate_program
+
+NUM_STMTS = 500
+NUM_RUNS = 200
+
+
+def input_sets(num_runs, length=200):
+    return [list(range(run, run + length)) for run in range(num_runs)]
+
+
+def time_walker(program, inputs_list):
+    start = time.perf_counter()
+    for inputs in inputs_list:
+        sys.stdin = io.StringIO("".join(f"{n}\n" for n in inputs))
+        with contextlib.redirect_stdout(io.StringIO()):
+            InterpreterVar(program).interp()
+    sys.stdin = sys.__stdin__
+    return time.perf_counter() - start
+
+
+def time_closures(program, inputs_list):
+    start = time.perf_counter()
+    compiled = ClosureInterpreterVar(program)
+    for inputs in inputs_list:
+        compiled.run(inputs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, seed=1)
+    inputs_list = input_sets(NUM_RUNS)
+    print(f"{NUM_STMTS} statements, {NUM_RUNS} runs")
+    walker = time_walker(program, inputs_list)
+    closures = time_closures(program, inputs_list)
+    print(f"  InterpreterVar        {walker:8.3f}s")
+    print(f"  ClosureInterpreterVar {closures:8.3f}s  ({walker / closures:.1f}x)")
@@ -0,0 +1,61 @@
+import random
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from compiler_var import CompilerVar
+from dead_stores import eliminate_dead_stores
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+NUM_STMTS = 20_000
+WINDOW = 16
+
+
+class IntOnlyPartialEval(PartialEvalVar):
+    def _bind(self, env, var, value):
+        if isinstance(value, int):
+            env[var] = value
+        else:
+            env.pop(var, None)
+
+
+def copy_heavy_program(num_stmts, window, seed):
+    rng = random.Random(seed)
+    names = [f"v{index}" for index in range(window)]
+    body = [Assign([Name(var)], Call(Name("input_int"), [])) for var in names]
+    for index in range(num_stmts):
+        recent = names[-window:]
+        source = Name(rng.choice(recent))
+        roll = rng.random()
+        if roll < 0.5:
+            exp = source
+        elif roll < 0.8:
+            op = Add() if rng.random() < 0.5 else Sub()
+            exp = BinOp(source, op, Name(rng.choice(recent)))
+        elif roll < 0.9:
+            exp = BinOp(source, Add(), Constant(1))
+        else:
+            body.append(Expr(Call(Name("print"), [source])))
+            continue
+        names.append(f"t{index}")
+        body.append(Assign([Name(names[-1])], exp))
+    body.append(Expr(Call(Name("print"), [Name(names[-1])])))
+    return Module(body)
+
+
+def report(label, module):
+    program = CompilerVar().compile(eliminate_dead_stores(module))
+    print(
+        f"  {label:<24}{len(program.body):10,d} instrs"
+        f"{program.stack_space:10,d} stack bytes"
+    )
+
+
+if __name__ == "__main__":
+    workloads = [
+        ("generated", generate_program(NUM_STMTS, seed=5)),
+        ("copy heavy", copy_heavy_program(NUM_STMTS, WINDOW, seed=5)),
+    ]
+    for label, program in workloads:
+        print(f"{label}: {len(program.body)} statements, pe + dse + compile")
+        report("ints only", IntOnlyPartialEval(program).pe())
+        report("copy propagation", PartialEvalVar(program).pe())
@@ -0,0 +1,43 @@
+import gc
+import time
+
+from compiler_var import CompilerVar
+from dead_stores import eliminate_dead_stores
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+NUM_STMTS = 20_000
+SEEDS = range(3)
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def report(label, module):
+    program = CompilerVar().compile(module)
+    print(
+        f"  {label:<16}{len(module.body):8,d} stmts"
+        f"{len(program.body):10,d} instrs{program.stack_space:10,d} stack bytes"
+    )
+
+
+if __name__ == "__main__":
+    for seed in SEEDS:
+        program = generate_program(NUM_STMTS, seed=seed)
+        residual = PartialEvalVar(program).pe()
+        pruned = eliminate_dead_stores(residual)
+        print(f"seed {seed}")
+        report("pe", residual)
+        report("pe + dse", pruned)
+        seconds = timed(lambda: eliminate_dead_stores(residual))
+        print(f"  eliminate_dead_stores {seconds:.3f}s")
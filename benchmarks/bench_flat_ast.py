@@ -0,0 +1,62 @@
+import gc
+import time
+import tracemalloc
+
+from compiler_var import CompilerVar
+from flat_ast import to_flat, to_module
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+NUM_STMTS = 100_000
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def allocated(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def interpreter(inputs):
+    return InterpreterVar(None, BufferInput(inputs), ListOutput())
+
+
+if __name__ == "__main__":
+    program, tree_bytes = allocated(
+        lambda: generate_program(NUM_STMTS, max_depth=4, seed=5)
+    )
+    flat, flat_bytes = allocated(lambda: to_flat(program))
+    inputs = list(range(NUM_STMTS))
+    print(f"{NUM_STMTS} statements, {len(flat)} nodes")
+    print(f"  Module       {tree_bytes / 2**20:8.1f} MiB")
+    print(f"  FlatModule   {flat_bytes / 2**20:8.1f} MiB")
+    print(f"  ratio        {tree_bytes / flat_bytes:8.1f}x")
+    rows = [
+        ("to_flat", lambda: to_flat(program)),
+        ("to_module", lambda: to_module(flat)),
+        ("interp", lambda: interpreter(inputs).interp_stmts(program.body)),
+        ("interp_flat", lambda: interpreter(inputs).interp_flat(flat)),
+        ("pe", lambda: PartialEvalVar(program).pe()),
+        ("pe_flat", lambda: PartialEvalVar(program).pe_flat(flat)),
+        ("rco", lambda: CompilerVar().remove_complex_operands(program)),
+        ("rco_flat", lambda: CompilerVar().remove_complex_operands_flat(flat)),
+    ]
+    for label, fn in rows:
+        print(f"  {label:<13}{timed(fn):8.3f}s")
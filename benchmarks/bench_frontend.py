@@ -0,0 +1,57 @@
+import ast
+import gc
+import tempfile
+import time
+from pathlib import Path
+
+from frontend import iter_modules, parse_file, parse_source, unparse
+from program_generator import generate_program
+
+NUM_STMTS = 100_000
+NUM_FILES = 50
+DEEP_TERMS = 200_000
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def report(label, seconds, lines):
+    print(f"  {label:<32}{seconds:8.3f}s {lines / seconds:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    source = unparse(generate_program(NUM_STMTS, max_depth=4, seed=7))
+    lines = source.count("\n")
+    deep = "x = " + " + ".join(["1"] * DEEP_TERMS) + "\nprint(x)\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.py"
+        path.write_text(source)
+        per_file = NUM_STMTS // NUM_FILES
+        paths = []
+        for index in range(NUM_FILES):
+            small = Path(tmp) / f"small{index}.py"
+            small.write_text(unparse(generate_program(per_file, seed=index)))
+            paths.append(small)
+        print(f"{lines} lines of generated LVar source")
+        report("ast.parse only (whole text)", timed(lambda: ast.parse(source)), lines)
+        report("parse_source", timed(lambda: parse_source(source)), lines)
+        report("parse_file", timed(lambda: parse_file(path)), lines)
+        report(
+            f"iter_modules over {NUM_FILES} files",
+            timed(lambda: list(iter_modules(paths))),
+            per_file * NUM_FILES,
+        )
+    print(f"one statement with a {DEEP_TERMS}-term chain")
+    print(
+        f"  parse_source                    {timed(lambda: parse_source(deep)):8.3f}s"
+    )
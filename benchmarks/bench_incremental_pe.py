@@ -0,0 +1,59 @@
+import gc
+import random
+import time
+
+from ast_nodes import Module
+from incremental_partial_eval import IncrementalPartialEvalVar
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+SIZES = [1_000, 10_000, 50_000]
+EDITS = 200
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def random_edits(num_stmts, seed):
+    rng = random.Random(seed)
+    donors = generate_program(EDITS, seed=seed + 1).body
+    return [(rng.randrange(num_stmts), donor) for donor in donors]
+
+
+def replay(incremental, edits):
+    reevaluated = 0
+    for index, stmt in edits:
+        incremental.replace(index, stmt)
+        reevaluated += incremental.reevaluated
+    return reevaluated
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        program = generate_program(size, seed=size)
+        edits = random_edits(size, seed=size)
+        full = timed(lambda: PartialEvalVar(program).pe())
+        build = timed(lambda: IncrementalPartialEvalVar(program), repeat=1)
+        incremental = IncrementalPartialEvalVar(program)
+        start = time.perf_counter()
+        reevaluated = replay(incremental, edits)
+        per_edit = (time.perf_counter() - start) / len(edits)
+        body = list(program.body)
+        for index, stmt in edits:
+            body[index] = stmt
+        assert incremental.pe() == PartialEvalVar(Module(body)).pe()
+        print(f"{size} statements")
+        print(f"  full pe()                 {full * 1e3:10.2f}ms")
+        print(f"  incremental initial run   {build * 1e3:10.2f}ms")
+        print(f"  one-statement edit        {per_edit * 1e3:10.2f}ms")
+        print(f"  statements re-evaluated   {reevaluated / len(edits):10.1f} per edit")
@@ -0,0 +1,36 @@
+import time
+
+from ast_nodes import Add, Assign, BinOp, Constant, Expr, Module, Name
+from interpreter_int import InterpeterInt
+from interpreter_var import InterpreterVar
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+
+def program_constant_exprs(n) -> Module:
+    return Module([Expr(Constant(i)) for i in range(n)])
+
+
+def program_counter(n) -> Module:
+    step = Assign([Name("x")], BinOp(Name("x"), Add(), Constant(1)))
+    return Module([Assign([Name("x")], Constant(0))] + [step] * (n - 1))
+
+
+def time_interp(interp_class, program):
+    start = time.perf_counter()
+    interp_class(program).interp()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("Statement execution scaling (per-statement cost should stay flat)")
+    for label, interp_class, build in [
+        ("InterpeterInt", InterpeterInt, program_constant_exprs),
+        ("InterpreterVar", InterpreterVar, program_counter),
+    ]:
+        print(label)
+        for n in SIZES:
+            elapsed = time_interp(interp_class, build(n))
+            print(
+                f"  n={n:>8}  total={elapsed:8.3f}s  per_stmt={elapsed / n * 1e9:8.1f}ns"
+            )
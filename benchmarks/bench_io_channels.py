@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import sys
+import time
+from array import array
+
+from ast_nodes import Add, BinOp, Call, Expr, Module, Name
+from interpreter_var import InterpreterVar
+from io_channels import BufferedOutput, BufferInput
+
+NUM_STMTS = 200_000
+
+
+def program_echo(n) -> Module:
+    read = Call(Name("input_int"), [])
+    return Module([Expr(Call(Name("print"), [BinOp(read, Add(), read)]))] * n)
+
+
+def time_stdio(program, values):
+    sys.stdin = io.StringIO("".join(f"{n}\n" for n in values))
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        InterpreterVar(program).interp()
+        elapsed = time.perf_counter() - start
+    sys.stdin = sys.__stdin__
+    return elapsed
+
+
+def time_buffered(program, values):
+    with open(os.devnull, "w") as sink:
+        start = time.perf_counter()
+        InterpreterVar(program, BufferInput(values), BufferedOutput(sink)).interp()
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    program = program_echo(NUM_STMTS)
+    values = array("q", range(2 * NUM_STMTS))
+    print(f"{NUM_STMTS} print statements, {len(values)} input_int() calls")
+    stdio = time_stdio(program, values)
+    buffered = time_buffered(program, values)
+    print(f"  input()/print()             {stdio:8.3f}s")
+    print(f"  BufferInput/BufferedOutput  {buffered:8.3f}s  ({stdio / buffered:.1f}x)")
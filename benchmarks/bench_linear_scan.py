@@ -0,0 +1,54 @@
+import gc
+import time
+
+from compiler_var import CompilerVar
+from program_generator import generate_program
+from x86_ast import Deref, Instr
+
+WORKLOADS = [
+    ("1k stmts", dict(num_stmts=1_000, num_vars=32, max_depth=4, seed=1)),
+    ("5k stmts", dict(num_stmts=5_000, num_vars=32, max_depth=4, seed=2)),
+    ("20k stmts", dict(num_stmts=20_000, num_vars=32, max_depth=4, seed=3)),
+]
+ALLOCATORS = ["stack", "linear_scan", "graph"]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def memory_operands(program):
+    return sum(
+        isinstance(arg, Deref) and instr.op not in ("pushq", "popq")
+        for instr in program.body
+        if isinstance(instr, Instr)
+        for arg in instr.args
+    )
+
+
+if __name__ == "__main__":
+    for label, params in WORKLOADS:
+        module = generate_program(**params)
+        print(label)
+        for allocator in ALLOCATORS:
+            program = CompilerVar().compile(module, allocator=allocator)
+            seconds = timed(
+                lambda: CompilerVar().compile(module, allocator=allocator),
+                repeat=1 if params["num_stmts"] >= 20_000 else 3,
+            )
+            spills = sum(isinstance(home, Deref) for home in program.homes.values())
+            print(
+                f"  {allocator:<12} {seconds * 1e3:9.1f} ms"
+                f" {len(program.homes):>7,d} vars {spills:>7,d} spilled"
+                f" {memory_operands(program):>7,d} mem operands"
+                f" {len(program.body):>7,d} instrs"
+            )
@@ -0,0 +1,70 @@
+import gc
+import sys
+import time
+
+from compiler_var import CompilerVar
+from liveness import read_write_sets, uncover_live
+from program_generator import generate_program
+
+SIZES = [1_000, 10_000, 100_000, 300_000]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def set_liveness(program):
+    body = program.body
+    live_after = [None] * len(body)
+    live = frozenset()
+    for index in range(len(body) - 1, -1, -1):
+        live_after[index] = live
+        reads, writes = read_write_sets(body[index])
+        live = (live - writes) | reads
+    return live_after
+
+
+def selected_program(num_instrs):
+    compiler = CompilerVar()
+    module = generate_program(num_instrs // 3, num_vars=32, seed=num_instrs)
+    program = compiler.select_instructions(compiler.remove_complex_operands(module))
+    del program.body[num_instrs:]
+    return program
+
+
+def retained_bytes(live_after):
+    seen = set()
+    total = sys.getsizeof(live_after)
+    for value in live_after:
+        if id(value) not in seen:
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+    return total
+
+
+if __name__ == "__main__":
+    print("uncover_live over selected instructions")
+    print(
+        f"  {'instrs':>8} {'sets ns/instr':>14} {'bits ns/instr':>14}"
+        f" {'sets bytes':>12} {'bits bytes':>12}"
+    )
+    for size in SIZES:
+        program = selected_program(size)
+        repeat = 1 if size >= 100_000 else 3
+        sets = timed(lambda: set_liveness(program), repeat)
+        bits = timed(lambda: uncover_live(program), repeat)
+        print(
+            f"  {len(program.body):>8,d} {sets / len(program.body) * 1e9:>14.0f}"
+            f" {bits / len(program.body) * 1e9:>14.0f}"
+            f" {retained_bytes(set_liveness(program)):>12,d}"
+            f" {retained_bytes(uncover_live(program).live_after):>12,d}"
+        )
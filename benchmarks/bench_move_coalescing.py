@@ -0,0 +1,44 @@
+from compiler_var import CompilerVar
+from linear_scan import linear_scan
+from liveness import uncover_live
+from program_generator import generate_program
+from register_allocation import build_interference, color_graph, spill_costs
+from x86_ast import Instr
+
+WORKLOADS = [
+    ("shallow", dict(num_stmts=2_000, num_vars=8, max_depth=2, seed=1)),
+    ("deep", dict(num_stmts=2_000, num_vars=16, max_depth=5, seed=2)),
+    ("many vars", dict(num_stmts=2_000, num_vars=64, max_depth=3, seed=3)),
+    ("input heavy", dict(num_stmts=2_000, input_rate=0.4, print_rate=0.4, seed=4)),
+]
+
+
+class UnbiasedCompiler(CompilerVar):
+    def allocate_registers(self, program):
+        graph = build_interference(program, uncover_live(program))
+        return self._place_homes(program, *color_graph(graph, spill_costs(program)))
+
+    def allocate_registers_linear(self, program):
+        return self._place_homes(program, *linear_scan(program))
+
+
+def count_movq(program):
+    return sum(
+        isinstance(instr, Instr) and instr.op == "movq" for instr in program.body
+    )
+
+
+if __name__ == "__main__":
+    print("dynamic movq count (straight-line code: every instruction runs once)")
+    for label, params in WORKLOADS:
+        module = generate_program(**params)
+        print(label)
+        for allocator in ("graph", "linear_scan"):
+            before = UnbiasedCompiler().compile(module, allocator=allocator)
+            after = CompilerVar().compile(module, allocator=allocator)
+            print(
+                f"  {allocator:<12} {count_movq(before):>7,d} ->"
+                f" {count_movq(after):>7,d} movq"
+                f" ({1 - count_movq(after) / count_movq(before):.0%} fewer),"
+                f" {len(before.body):>7,d} -> {len(after.body):>7,d} instrs"
+            )
@@ -0,0 +1,88 @@
+import gc
+import time
+import tracemalloc
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, USub
+from ast_nodes import UnaryOp
+from compiler_var import CompilerVar
+from node_factory import NodeFactory, count_nodes
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+DOUBLING_DEPTH = 12
+DOUBLING_STMTS = 20
+GENERATED_STMTS = 50_000
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def allocated(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def doubling_exp(depth, leaf):
+    if depth == 0:
+        return leaf()
+    return BinOp(doubling_exp(depth - 1, leaf), Add(), doubling_exp(depth - 1, leaf))
+
+
+def doubling_program(depth, num_stmts):
+    body = [Assign([Name("x0")], Constant(1))]
+    for i in range(1, num_stmts):
+        leaf = lambda: BinOp(UnaryOp(USub(), Constant(8)), Add(), Name(f"x{i - 1}"))
+        body.append(Assign([Name(f"x{i}")], doubling_exp(depth, leaf)))
+    body.append(Expr(Call(Name("print"), [Name(f"x{num_stmts - 1}")])))
+    return Module(body)
+
+
+def report(label, build):
+    print(label)
+    tree, tree_bytes = allocated(build)
+    dag, dag_bytes = allocated(lambda: NodeFactory().intern(tree))
+    total, unique = count_nodes(dag)
+    print(f"  nodes: {total} in the tree, {unique} after interning")
+    print(
+        f"  memory: {tree_bytes / 2**20:.1f} MiB tree, {dag_bytes / 2**20:.1f} MiB DAG"
+    )
+    print(f"  intern             {timed(lambda: NodeFactory().intern(tree)):8.3f}s")
+    rows = [
+        ("pe tree", lambda: PartialEvalVar(tree).pe()),
+        ("pe DAG memoized", lambda: PartialEvalVar(dag, memoize=True).pe()),
+        ("rco tree", lambda: CompilerVar().remove_complex_operands(tree)),
+        (
+            "rco DAG memoized",
+            lambda: CompilerVar(memoize=True).remove_complex_operands(dag),
+        ),
+    ]
+    for name, fn in rows:
+        print(f"  {name:<19}{timed(fn):8.3f}s")
+    plain = len(CompilerVar().remove_complex_operands(tree).body)
+    shared = len(CompilerVar(memoize=True).remove_complex_operands(dag).body)
+    print(f"  rco statements: {plain} plain, {shared} memoized")
+
+
+if __name__ == "__main__":
+    report(
+        f"{DOUBLING_STMTS} statements of depth-{DOUBLING_DEPTH} doubling trees",
+        lambda: doubling_program(DOUBLING_DEPTH, DOUBLING_STMTS),
+    )
+    report(
+        f"generate_program({GENERATED_STMTS}, num_vars=2, max_depth=4)",
+        lambda: generate_program(GENERATED_STMTS, num_vars=2, max_depth=4, seed=3),
+    )
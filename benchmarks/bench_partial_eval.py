@@ -0,0 +1,62 @@
+import gc
+import time
+
+from ast_nodes import Add, BinOp, Sub, USub, UnaryOp
+from compiler_var import CompilerVar
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+WORKLOADS = [
+    ("shallow", dict(num_stmts=20_000, max_depth=3, seed=1)),
+    ("deep", dict(num_stmts=20_000, max_depth=6, seed=2)),
+    ("input heavy", dict(num_stmts=20_000, max_depth=4, input_rate=0.4, seed=3)),
+]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+class PairwiseFoldingPE(PartialEvalVar):
+    def linear_neg(self, value):
+        if isinstance(value, int):
+            return -value
+        return UnaryOp(USub(), value)
+
+    def linear_add(self, left, right):
+        if isinstance(left, int) and isinstance(right, int):
+            return left + right
+        return BinOp(self._to_exp(left), Add(), self._to_exp(right))
+
+    def linear_sub(self, left, right):
+        if isinstance(left, int) and isinstance(right, int):
+            return left - right
+        return BinOp(self._to_exp(left), Sub(), self._to_exp(right))
+
+
+def instruction_count(module):
+    return len(CompilerVar().compile(module).body)
+
+
+if __name__ == "__main__":
+    for label, options in WORKLOADS:
+        program = generate_program(**options)
+        pairwise = PairwiseFoldingPE(program).pe()
+        linear = PartialEvalVar(program).pe()
+        print(f"{label}: {options['num_stmts']} statements")
+        print(f"  instructions, no pe        {instruction_count(program):10,d}")
+        print(f"  instructions, pairwise pe  {instruction_count(pairwise):10,d}")
+        print(f"  instructions, linear pe    {instruction_count(linear):10,d}")
+        print(
+            f"  pe time pairwise {timed(lambda: PairwiseFoldingPE(program).pe()):.3f}s"
+            f"  linear {timed(lambda: PartialEvalVar(program).pe()):.3f}s"
+        )
@@ -0,0 +1,63 @@
+import gc
+import time
+
+from compiler_var import CompilerVar
+from peephole import PeepholeOptimizer
+from program_generator import generate_program
+
+CORPUS = [
+    generate_program(
+        1_000, num_vars=8 + 8 * (seed % 4), max_depth=2 + seed % 4, seed=seed
+    )
+    for seed in range(10)
+]
+ALLOCATORS = ["stack", "linear_scan", "graph"]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def patched_corpus(allocator):
+    programs = []
+    for module in CORPUS:
+        compiler = CompilerVar()
+        allocate = {
+            "stack": compiler.assign_homes,
+            "linear_scan": compiler.allocate_registers_linear,
+            "graph": compiler.allocate_registers,
+        }[allocator]
+        selected = compiler.select_instructions(
+            compiler.remove_complex_operands(module)
+        )
+        programs.append(compiler.patch_instructions(allocate(selected)))
+    return programs
+
+
+if __name__ == "__main__":
+    for allocator in ALLOCATORS:
+        programs = patched_corpus(allocator)
+        optimizer = PeepholeOptimizer()
+        optimized = [optimizer.optimize(program) for program in programs]
+        before = sum(len(program.body) for program in programs)
+        after = sum(len(program.body) for program in optimized)
+        seconds = timed(
+            lambda: [PeepholeOptimizer().optimize(program) for program in programs]
+        )
+        print(
+            f"{allocator}: {before:,d} -> {after:,d} instrs"
+            f" ({1 - after / before:.1%} fewer),"
+            f" {seconds / before * 1e9:.0f} ns/instr,"
+            f" {optimizer.passes / len(programs):.1f} passes per program"
+        )
+        for name, count in optimizer.stats.items():
+            print(f"  {name:<18} {count:>7,d}")
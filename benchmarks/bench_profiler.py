@@ -0,0 +1,48 @@
+import gc
+import time
+
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from profiler import NodeProfiler
+from program_generator import generate_program
+
+NUM_STMTS = 50_000
+
+
+def timed(make_interp, repeat=5):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            interp = make_interp()
+            start = time.perf_counter()
+            interp.interp()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def plain(program):
+    return InterpreterVar(program, BufferInput(range(10**6)), ListOutput())
+
+
+def detached(program):
+    return NodeProfiler.detach(NodeProfiler().attach(plain(program)))
+
+
+def attached(program):
+    return NodeProfiler().attach(plain(program))
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, seed=8)
+    base = timed(lambda: plain(program))
+    print(f"{NUM_STMTS} statements, best of 5")
+    for label, make in [
+        ("profiling never attached", plain),
+        ("profiler attached then detached", detached),
+        ("profiling on", attached),
+    ]:
+        elapsed = timed(lambda: make(program))
+        print(f"  {label:<33}{elapsed:8.3f}s  ({elapsed / base:.2f}x)")
@@ -0,0 +1,52 @@
+import time
+
+from closure_interpreter_var import ClosureInterpreterVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+from py_codegen import CodeCache, PyCodegenVar
+
+NUM_STMTS = 2000
+NUM_RUNS = 100
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_walker(program, inputs):
+    for _ in range(NUM_RUNS):
+        InterpreterVar(program, BufferInput(inputs), ListOutput()).interp()
+
+
+def run_closures(program, inputs):
+    compiled = ClosureInterpreterVar(program)
+    for _ in range(NUM_RUNS):
+        compiled.run(inputs)
+
+
+def run_codegen(program, inputs, cache):
+    compiled = PyCodegenVar(program, cache=cache)
+    for _ in range(NUM_RUNS):
+        compiled.run(inputs)
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, seed=7)
+    inputs = list(range(1000))
+    cache = CodeCache()
+    print(f"{NUM_STMTS} statements")
+    miss = timed(lambda: cache.get(program))
+    hit = timed(lambda: cache.get(program))
+    print(f"  cache miss (translate + compile()) {miss:8.4f}s")
+    print(f"  cache hit                          {hit:8.4f}s")
+    print(f"{NUM_RUNS} runs")
+    rows = [
+        ("InterpreterVar", lambda: run_walker(program, inputs)),
+        ("ClosureInterpreterVar", lambda: run_closures(program, inputs)),
+        ("PyCodegenVar", lambda: run_codegen(program, inputs, cache)),
+    ]
+    for label, fn in rows:
+        print(f"  {label:<22}{timed(fn):8.3f}s")
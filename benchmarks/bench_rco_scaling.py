@@ -0,0 +1,69 @@
+import gc
+import time
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from compiler_var import CompilerVar
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def left_chain(size):
+    exp = Name("x")
+    for index in range(size):
+        exp = BinOp(exp, Add() if index % 2 else Sub(), Constant(index))
+    return Module([Assign([Name("y")], exp)])
+
+
+def right_chain(size):
+    exp = Name("x")
+    for index in range(size):
+        exp = BinOp(Constant(index), Add() if index % 2 else Sub(), exp)
+    return Module([Assign([Name("y")], exp)])
+
+
+def balanced(size):
+    level = [Name("x") for _ in range(size + 1)]
+    while len(level) > 1:
+        pairs = zip(level[::2], level[1::2])
+        paired = [BinOp(left, Add(), right) for left, right in pairs]
+        level = paired + level[len(paired) * 2 :]
+    return Module([Expr(Call(Name("print"), [level[0]]))])
+
+
+def wide(size):
+    exp = BinOp(BinOp(Name("x"), Add(), Constant(1)), Sub(), Name("y"))
+    return Module([Assign([Name("x")], exp) for _ in range(size // 2)])
+
+
+if __name__ == "__main__":
+    shapes = [
+        ("left chain", left_chain),
+        ("right chain", right_chain),
+        ("balanced", balanced),
+        ("wide", wide),
+    ]
+    print("remove_complex_operands, ns per BinOp")
+    for label, build in shapes:
+        cells = []
+        for size in SIZES:
+            module = build(size)
+            seconds = timed(
+                lambda: CompilerVar().remove_complex_operands(module),
+                repeat=1 if size >= 1_000_000 else 3,
+            )
+            cells.append(f"{seconds / size * 1e9:10.0f}")
+        print(f"  {label:<12}" + "".join(cells))
+    print("  sizes       " + "".join(f"{size:>10,d}" for size in SIZES))
@@ -0,0 +1,69 @@
+import gc
+import time
+
+from compiler_var import CompilerVar
+from program_generator import generate_program
+from x86_ast import Deref, Instr
+
+WORKLOADS = [
+    ("few vars", dict(num_stmts=2_000, num_vars=4, max_depth=3, seed=1)),
+    ("many vars", dict(num_stmts=2_000, num_vars=64, max_depth=3, seed=2)),
+    ("deep", dict(num_stmts=2_000, num_vars=16, max_depth=6, seed=3)),
+    ("input heavy", dict(num_stmts=2_000, input_rate=0.4, seed=4)),
+]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def compile_with(homes):
+    def run(module):
+        compiler = CompilerVar()
+        selected = compiler.select_instructions(
+            compiler.remove_complex_operands(module)
+        )
+        patched = compiler.patch_instructions(homes(compiler)(selected))
+        return compiler.prelude_and_conclusion(patched)
+
+    return run
+
+
+def memory_operands(program):
+    return sum(
+        isinstance(arg, Deref)
+        and arg.reg == "rbp"
+        and instr.op not in ("pushq", "popq")
+        for instr in program.body
+        if isinstance(instr, Instr)
+        for arg in instr.args
+    )
+
+
+if __name__ == "__main__":
+    modes = [
+        ("stack homes", compile_with(lambda compiler: compiler.assign_homes)),
+        ("graph coloring", compile_with(lambda compiler: compiler.allocate_registers)),
+    ]
+    for label, params in WORKLOADS:
+        module = generate_program(**params)
+        print(label)
+        for mode, run in modes:
+            program = run(module)
+            seconds = timed(lambda: run(module))
+            print(
+                f"  {mode:<16} {len(program.body):>7,d} instrs"
+                f" {memory_operands(program):>7,d} mem operands"
+                f" {program.stack_space:>6,d} B frame"
+                f" {len(program.used_callee):>2d} callee saved"
+                f" {seconds * 1e3:8.1f} ms"
+            )
@@ -0,0 +1,96 @@
+import gc
+import os
+import pickle
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from program_generator import generate_program
+from serialize import CorpusReader, dumps, loads, write_corpus
+
+NUM_PROGRAMS = 2_000
+STMTS_PER_PROGRAM = 100
+RANDOM_LOADS = 200
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def dump_pickle(path, programs):
+    with open(path, "wb") as file:
+        pickle.dump(programs, file, 5)
+
+
+def load_pickle(path):
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def load_corpus(path):
+    with CorpusReader(path) as reader:
+        return list(reader)
+
+
+def load_some_pickled(path, indexes):
+    programs = load_pickle(path)
+    return [programs[index] for index in indexes]
+
+
+def load_some_corpus(path, indexes):
+    with CorpusReader(path) as reader:
+        return [reader[index] for index in indexes]
+
+
+def report(rows):
+    for label, fn in rows:
+        print(f"  {label:<24}{timed(fn):8.3f}s")
+
+
+if __name__ == "__main__":
+    programs = [
+        generate_program(STMTS_PER_PROGRAM, seed=seed) for seed in range(NUM_PROGRAMS)
+    ]
+    indexes = random.Random(0).sample(range(NUM_PROGRAMS), RANDOM_LOADS)
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp) / "corpus.pickle"
+        corpus_path = Path(tmp) / "corpus.lvc"
+        print(f"{NUM_PROGRAMS} programs of {STMTS_PER_PROGRAM} statements")
+        report(
+            [
+                ("write pickle", lambda: dump_pickle(pickle_path, programs)),
+                ("write corpus", lambda: write_corpus(corpus_path, programs)),
+                ("load all, pickle", lambda: load_pickle(pickle_path)),
+                ("load all, corpus", lambda: load_corpus(corpus_path)),
+                (
+                    f"load {RANDOM_LOADS}, pickle",
+                    lambda: load_some_pickled(pickle_path, indexes),
+                ),
+                (
+                    f"load {RANDOM_LOADS}, corpus",
+                    lambda: load_some_corpus(corpus_path, indexes),
+                ),
+            ]
+        )
+        print(f"  pickle size {os.path.getsize(pickle_path):20,d} bytes")
+        print(f"  corpus size {os.path.getsize(corpus_path):20,d} bytes")
+    program = generate_program(100_000, seed=1)
+    data = dumps(program)
+    pickled = pickle.dumps(program, 5)
+    print("one program of 100000 statements")
+    report(
+        [
+            ("pickle.loads", lambda: pickle.loads(pickled)),
+            ("serialize.loads", lambda: loads(data)),
+        ]
+    )
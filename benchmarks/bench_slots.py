@@ -0,0 +1,53 @@
+import gc
+import random
+import time
+
+from ast_nodes import Add, Assign, BinOp, Constant, Module, Name, Sub
+from interpreter_var import InterpreterVar
+from partial_eval_var import PartialEvalVar
+from slots import SlotInterpreterVar, SlotPartialEvalVar, resolve_slots
+
+NUM_STMTS = 100_000
+VAR_COUNTS = [10, 1000, 50_000]
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def program_many_names(num_stmts, num_vars, seed=6) -> Module:
+    rng = random.Random(seed)
+    names = [f"v{i}" for i in range(num_vars)]
+    body = [Assign([Name(var)], Constant(i)) for i, var in enumerate(names)]
+    for _ in range(num_stmts):
+        a, b, c, target = (rng.choice(names) for _ in range(4))
+        exp = BinOp(BinOp(Name(a), Add(), Name(b)), Sub(), Name(c))
+        body.append(Assign([Name(target)], exp))
+    return Module(body)
+
+
+if __name__ == "__main__":
+    print(f"{NUM_STMTS} statements 'v = a + b - c', best of 5, GC disabled")
+    for num_vars in VAR_COUNTS:
+        program = program_many_names(NUM_STMTS, num_vars)
+        dict_interp = InterpreterVar(program)
+        slot_interp = SlotInterpreterVar(program)
+        rows = [
+            ("resolve_slots", lambda: resolve_slots(program)),
+            ("InterpreterVar", dict_interp.interp),
+            ("SlotInterpreterVar", slot_interp.interp),
+            ("PartialEvalVar", PartialEvalVar(program).pe),
+            ("SlotPartialEvalVar", SlotPartialEvalVar(program).pe),
+        ]
+        print(f"  {num_vars} variables")
+        for label, fn in rows:
+            print(f"    {label:<20}{timed(fn):8.3f}s")
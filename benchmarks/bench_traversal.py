@@ -0,0 +1,64 @@
+import gc
+import time
+
+from ast_nodes import Add, Assign, BinOp, Constant, Module, Name, Sub
+from compiler_var import CompilerVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+GENERATED_STMTS = 50_000
+DEPTHS = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def deep_chain(depth):
+    exp = Name("x")
+    for index in range(depth):
+        exp = BinOp(exp, Add() if index % 2 else Sub(), Constant(1))
+    return exp
+
+
+def interp_program(program):
+    InterpreterVar(program, BufferInput(range(10**6)), ListOutput()).interp()
+
+
+if __name__ == "__main__":
+    program = generate_program(GENERATED_STMTS, max_depth=4, seed=3)
+    print(f"generated program of {GENERATED_STMTS} statements")
+    print(f"  interp                  {timed(lambda: interp_program(program)):8.3f}s")
+    print(
+        f"  pe                      {timed(lambda: PartialEvalVar(program).pe()):8.3f}s"
+    )
+    print(
+        "  remove_complex_operands "
+        f"{timed(lambda: CompilerVar().remove_complex_operands(program)):8.3f}s"
+    )
+    print("one left-nested chain, time per node")
+    for depth in DEPTHS:
+        exp = deep_chain(depth)
+        module = Module([Assign([Name("y")], exp)])
+        env = {"x": 7}
+        rows = [
+            ("interp_exp", lambda: InterpreterVar(module).interp_exp(exp, env)),
+            ("pe_exp", lambda: PartialEvalVar(module).pe_exp(exp, env)),
+            ("rco", lambda: CompilerVar().remove_complex_operands(module)),
+        ]
+        cells = []
+        for label, fn in rows:
+            seconds = timed(fn, repeat=1 if depth >= 1_000_000 else 3)
+            cells.append(f"{label} {seconds / (2 * depth + 1) * 1e9:6.0f}ns")
+        print(f"  depth {depth:>9,d}  " + "  ".join(cells))
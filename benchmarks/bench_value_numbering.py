@@ -0,0 +1,53 @@
+import gc
+import time
+
+from compiler_var import CompilerVar
+from dead_stores import eliminate_dead_stores
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+from value_numbering import eliminate_common_subexpressions
+
+NUM_STMTS = 20_000
+SCALING_SIZES = [10_000, 100_000, 200_000]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def instructions(module):
+    return len(CompilerVar().compile(module).body)
+
+
+if __name__ == "__main__":
+    workloads = [
+        ("generated", generate_program(NUM_STMTS, seed=1)),
+        ("deep, few vars", generate_program(NUM_STMTS, num_vars=4, max_depth=5)),
+    ]
+    for label, program in workloads:
+        residual = eliminate_dead_stores(PartialEvalVar(program).pe())
+        print(f"{label}: {NUM_STMTS} statements, compiled instructions")
+        print(f"  as written      {instructions(program):10,d}")
+        print(
+            "  cse             "
+            f"{instructions(eliminate_common_subexpressions(program)):10,d}"
+        )
+        print(f"  pe + dse        {instructions(residual):10,d}")
+        print(
+            "  pe + dse + cse  "
+            f"{instructions(eliminate_common_subexpressions(residual)):10,d}"
+        )
+    print("eliminate_common_subexpressions scaling")
+    for size in SCALING_SIZES:
+        program = generate_program(size, seed=size)
+        seconds = timed(lambda: eliminate_common_subexpressions(program))
+        print(f"  {size:>8,d} stmts {seconds:8.3f}s {seconds / size * 1e6:8.2f}us/stmt")
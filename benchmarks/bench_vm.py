@@ -0,0 +1,37 @@
+import time
+
+from closure_interpreter_var import ClosureInterpreterVar
+from program_generator import generate_program
+from vm import compile_bytecode, run_bytecode
+
+NUM_STMTS = 2000
+NUM_RUNS = 100
+
+
+def time_closures(program, inputs):
+    compiled = ClosureInterpreterVar(program)
+    start = time.perf_counter()
+    for _ in range(NUM_RUNS):
+        compiled.run(inputs)
+    return time.perf_counter() - start
+
+
+def time_vm(program, inputs):
+    bytecode = compile_bytecode(program)
+    start = time.perf_counter()
+    for _ in range(NUM_RUNS):
+        run_bytecode(bytecode, inputs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    program = generate_program(NUM_STMTS, max_depth=4, seed=3)
+    inputs = list(range(1000))
+    start = time.perf_counter()
+    bytecode = compile_bytecode(program)
+    compile_time = time.perf_counter() - start
+    print(f"{NUM_STMTS} statements, {NUM_RUNS} runs")
+    print(f"  bytecode compile      {compile_time:8.3f}s")
+    print(f"  instructions          {len(bytecode.code) // 4:8d}")
+    print(f"  ClosureInterpreterVar {time_closures(program, inputs):8.3f}s")
+    print(f"  run_bytecode          {time_vm(program, inputs):8.3f}s")
@@ -11,13 +11,57 @@ from .ast_nodes import (
     USub,
     UnaryOp,
 )
+from .io_channels import (
+    BufferedOutput,
+    BufferInput,
+    ListOutput,
+    StdinInput,
+    StdoutOutput,
+    write_int_file,
+)
 from .interpreter_int import InterpeterInt
 from .interpreter_var import InterpreterVar
+from .closure_interpreter_var import ClosureInterpreterVar
+from .batch_interpreter_var import BatchInterpreterVar
+from .py_codegen import (
+    CodeCache,
+    PyCodegenVar,
+    compile_module,
+    generate_source,
+)
 from .partial_eval_int import PartialEvalInt
 from .partial_eval_var import PartialEvalVar
 from .compiler_var import CompilerVar
 from .x86_ast import Callq, Deref, Immediate, Instr, Jump, Reg, Retq, Var, X86Program
 from .x86_emitter import emit_program
+from .program_generator import generate_program
+from .node_factory import NodeFactory, count_nodes
+from .flat_ast import FlatBuilder, FlatModule, to_flat, to_module
+from .serialize import CorpusReader, CorpusWriter, dumps, loads, write_corpus
+from .traversal import exp_children, postorder
+from .dead_stores import eliminate_dead_stores
+from .persistent_map import MapEnv, PersistentMap
+from .incremental_partial_eval import IncrementalPartialEvalVar
+from .value_numbering import ValueNumbering, eliminate_common_subexpressions
+from .liveness import Liveness, uncover_live
+from .register_allocation import (
+    build_interference,
+    coalesce_moves,
+    color_graph,
+    move_related,
+)
+from .linear_scan import linear_scan, live_intervals
+from .peephole import PEEPHOLE_RULES, PeepholeOptimizer
+from .frontend import iter_modules, iter_statements, parse_file, parse_source, unparse
+from .profiler import NodeProfiler
+from .slots import (
+    SlotInterpreterVar,
+    SlotName,
+    SlotPartialEvalVar,
+    SlotTable,
+    resolve_slots,
+)
+from .vm import Bytecode, compile_bytecode, disassemble, run_bytecode
 
 __all__ = [
     "Constant",
@@ -31,8 +75,20 @@ __all__ = [
     "Sub",
     "Expr",
     "Module",
+    "StdinInput",
+    "BufferInput",
+    "StdoutOutput",
+    "ListOutput",
+    "BufferedOutput",
+    "write_int_file",
     "InterpeterInt",
     "InterpreterVar",
+    "ClosureInterpreterVar",
+    "BatchInterpreterVar",
+    "PyCodegenVar",
+    "CodeCache",
+    "generate_source",
+    "compile_module",
     "PartialEvalInt",
     "PartialEvalVar",
     "CompilerVar",
@@ -46,4 +102,49 @@ __all__ = [
     "Jump",
     "X86Program",
     "emit_program",
+    "generate_program",
+    "NodeFactory",
+    "count_nodes",
+    "FlatModule",
+    "FlatBuilder",
+    "to_flat",
+    "to_module",
+    "parse_source",
+    "parse_file",
+    "iter_statements",
+    "iter_modules",
+    "unparse",
+    "dumps",
+    "loads",
+    "CorpusWriter",
+    "CorpusReader",
+    "write_corpus",
+    "postorder",
+    "exp_children",
+    "eliminate_dead_stores",
+    "PersistentMap",
+    "MapEnv",
+    "IncrementalPartialEvalVar",
+    "ValueNumbering",
+    "eliminate_common_subexpressions",
+    "Liveness",
+    "uncover_live",
+    "build_interference",
+    "color_graph",
+    "move_related",
+    "coalesce_moves",
+    "live_intervals",
+    "linear_scan",
+    "PeepholeOptimizer",
+    "PEEPHOLE_RULES",
+    "NodeProfiler",
+    "SlotName",
+    "SlotTable",
+    "resolve_slots",
+    "SlotInterpreterVar",
+    "SlotPartialEvalVar",
+    "Bytecode",
+    "compile_bytecode",
+    "run_bytecode",
+    "disassemble",
 ]
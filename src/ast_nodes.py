@@ -1,82 +1,232 @@
-class Constant:
+class Node:
+    __slots__ = ("_hash",)
+    _fields = ()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            left, right = stack.pop()
+            if left is right:
+                continue
+            if type(left) is not type(right):
+                return False
+            for field in left._fields:
+                left_value = getattr(left, field)
+                right_value = getattr(right, field)
+                if isinstance(left_value, list):
+                    if not isinstance(right_value, list):
+                        return False
+                    if len(left_value) != len(right_value):
+                        return False
+                    pairs = zip(left_value, right_value)
+                else:
+                    pairs = [(left_value, right_value)]
+                for left_item, right_item in pairs:
+                    if isinstance(left_item, Node):
+                        stack.append((left_item, right_item))
+                    elif type(left_item) is not type(right_item):
+                        return False
+                    elif left_item != right_item:
+                        return False
+        return True
+
+    def __hash__(self):
+        if self._hash is None:
+            stack = [self]
+            while stack:
+                node = stack[-1]
+                pending = [child for child in node._children() if child._hash is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if node._hash is None:
+                    node._hash = node._structural_hash()
+        return self._hash
+
+    def __getstate__(self):
+        return None, {field: getattr(self, field) for field in self._fields}
+
+    def __setstate__(self, state):
+        _, fields = state
+        for field, value in fields.items():
+            setattr(self, field, value)
+        self._hash = None
+
+    def _children(self):
+        return ()
+
+
+class Operator:
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class Constant(Node):
+    __slots__ = ("value",)
+    _fields = ("value",)
+
     def __init__(self, value):
         self.value = value
+        self._hash = None
 
     def __repr__(self):
         return f"Constant({self.value!r})"
 
+    def _structural_hash(self):
+        return hash((Constant, type(self.value), self.value))
 
-class USub:
-    def __repr__(self):
-        return "USub()"
 
+class USub(Operator):
+    __slots__ = ()
 
-class Add:
-    def __repr__(self):
-        return "Add()"
 
+class Add(Operator):
+    __slots__ = ()
 
-class Sub:
-    def __repr__(self):
-        return "Sub()"
 
+class Sub(Operator):
+    __slots__ = ()
+
+
+class UnaryOp(Node):
+    __slots__ = ("op", "operand")
+    _fields = ("op", "operand")
 
-class UnaryOp:
     def __init__(self, op, operand):
         self.op = op
         self.operand = operand
+        self._hash = None
 
     def __repr__(self):
         return f"UnaryOp({self.op!r}, {self.operand!r})"
 
+    def _children(self):
+        return (self.operand,)
+
+    def _structural_hash(self):
+        return hash((UnaryOp, self.op, self.operand._hash))
+
+
+class Call(Node):
+    __slots__ = ("func", "args")
+    _fields = ("func", "args")
 
-class Call:
     def __init__(self, func, args):
         self.func = func
         self.args = args
+        self._hash = None
 
     def __repr__(self):
         return f"Call({self.func!r}, {self.args!r})"
 
+    def _children(self):
+        return (self.func, *self.args)
+
+    def _structural_hash(self):
+        return hash((Call, self.func._hash, tuple(arg._hash for arg in self.args)))
+
+
+class Name(Node):
+    __slots__ = ("id",)
+    _fields = ("id",)
 
-class Name:
     def __init__(self, id):
         self.id = id
+        self._hash = None
 
     def __repr__(self):
         return f"Name({self.id!r})"
 
+    def _structural_hash(self):
+        return hash((Name, self.id))
+
+
+class BinOp(Node):
+    __slots__ = ("left", "op", "right")
+    _fields = ("left", "op", "right")
 
-class BinOp:
     def __init__(self, left, op, right):
         self.op = op
         self.left = left
         self.right = right
+        self._hash = None
 
     def __repr__(self):
         return f"BinOp({self.left!r}, {self.op!r}, {self.right!r})"
 
+    def _children(self):
+        return (self.left, self.right)
+
+    def _structural_hash(self):
+        return hash((BinOp, self.left._hash, self.op, self.right._hash))
+
+
+class Expr(Node):
+    __slots__ = ("value",)
+    _fields = ("value",)
 
-class Expr:
     def __init__(self, value):
         self.value = value
+        self._hash = None
 
     def __repr__(self):
         return f"Expr({self.value!r})"
 
+    def _children(self):
+        return (self.value,)
+
+    def _structural_hash(self):
+        return hash((Expr, self.value._hash))
+
+
+class Module(Node):
+    __slots__ = ("body",)
+    _fields = ("body",)
 
-class Module:
     def __init__(self, body):
         self.body = body
+        self._hash = None
 
     def __repr__(self):
         return f"Module({self.body!r})"
 
+    def _children(self):
+        return self.body
+
+    def _structural_hash(self):
+        return hash((Module, tuple(stmt._hash for stmt in self.body)))
+
+
+class Assign(Node):
+    __slots__ = ("targets", "value")
+    _fields = ("targets", "value")
 
-class Assign:
     def __init__(self, targets, value):
         self.targets = targets
         self.value = value
+        self._hash = None
 
     def __repr__(self):
         return f"Assign({self.targets!r}, {self.value!r})"
+
+    def _children(self):
+        return (*self.targets, self.value)
+
+    def _structural_hash(self):
+        targets = tuple(target._hash for target in self.targets)
+        return hash((Assign, targets, self.value._hash))
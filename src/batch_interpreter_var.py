@@ -0,0 +1,148 @@
+from itertools import repeat
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from traversal import exp_children, postorder
+
+
+class BatchInterpreterVar:
+    def __init__(self, module: Module):
+        self.module = module
+        self._lanes = 0
+        self._readers = []
+        self._printed = []
+        self._failed = {}
+
+    def run(self, input_streams):
+        self._readers = [iter(stream).__next__ for stream in input_streams]
+        self._lanes = len(self._readers)
+        self._printed = printed = []
+        self._failed = {}
+        env = {}
+        try:
+            for stmt in self.module.body:
+                self.exec_stmt(stmt, env, printed)
+        finally:
+            self._readers = []
+            self._printed = []
+        columns = [
+            repeat(col, self._lanes) if isinstance(col, int) else col for col in printed
+        ]
+        if columns:
+            outputs = [list(row) for row in zip(*columns)]
+        else:
+            outputs = [[] for _ in range(self._lanes)]
+        errors = [None] * self._lanes
+        for lane, (error, printed_before) in self._failed.items():
+            del outputs[lane][printed_before:]
+            errors[lane] = error
+        return outputs, errors
+
+    def interp_exp(self, exp, env):
+        eval_exp = self.eval_exp
+        return postorder(
+            exp, exp_children, lambda node, values: eval_exp(node, values, env)
+        )
+
+    def eval_exp(self, exp, values, env):
+        match exp:
+            case Name(id=var) if var not in ("print", "input_int"):
+                if var in env:
+                    return env[var]
+                raise ValueError(f"undefined variable: {var}")
+            case Constant(value=value):
+                return value
+            case Call(func=Name(id="input_int"), args=[]):
+                return self._read_column()
+            case Call():
+                raise ValueError(f"unsupported call expression: {exp!r}")
+            case UnaryOp(op=USub()):
+                return self._neg(values[0])
+            case UnaryOp(op=op):
+                raise ValueError(f"unsupported unary operator: {op!r}")
+            case BinOp(op=Add()):
+                return self._add(values[0], values[1])
+            case BinOp(op=Sub()):
+                return self._sub(values[0], values[1])
+            case BinOp(op=op):
+                raise ValueError(f"unsupported binary operator: {op!r}")
+            case _:
+                raise ValueError(f"unsupported expression: {exp!r}")
+
+    def exec_stmt(self, stmt, env, printed):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                env[var] = self.interp_exp(value, env)
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                printed.append(self.interp_exp(arg, env))
+            case Expr(value=Call(func=Name(id="print"), args=args)):
+                raise ValueError(
+                    f"print expects one argument: Call(Name('print'), {args!r})"
+                )
+            case Expr(value=value):
+                self.interp_exp(value, env)
+            case _:
+                raise ValueError(f"unsupported statement: {stmt!r}")
+
+    def _read_column(self):
+        readers = self._readers
+        column = []
+        for lane, read in enumerate(readers):
+            try:
+                column.append(int(read()))
+            except StopIteration:
+                self._fail(lane, EOFError("input_int() called with no input left"))
+                column.append(0)
+            except ValueError as error:
+                self._fail(lane, error)
+                column.append(0)
+        return column
+
+    def _fail(self, lane, error):
+        self._failed[lane] = (error, len(self._printed))
+        self._readers[lane] = _no_input
+
+    @staticmethod
+    def _neg(value):
+        if isinstance(value, int):
+            return -value
+        return [-x for x in value]
+
+    @staticmethod
+    def _add(left, right):
+        match (left, right):
+            case (int(), int()):
+                return left + right
+            case (int(), _):
+                return list(map(left.__add__, right))
+            case (_, int()):
+                return list(map(right.__add__, left))
+            case _:
+                return list(map(int.__add__, left, right))
+
+    @staticmethod
+    def _sub(left, right):
+        match (left, right):
+            case (int(), int()):
+                return left - right
+            case (int(), _):
+                return list(map(left.__sub__, right))
+            case (_, int()):
+                return list(map((-right).__add__, left))
+            case _:
+                return list(map(int.__sub__, left, right))
+
+
+def _no_input():
+    return 0
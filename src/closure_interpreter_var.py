@@ -0,0 +1,113 @@
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+
+
+class ClosureInterpreterVar(InterpreterVar):
+    def __init__(self, module: Module, input_channel=None, output_channel=None):
+        super().__init__(module, input_channel, output_channel)
+        self._program = [self.compile_stmt(stmt) for stmt in module.body]
+
+    def compile_exp(self, exp):
+        match exp:
+            case Name(id=var) if var not in ("print", "input_int"):
+
+                def name(env):
+                    try:
+                        return env[var]
+                    except KeyError:
+                        raise ValueError(f"undefined variable: {var}") from None
+
+                return name
+            case Constant(value=value):
+                return lambda env: value
+            case Call(func=Name(id="input_int"), args=[]):
+                return lambda env: self.input_channel.read_int()
+            case Call():
+                return _raiser(f"unsupported call expression: {exp!r}")
+            case UnaryOp(op=USub(), operand=operand):
+                operand_fn = self.compile_exp(operand)
+                return lambda env: -operand_fn(env)
+            case UnaryOp(op=op):
+                return _raiser(f"unsupported unary operator: {op!r}")
+            case BinOp(left=left, op=Add(), right=Constant(value=value)):
+                left_fn = self.compile_exp(left)
+                return lambda env: left_fn(env) + value
+            case BinOp(left=left, op=Add(), right=right):
+                left_fn = self.compile_exp(left)
+                right_fn = self.compile_exp(right)
+                return lambda env: left_fn(env) + right_fn(env)
+            case BinOp(left=left, op=Sub(), right=Constant(value=value)):
+                left_fn = self.compile_exp(left)
+                return lambda env: left_fn(env) - value
+            case BinOp(left=left, op=Sub(), right=right):
+                left_fn = self.compile_exp(left)
+                right_fn = self.compile_exp(right)
+                return lambda env: left_fn(env) - right_fn(env)
+            case BinOp(op=op):
+                return _raiser(f"unsupported binary operator: {op!r}")
+            case _:
+                return _raiser(f"unsupported expression: {exp!r}")
+
+    def compile_stmt(self, stmt):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                value_fn = self.compile_exp(value)
+
+                def assign(env):
+                    env[var] = value_fn(env)
+
+                return assign
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                arg_fn = self.compile_exp(arg)
+                return lambda env: self.output_channel.write_int(arg_fn(env))
+            case Expr(value=Call(func=Name(id="print"), args=args)):
+                return _raiser(
+                    f"print expects one argument: Call(Name('print'), {args!r})"
+                )
+            case Expr(value=value):
+                return self.compile_exp(value)
+            case _:
+                return _raiser(f"unsupported statement: {stmt!r}")
+
+    def run(self, inputs=()):
+        channels = self.input_channel, self.output_channel
+        self.input_channel = BufferInput(inputs)
+        self.output_channel = outputs = ListOutput()
+        try:
+            self._execute({})
+        finally:
+            self.input_channel, self.output_channel = channels
+        return outputs.values
+
+    def interp(self, env=None):
+        if env is None:
+            env = {}
+        try:
+            return self._execute(env)
+        finally:
+            self.output_channel.flush()
+
+    def _execute(self, env):
+        for stmt_fn in self._program:
+            stmt_fn(env)
+        return env
+
+
+def _raiser(message):
+    def fail(env):
+        raise ValueError(message)
+
+    return fail
@@ -11,82 +11,224 @@ from ast_nodes import (
     USub,
     UnaryOp,
 )
-from x86_ast import Callq, Deref, Immediate, Instr, Reg, Retq, Var, X86Program
+from flat_ast import (
+    ADD,
+    ASSIGN,
+    CONST,
+    EXPR,
+    INPUT,
+    NAME,
+    NEG,
+    NO_OPERAND,
+    PRINT,
+    SUB,
+    FlatBuilder,
+    FlatModule,
+)
+from traversal import postorder
+from linear_scan import linear_scan
+from liveness import uncover_live
+from peephole import PeepholeOptimizer
+from register_allocation import (
+    build_interference,
+    coalesce_moves,
+    color_graph,
+    expand_aliases,
+    move_related,
+    spill_costs,
+)
+from x86_ast import (
+    CALLEE_SAVED_REGISTERS,
+    Callq,
+    Deref,
+    Immediate,
+    Instr,
+    Reg,
+    Retq,
+    Var,
+    X86Program,
+)
+
+_ATOMIC = (Constant, Name)
+
+
+class _Atom:
+    __slots__ = ("exp", "reads")
+
+    def __init__(self, exp):
+        self.exp = exp
+        self.reads = 0
 
 
 class CompilerVar:
-    def __init__(self):
+    def __init__(self, memoize=False):
         self._tmp_counter = 0
+        self.memoize = memoize
+        self._atoms = {}
+        self._reads = 0
+        self.peephole = None
 
     def _new_tmp(self):
+        return Name(self._new_tmp_name())
+
+    def _new_tmp_name(self):
         name = f"tmp_{self._tmp_counter}"
         self._tmp_counter += 1
-        return Name(name)
+        return name
 
     def remove_complex_operands(self, module):
         self._tmp_counter = 0
         body = []
         for stmt in module.body:
-            body.extend(self._rco_stmt(stmt))
+            self._atoms.clear()
+            self._rco_stmt(stmt, body)
         return Module(body)
 
-    def _rco_stmt(self, stmt):
+    def _rco_stmt(self, stmt, out):
         match stmt:
             case Assign(targets=[Name(id=_) as target], value=value):
-                simple_value, setup = self._rco_exp(value)
-                return setup + [Assign([target], simple_value)]
+                out.append(Assign([target], self._rco_exp(value, out)))
             case Expr(value=Call(func=Name(id="print"), args=[arg])):
-                atom, setup = self._rco_atom(arg)
-                return setup + [Expr(Call(Name("print"), [atom]))]
+                out.append(Expr(Call(Name("print"), [self._rco_atom(arg, out)])))
             case Expr(value=value):
-                simple_value, setup = self._rco_exp(value)
-                return setup + [Expr(simple_value)]
+                out.append(Expr(self._rco_exp(value, out)))
             case _:
                 raise ValueError(
                     f"unsupported statement in remove_complex_operands: {stmt!r}"
                 )
 
-    def _rco_atom(self, exp):
-        simple_exp, setup = self._rco_exp(exp)
-        if isinstance(simple_exp, (Constant, Name)):
-            return simple_exp, setup
-        tmp = self._new_tmp()
-        return tmp, setup + [Assign([tmp], simple_exp)]
+    def _rco_atom(self, exp, out):
+        return self._rco_exp(_Atom(exp), out)
+
+    def _rco_exp(self, exp, out):
+        rco_node = self._rco_node
+        return postorder(
+            exp, self._rco_children, lambda node, values: rco_node(node, values, out)
+        )
 
-    def _rco_exp(self, exp):
-        match exp:
+    def _rco_children(self, node):
+        kind = type(node)
+        if kind is _Atom:
+            if self.memoize and id(node.exp) in self._atoms:
+                return ()
+            node.reads = self._reads
+            return (node.exp,)
+        if kind is BinOp:
+            left = node.left
+            right = node.right
+            return (
+                left if type(left) in _ATOMIC else _Atom(left),
+                right if type(right) in _ATOMIC else _Atom(right),
+            )
+        if kind is UnaryOp:
+            operand = node.operand
+            return (operand if type(operand) in _ATOMIC else _Atom(operand),)
+        return ()
+
+    def _rco_node(self, node, values, out):
+        if type(node) is _Atom:
+            if not values:
+                return self._atoms[id(node.exp)]
+            simple_exp = values[0]
+            if isinstance(simple_exp, (Constant, Name)):
+                return simple_exp
+            tmp = self._new_tmp()
+            if self.memoize and self._reads == node.reads:
+                self._atoms[id(node.exp)] = tmp
+            out.append(Assign([tmp], simple_exp))
+            return tmp
+        match node:
             case Constant() | Name():
-                return exp, []
+                return node
             case Call(func=Name(id="input_int"), args=[]):
-                return exp, []
+                self._reads += 1
+                return node
             case Call():
                 raise ValueError(
-                    f"unsupported call expression in remove_complex_operands: {exp!r}"
+                    f"unsupported call expression in remove_complex_operands: {node!r}"
                 )
-            case UnaryOp(op=USub(), operand=operand):
-                atom, setup = self._rco_atom(operand)
-                return UnaryOp(USub(), atom), setup
+            case UnaryOp(op=USub()):
+                return UnaryOp(USub(), values[0])
             case UnaryOp(op=op):
                 raise ValueError(
                     f"unsupported unary operator in remove_complex_operands: {op!r}"
                 )
-            case BinOp(left=left, op=Add() as op, right=right):
-                left_atom, left_setup = self._rco_atom(left)
-                right_atom, right_setup = self._rco_atom(right)
-                return BinOp(left_atom, op, right_atom), left_setup + right_setup
-            case BinOp(left=left, op=Sub() as op, right=right):
-                left_atom, left_setup = self._rco_atom(left)
-                right_atom, right_setup = self._rco_atom(right)
-                return BinOp(left_atom, op, right_atom), left_setup + right_setup
+            case BinOp(op=Add() | Sub() as op):
+                return BinOp(values[0], op, values[1])
             case BinOp(op=op):
                 raise ValueError(
                     f"unsupported binary operator in remove_complex_operands: {op!r}"
                 )
             case _:
                 raise ValueError(
-                    f"unsupported expression in remove_complex_operands: {exp!r}"
+                    f"unsupported expression in remove_complex_operands: {node!r}"
                 )
 
+    def remove_complex_operands_flat(self, flat: FlatModule) -> FlatModule:
+        self._tmp_counter = 0
+        kinds = flat.kinds
+        left = flat.left
+        right = flat.right
+        in_atom_position = bytearray(len(kinds))
+        for index, kind in enumerate(kinds):
+            if kind == NEG or kind == PRINT:
+                in_atom_position[left[index]] = 1
+            elif kind == ADD or kind == SUB:
+                in_atom_position[left[index]] = 1
+                in_atom_position[right[index]] = 1
+        out = FlatBuilder(flat.consts, flat.names)
+        operands = []
+        for index, kind in enumerate(kinds):
+            a = left[index]
+            if kind == CONST or kind == NAME:
+                operand = (kind, a)
+            elif kind == INPUT:
+                operand = (INPUT,)
+            elif kind == NEG:
+                operand = (NEG, operands.pop())
+            elif kind == ADD or kind == SUB:
+                right_operand = operands.pop()
+                operand = (kind, operands.pop(), right_operand)
+            else:
+                root = self._emit_flat_simple(out, operands.pop())
+                if kind == ASSIGN:
+                    out.emit(ASSIGN, a, root)
+                elif kind == PRINT:
+                    out.emit(PRINT, root)
+                else:
+                    out.emit(EXPR, root)
+                out.end_stmt()
+                continue
+            if in_atom_position[index] and operand[0] not in (CONST, NAME):
+                tmp = out.name_index(self._new_tmp_name())
+                out.emit(ASSIGN, tmp, self._emit_flat_simple(out, operand))
+                out.end_stmt()
+                operand = (NAME, tmp)
+            operands.append(operand)
+        return out.flat
+
+    @staticmethod
+    def _emit_flat_simple(out, operand):
+        flat = out.flat
+        base = len(flat.kinds)
+        kind = operand[0]
+        if kind == CONST or kind == NAME:
+            return out.emit(kind, operand[1])
+        if kind == INPUT:
+            return out.emit(INPUT)
+        if kind == NEG:
+            atom_kind, atom = operand[1]
+            flat.kinds.extend((atom_kind, NEG))
+            flat.left.extend((atom, base))
+            flat.right.extend((NO_OPERAND, NO_OPERAND))
+            return base + 1
+        left_kind, left_atom = operand[1]
+        right_kind, right_atom = operand[2]
+        flat.kinds.extend((left_kind, right_kind, kind))
+        flat.left.extend((left_atom, right_atom, base))
+        flat.right.extend((NO_OPERAND, NO_OPERAND, base + 1))
+        return base + 2
+
     def select_instructions(self, module):
         instrs = []
         for stmt in module.body:
@@ -126,6 +268,8 @@ class CompilerVar:
             case BinOp(left=left, op=Add(), right=right):
                 left_arg = self._select_atom(left)
                 right_arg = self._select_atom(right)
+                if right_arg == dst:
+                    return [Instr("addq", [left_arg, dst])]
                 instrs = []
                 if left_arg != dst:
                     instrs.append(Instr("movq", [left_arg, dst]))
@@ -134,6 +278,8 @@ class CompilerVar:
             case BinOp(left=left, op=Sub(), right=right):
                 left_arg = self._select_atom(left)
                 right_arg = self._select_atom(right)
+                if right_arg == dst and left_arg != dst:
+                    return [Instr("negq", [dst]), Instr("addq", [left_arg, dst])]
                 instrs = []
                 if left_arg != dst:
                     instrs.append(Instr("movq", [left_arg, dst]))
@@ -176,6 +322,38 @@ class CompilerVar:
         body = [self._assign_instr_homes(instr, homes) for instr in program.body]
         return X86Program(body, stack_space=stack_space, homes=homes)
 
+    def allocate_registers(self, program):
+        graph = build_interference(program, uncover_live(program))
+        costs = spill_costs(program)
+        moves = move_related(program)
+        aliases = coalesce_moves(graph, moves, costs)
+        registers, slots = color_graph(graph, costs, moves)
+        return self._place_homes(program, *expand_aliases(aliases, registers, slots))
+
+    def allocate_registers_linear(self, program):
+        return self._place_homes(program, *linear_scan(program, move_related(program)))
+
+    def _place_homes(self, program, registers, slots):
+        in_use = set(registers.values())
+        used_callee = [name for name in CALLEE_SAVED_REGISTERS if name in in_use]
+        callee_space = 8 * len(used_callee)
+
+        homes = {var.name: Reg(name) for var, name in registers.items()}
+        for var, slot in slots.items():
+            homes[var.name] = Deref("rbp", -callee_space - 8 * (slot + 1))
+
+        frame = callee_space + 8 * (max(slots.values(), default=-1) + 1)
+        if frame % 16 != 0:
+            frame += 8
+
+        body = [self._assign_instr_homes(instr, homes) for instr in program.body]
+        return X86Program(
+            body,
+            stack_space=frame - callee_space,
+            homes=homes,
+            used_callee=used_callee,
+        )
+
     def _assign_instr_homes(self, instr, homes):
         if isinstance(instr, Instr):
             return Instr(
@@ -197,6 +375,7 @@ class CompilerVar:
             stack_space=program.stack_space,
             main_label=program.main_label,
             homes=program.homes,
+            used_callee=program.used_callee,
         )
 
     def _patch_instr(self, instr):
@@ -218,6 +397,7 @@ class CompilerVar:
             Instr("pushq", [Reg("rbp")]),
             Instr("movq", [Reg("rsp"), Reg("rbp")]),
         ]
+        prelude.extend(Instr("pushq", [Reg(name)]) for name in program.used_callee)
         if program.stack_space > 0:
             prelude.append(Instr("subq", [Immediate(program.stack_space), Reg("rsp")]))
 
@@ -226,6 +406,9 @@ class CompilerVar:
             conclusion.append(
                 Instr("addq", [Immediate(program.stack_space), Reg("rsp")])
             )
+        conclusion.extend(
+            Instr("popq", [Reg(name)]) for name in reversed(program.used_callee)
+        )
         conclusion.extend(
             [
                 Instr("popq", [Reg("rbp")]),
@@ -238,11 +421,24 @@ class CompilerVar:
             stack_space=program.stack_space,
             main_label=program.main_label,
             homes=program.homes,
+            used_callee=program.used_callee,
         )
 
-    def compile(self, module):
+    def compile(self, module, allocator="graph", peephole=False):
+        match allocator:
+            case "graph":
+                allocate = self.allocate_registers
+            case "linear_scan":
+                allocate = self.allocate_registers_linear
+            case "stack":
+                allocate = self.assign_homes
+            case _:
+                raise ValueError(f"unknown register allocator: {allocator!r}")
         no_complex = self.remove_complex_operands(module)
         selected = self.select_instructions(no_complex)
-        homed = self.assign_homes(selected)
+        homed = allocate(selected)
         patched = self.patch_instructions(homed)
+        if peephole:
+            self.peephole = PeepholeOptimizer()
+            patched = self.peephole.optimize(patched)
         return self.prelude_and_conclusion(patched)
@@ -0,0 +1,81 @@
+from ast_nodes import Assign, BinOp, Call, Constant, Expr, Module, Name, UnaryOp
+
+
+def eliminate_dead_stores(module: Module, live_out=()) -> Module:
+    faulting = _undefined_reads(module)
+    live = set(live_out)
+    body = []
+    for index in reversed(range(len(module.body))):
+        stmt = module.body[index]
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                if var in live or index in faulting:
+                    live.discard(var)
+                    _scan(value, live)
+                    body.append(stmt)
+                else:
+                    _keep_reads(body, value)
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                _scan(arg, live)
+                body.append(stmt)
+            case Expr(value=value):
+                if index in faulting:
+                    _scan(value, live)
+                    body.append(stmt)
+                else:
+                    _keep_reads(body, value)
+            case _:
+                raise ValueError(
+                    f"unsupported statement in eliminate_dead_stores: {stmt!r}"
+                )
+    body.reverse()
+    return Module(body)
+
+
+def _undefined_reads(module):
+    defined = set()
+    faulting = set()
+    for index, stmt in enumerate(module.body):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                reads = set()
+                _scan(value, reads)
+                if not reads <= defined:
+                    faulting.add(index)
+                defined.add(var)
+            case Expr(value=Call(func=Name(id="print"), args=[_])):
+                pass
+            case Expr(value=value):
+                reads = set()
+                _scan(value, reads)
+                if not reads <= defined:
+                    faulting.add(index)
+    return faulting
+
+
+def _keep_reads(body, exp):
+    for _ in range(_scan(exp, set())):
+        body.append(Expr(Call(Name("input_int"), [])))
+
+
+def _scan(exp, live):
+    reads = 0
+    stack = [exp]
+    while stack:
+        match stack.pop():
+            case Constant():
+                pass
+            case Name(id=var):
+                live.add(var)
+            case Call(func=Name(id="input_int"), args=[]):
+                reads += 1
+            case UnaryOp(operand=operand):
+                stack.append(operand)
+            case BinOp(left=left, right=right):
+                stack.append(right)
+                stack.append(left)
+            case node:
+                raise ValueError(
+                    f"unsupported expression in eliminate_dead_stores: {node!r}"
+                )
+    return reads
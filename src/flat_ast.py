@@ -0,0 +1,175 @@
+from array import array
+from dataclasses import dataclass, field
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+
+CONST = 0
+NAME = 1
+INPUT = 2
+NEG = 3
+ADD = 4
+SUB = 5
+ASSIGN = 6
+PRINT = 7
+EXPR = 8
+
+KIND_NAMES = ["const", "name", "input", "neg", "add", "sub", "assign", "print", "expr"]
+NO_OPERAND = -1
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+@dataclass
+class FlatModule:
+    kinds: array = field(default_factory=lambda: array("b"))
+    left: array = field(default_factory=lambda: array("i"))
+    right: array = field(default_factory=lambda: array("i"))
+    consts: array = field(default_factory=lambda: array("q"))
+    names: list[str] = field(default_factory=list)
+    stmts: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def nbytes(self):
+        arrays = (self.kinds, self.left, self.right, self.consts, self.stmts)
+        return sum(len(arr) * arr.itemsize for arr in arrays)
+
+
+class FlatBuilder:
+    def __init__(self, consts=(), names=()):
+        self.flat = FlatModule(consts=array("q", consts), names=list(names))
+        self._const_index = {value: i for i, value in enumerate(self.flat.consts)}
+        self._name_index = {var: i for i, var in enumerate(self.flat.names)}
+        self._append_kind = self.flat.kinds.append
+        self._append_left = self.flat.left.append
+        self._append_right = self.flat.right.append
+
+    def const_index(self, value):
+        index = self._const_index.get(value)
+        if index is None:
+            try:
+                self.flat.consts.append(value)
+            except OverflowError:
+                raise ValueError(f"constant does not fit in 64 bits: {value}") from None
+            index = self._const_index[value] = len(self.flat.consts) - 1
+        return index
+
+    def name_index(self, var):
+        index = self._name_index.get(var)
+        if index is None:
+            self.flat.names.append(var)
+            index = self._name_index[var] = len(self.flat.names) - 1
+        return index
+
+    def emit(self, kind, left=NO_OPERAND, right=NO_OPERAND):
+        self._append_kind(kind)
+        self._append_left(left)
+        self._append_right(right)
+        return len(self.flat.kinds) - 1
+
+    def truncate(self, size):
+        flat = self.flat
+        del flat.kinds[size:]
+        del flat.left[size:]
+        del flat.right[size:]
+
+    def end_stmt(self):
+        self.flat.stmts.append(len(self.flat.kinds) - 1)
+
+    def add_stmt(self, stmt):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                value_index = self.add_exp(value)
+                self.emit(ASSIGN, self.name_index(var), value_index)
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                self.emit(PRINT, self.add_exp(arg))
+            case Expr(value=value):
+                self.emit(EXPR, self.add_exp(value))
+            case _:
+                raise ValueError(f"cannot flatten statement: {stmt!r}")
+        self.end_stmt()
+
+    def add_exp(self, exp):
+        roots = []
+        stack = [(exp, False)]
+        while stack:
+            node, ready = stack.pop()
+            match node:
+                case Constant(value=value) if type(value) is int:
+                    roots.append(self.emit(CONST, self.const_index(value)))
+                case Name(id=var):
+                    roots.append(self.emit(NAME, self.name_index(var)))
+                case Call(func=Name(id="input_int"), args=[]):
+                    roots.append(self.emit(INPUT))
+                case UnaryOp(op=USub(), operand=operand):
+                    if ready:
+                        roots.append(self.emit(NEG, roots.pop()))
+                    else:
+                        stack.append((node, True))
+                        stack.append((operand, False))
+                case BinOp(left=left, op=Add() | Sub() as op, right=right):
+                    if ready:
+                        right_index = roots.pop()
+                        left_index = roots.pop()
+                        kind = ADD if isinstance(op, Add) else SUB
+                        roots.append(self.emit(kind, left_index, right_index))
+                    else:
+                        stack.append((node, True))
+                        stack.append((right, False))
+                        stack.append((left, False))
+                case _:
+                    raise ValueError(f"cannot flatten expression: {node!r}")
+        return roots.pop()
+
+
+def to_flat(module: Module) -> FlatModule:
+    builder = FlatBuilder()
+    for stmt in module.body:
+        builder.add_stmt(stmt)
+    return builder.flat
+
+
+def to_module(flat: FlatModule) -> Module:
+    consts = flat.consts
+    names = flat.names
+    nodes = []
+    body = []
+    for kind, a, b in zip(flat.kinds, flat.left, flat.right):
+        if kind == CONST:
+            node = Constant(consts[a])
+        elif kind == NAME:
+            node = Name(names[a])
+        elif kind == INPUT:
+            node = Call(Name("input_int"), [])
+        elif kind == NEG:
+            node = UnaryOp(USub(), nodes[a])
+        elif kind == ADD:
+            node = BinOp(nodes[a], Add(), nodes[b])
+        elif kind == SUB:
+            node = BinOp(nodes[a], Sub(), nodes[b])
+        elif kind == ASSIGN:
+            node = Assign([Name(names[a])], nodes[b])
+            body.append(node)
+        elif kind == PRINT:
+            node = Expr(Call(Name("print"), [nodes[a]]))
+            body.append(node)
+        elif kind == EXPR:
+            node = Expr(nodes[a])
+            body.append(node)
+        else:
+            raise ValueError(f"unknown node kind: {kind}")
+        nodes.append(node)
+    return Module(body)
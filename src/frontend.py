@@ -0,0 +1,806 @@
+import ast
+import keyword
+import re
+import tokenize
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+
+BATCH_SIZE = 512
+
+_BINARY_OPS = {ast.Add: Add(), ast.Sub: Sub()}
+_NEG = USub()
+_NESTING_ERRORS = ("too many nested parentheses",)
+_SPECIAL = re.compile(r"[()\[\]{}#\"'\\]")
+_STRING = (
+    rf"(?:{tokenize.StringPrefix})"
+    r"(?:'''(?:\\[\s\S]|[^\\])*?'''|\"\"\"(?:\\[\s\S]|[^\\])*?\"\"\""
+    r"|'(?:\\[\s\S]|[^\\'\n])*'|\"(?:\\[\s\S]|[^\\\"\n])*\")"
+)
+_TOKEN = re.compile(
+    r"[ \t\f]*(?:(?P<comment>#[^\r\n]*)|(?P<continuation>\\\r?\n)"
+    r"|(?P<newline>\r?\n)"
+    rf"|(?P<number>{tokenize.Number})"
+    rf"|(?=[A-Za-z]{{0,2}}['\"])(?P<string>{_STRING})"
+    r"|(?P<name>\w+)"
+    r"|(?P<op>\*\*=?|//=?|>>=?|<<=?|[-+*/%@&|^=<>!:]=|->|\.\.\."
+    r"|[-+*/%@&|^~<>()\[\]{},:;.=])"
+    r"|(?P<error>.))"
+)
+_BINARY_TOKENS = {
+    "|": (5, ast.BitOr()),
+    "^": (6, ast.BitXor()),
+    "&": (7, ast.BitAnd()),
+    "<<": (8, ast.LShift()),
+    ">>": (8, ast.RShift()),
+    "+": (9, ast.Add()),
+    "-": (9, ast.Sub()),
+    "*": (10, ast.Mult()),
+    "/": (10, ast.Div()),
+    "//": (10, ast.FloorDiv()),
+    "%": (10, ast.Mod()),
+    "@": (10, ast.MatMult()),
+    "**": (12, ast.Pow()),
+}
+_COMPARE_TOKENS = {
+    "<": ast.Lt(),
+    ">": ast.Gt(),
+    "==": ast.Eq(),
+    ">=": ast.GtE(),
+    "<=": ast.LtE(),
+    "!=": ast.NotEq(),
+}
+_UNARY_TOKENS = {"-": ast.USub(), "+": ast.UAdd(), "~": ast.Invert()}
+_BOOL_TOKENS = {"or": (1, ast.Or()), "and": (2, ast.And())}
+_AUGMENTED = {op + "=" for op in _BINARY_TOKENS}
+_STOPS = {"=", ";", ":", *_AUGMENTED}
+_CONSTANTS = {"True": True, "False": False, "None": None}
+_ATOMS = {"lambda": "Lambda", "yield": "Yield", "await": "Await"}
+_OPENERS = {"(": "(", "call": "(", "[": "[", "subscript": "["}
+_CLOSERS = {")": "(", "]": "[", "}": "{"}
+_COMPREHENSIONS = {"(": "GeneratorExp", "call": "GeneratorExp", "[": "ListComp"}
+_TARGETS = {
+    ast.Name: "name",
+    ast.Attribute: "attribute",
+    ast.Subscript: "subscript",
+    ast.Starred: "starred",
+    ast.Tuple: "tuple",
+    ast.List: "list",
+    ast.Call: "function call",
+    ast.BinOp: "expression",
+    ast.UnaryOp: "expression",
+    ast.BoolOp: "expression",
+    ast.Compare: "comparison",
+    ast.Lambda: "lambda",
+    ast.IfExp: "conditional expression",
+    ast.NamedExpr: "named expression",
+    ast.Dict: "dict literal",
+    ast.Set: "set display",
+    ast.JoinedStr: "f-string expression",
+    ast.ListComp: "list comprehension",
+    ast.SetComp: "set comprehension",
+    ast.DictComp: "dict comprehension",
+    ast.GeneratorExp: "generator expression",
+    ast.Yield: "yield expression",
+    ast.Await: "await expression",
+}
+_STATEMENTS = {
+    "assert": "Assert",
+    "break": "Break",
+    "class": "ClassDef",
+    "continue": "Continue",
+    "def": "FunctionDef",
+    "del": "Delete",
+    "for": "For",
+    "from": "ImportFrom",
+    "global": "Global",
+    "if": "If",
+    "import": "Import",
+    "nonlocal": "Nonlocal",
+    "pass": "Pass",
+    "raise": "Raise",
+    "return": "Return",
+    "try": "Try",
+    "while": "While",
+    "with": "With",
+}
+
+
+def iter_statements(lines, filename="<string>", batch_size=BATCH_SIZE):
+    chunk = []
+    offset = 0
+    for row, text in _split_statements(lines):
+        if len(chunk) == batch_size:
+            yield from _parse_chunk("".join(chunk), offset, filename)
+            chunk = []
+            offset = row - 1
+        chunk.append(text)
+    if chunk:
+        yield from _parse_chunk("".join(chunk), offset, filename)
+
+
+def parse_source(source, filename="<string>") -> Module:
+    return Module(list(iter_statements(source.splitlines(True), filename)))
+
+
+def parse_file(path) -> Module:
+    with open(path, encoding="utf-8") as lines:
+        return Module(list(iter_statements(lines, str(path))))
+
+
+def iter_modules(paths):
+    for path in paths:
+        yield path, parse_file(path)
+
+
+def _split_statements(lines):
+    statement = []
+    first = 1
+    started = False
+    depth = 0
+    continued = False
+    for row, line in enumerate(lines, 1):
+        if not depth and not continued and line[:1] not in (" ", "\t", "\f"):
+            stripped = line.lstrip()
+            if stripped and stripped[0] != "#":
+                if started:
+                    yield first, "".join(statement)
+                    statement = []
+                started = True
+        if not statement:
+            first = row
+        statement.append(line)
+        depth, continued = _scan_line(line, depth)
+    if statement:
+        yield first, "".join(statement)
+
+
+def _scan_line(line, depth):
+    pos = 0
+    while True:
+        match = _SPECIAL.search(line, pos)
+        if match is None:
+            return depth, False
+        char = match.group()
+        pos = match.end()
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if depth:
+                depth -= 1
+        elif char == "#":
+            return depth, False
+        elif char == "\\":
+            if not line[pos:].strip():
+                return depth, True
+        else:
+            pos = line.find(char, pos) + 1
+            if not pos:
+                return depth, False
+
+
+def _parse_chunk(text, offset, filename):
+    tree = _try_parse(text, offset, filename)
+    if tree is not None:
+        body = tree.body
+    else:
+        statements = list(_split_statements(text.splitlines(True)))
+        if len(statements) > 1:
+            body = []
+            for row, statement in statements:
+                body.extend(_parse_chunk(statement, offset + row - 1, filename))
+            return body
+        body = _StatementParser(text, offset, filename).parse()
+    return [_convert_stmt(stmt, offset, filename) for stmt in body]
+
+
+def _try_parse(text, offset, filename):
+    try:
+        return ast.parse(text, filename)
+    except SyntaxError as error:
+        if error.msg in _NESTING_ERRORS:
+            return None
+        raise ValueError(f"{filename}:{error.lineno + offset}: {error.msg}") from None
+    except (RecursionError, MemoryError):
+        return None
+
+
+class _Frame:
+    __slots__ = (
+        "kind",
+        "row",
+        "target",
+        "base",
+        "items",
+        "keywords",
+        "keyword",
+        "comma",
+        "result",
+    )
+
+    def __init__(self, kind, row, target, base):
+        self.kind = kind
+        self.row = row
+        self.target = target
+        self.base = base
+        self.items = []
+        self.keywords = []
+        self.keyword = None
+        self.comma = False
+        self.result = None
+
+
+class _StatementParser:
+    def __init__(self, text, offset, filename):
+        self.offset = offset
+        self.filename = filename
+        self.tokens = self.tokenize(text)
+        self.index = 0
+        self.top = None
+        self.frames = []
+        self.ops = []
+        self.operands = []
+        self.aborted = False
+
+    def tokenize(self, text):
+        tokens = []
+        row = 1
+        for match in _TOKEN.finditer(text):
+            kind = match.lastgroup
+            if kind == "continuation":
+                row += 1
+            elif kind == "error":
+                raise self.error(row, _token_error(text, match.start(kind), row))
+            elif kind != "comment":
+                string = match.group(kind)
+                tokens.append((kind, string, row))
+                if kind == "newline":
+                    row += 1
+                elif kind == "string":
+                    row += string.count("\n")
+        return tokens
+
+    def error(self, row, message):
+        return ValueError(f"{self.filename}:{row + self.offset}: {message}")
+
+    def parse(self):
+        tokens = self.tokens
+        body = []
+        ended = False
+        while self.index < len(tokens):
+            kind, string, row = tokens[self.index]
+            if kind == "newline":
+                ended = True
+                self.index += 1
+            elif ended:
+                raise self.error(row, "unexpected indent")
+            elif string == ";" and kind == "op":
+                self.index += 1
+            else:
+                body.append(self.statement(row))
+        return body
+
+    def statement(self, row):
+        tokens = self.tokens
+        kind, string, _ = tokens[self.index]
+        if kind == "name" and string in _STATEMENTS:
+            raise self.error(row, f"unsupported statement: {_STATEMENTS[string]}")
+        targets = []
+        value = self.expression()
+        last = self.top.items[-1]
+        while self.index < len(tokens):
+            kind, string, _ = tokens[self.index]
+            if kind != "op":
+                break
+            if string == "=":
+                self.index += 1
+                targets.append(value)
+                value = self.expression()
+            elif string == ":":
+                raise self.error(row, "unsupported statement: AnnAssign")
+            elif string in _AUGMENTED:
+                raise self.error(row, "unsupported statement: AugAssign")
+            else:
+                break
+        if targets:
+            self.check_targets(targets, last)
+            return ast.Assign(targets, value, lineno=row)
+        return ast.Expr(value, lineno=row)
+
+    def check_targets(self, targets, last):
+        for target in targets:
+            node = _invalid_target(target)
+            if node is not None:
+                break
+        else:
+            return
+        message = f"cannot assign to {_target_name(node)}"
+        if len(targets) == 1 and _suggests_comparison(last[0], last[2]):
+            node = last[0]
+            if type(node) is ast.Name and last[2] is None:
+                message = "invalid syntax. Maybe you meant '==' or ':=' instead of '='?"
+            else:
+                message = (
+                    f"cannot assign to {_target_name(node)} here. "
+                    "Maybe you meant '==' instead of '='?"
+                )
+        raise self.error(node.lineno, message)
+
+    def expression(self):
+        tokens = self.tokens
+        row = tokens[self.index][2] if self.index < len(tokens) else 1
+        top = _Frame("top", row, None, 0)
+        self.top = top
+        self.frames = [top]
+        self.ops = [top]
+        self.operands = []
+        expect = True
+        while self.index < len(tokens):
+            kind, string, row = tokens[self.index]
+            if len(self.frames) == 1 and (
+                kind == "newline" or (kind == "op" and string in _STOPS)
+            ):
+                break
+            self.index += 1
+            if kind == "newline":
+                continue
+            if expect:
+                expect = self.operand(kind, string, row)
+            else:
+                expect = self.operator(kind, string, row)
+        if self.aborted:
+            while len(self.frames) > 1:
+                self.close(self.frames[-1])
+            return self.close(top)
+        if len(self.frames) > 1:
+            frame = self.frames[-1]
+            opening = _OPENERS[frame.kind]
+            raise self.error(frame.row, f"'{opening}' was never closed")
+        if expect:
+            raise self.error(row, "invalid syntax")
+        return self.close(top)
+
+    def operand(self, kind, string, row):
+        frame = self.frames[-1]
+        if kind == "number":
+            self.push(self.literal(string, row), row)
+        elif kind == "string":
+            strings = [string]
+            while self.index < len(self.tokens) and self.tokens[self.index][0] == kind:
+                strings.append(self.tokens[self.index][1])
+                self.index += 1
+            self.push(self.literal(" ".join(strings), row), row)
+        elif kind == "name":
+            if string in _CONSTANTS:
+                self.push(ast.Constant(_CONSTANTS[string], lineno=row), row)
+            elif string == "not":
+                self.ops.append((3, "unary", ast.Not(), row))
+                return True
+            elif string in _ATOMS:
+                self.abort(_ATOMS[string], row)
+            elif keyword.iskeyword(string):
+                raise self.error(row, "invalid syntax")
+            elif frame.kind == "call" and self.at_argument(frame) and self.peek("="):
+                self.index += 1
+                frame.keyword = string
+                return True
+            else:
+                self.push(ast.Name(string, lineno=row), row)
+        elif string in _UNARY_TOKENS:
+            self.ops.append((11, "unary", _UNARY_TOKENS[string], row))
+            return True
+        elif string == "*":
+            self.ops.append((0, "starred", None, row))
+            return True
+        elif string == "**" and frame.kind == "call" and self.at_argument(frame):
+            frame.keyword = string
+            return True
+        elif string in ("(", "["):
+            self.open(string, row, None)
+            return True
+        elif string == "{":
+            self.abort(self.brace_kind(), row)
+        elif string == ":" and frame.kind == "subscript":
+            self.abort_frame("Slice", row)
+        elif string == "...":
+            self.push(ast.Constant(..., lineno=row), row)
+        elif string in _CLOSERS and self.at_argument(frame) and frame.kind != "top":
+            if not frame.items and frame.kind == "subscript":
+                raise self.error(row, "invalid syntax")
+            self.close_with(string, row)
+        else:
+            raise self.error(row, "invalid syntax")
+        return False
+
+    def operator(self, kind, string, row):
+        frame = self.frames[-1]
+        if kind == "op":
+            if string in _BINARY_TOKENS:
+                prec, op = _BINARY_TOKENS[string]
+                self.push_operator(prec, "binary", op, row)
+                return True
+            if string in _COMPARE_TOKENS:
+                self.push_operator(4, "compare", _COMPARE_TOKENS[string], row)
+                return True
+            if string == ",":
+                self.reduce_to(frame)
+                self.add_item(frame)
+                frame.comma = True
+                return True
+            if string in _CLOSERS:
+                self.close_with(string, row)
+                return False
+            if string in ("(", "["):
+                self.open(string, row, self.operands.pop())
+                return True
+            if string == "." and self.index < len(self.tokens):
+                kind, attr, _ = self.tokens[self.index]
+                if kind == "name" and not keyword.iskeyword(attr):
+                    self.index += 1
+                    value, start, _ = self.operands[-1]
+                    node = ast.Attribute(value, attr, lineno=start)
+                    self.operands[-1] = (node, start, None)
+                    return False
+            elif string == ":=":
+                self.abort_frame("NamedExpr", row)
+                return False
+            elif string == ":" and frame.kind == "subscript":
+                self.abort_frame("Slice", row)
+                return False
+        elif kind == "name":
+            if string in _BOOL_TOKENS:
+                prec, op = _BOOL_TOKENS[string]
+                self.push_operator(prec, "bool", op, row)
+                return True
+            if string == "in":
+                self.push_operator(4, "compare", ast.In(), row)
+                return True
+            if string == "is":
+                op = ast.Is()
+                if self.peek("not"):
+                    self.index += 1
+                    op = ast.IsNot()
+                self.push_operator(4, "compare", op, row)
+                return True
+            if string == "not" and self.peek("in"):
+                self.index += 1
+                self.push_operator(4, "compare", ast.NotIn(), row)
+                return True
+            if string == "if":
+                self.abort_frame("IfExp", row)
+                return False
+            if string in ("for", "async") and frame.kind in _COMPREHENSIONS:
+                self.abort_frame(_COMPREHENSIONS[frame.kind], row)
+                return False
+        raise self.error(row, "invalid syntax")
+
+    def peek(self, string):
+        tokens = self.tokens
+        return self.index < len(tokens) and tokens[self.index][1] == string
+
+    def at_argument(self, frame):
+        return self.ops[-1] is frame and frame.keyword is None
+
+    def literal(self, source, row):
+        if source.isdigit():
+            return ast.Constant(int(source), lineno=row)
+        try:
+            return ast.Constant(ast.literal_eval(source), lineno=row)
+        except SyntaxError as error:
+            raise self.error(row, error.msg) from None
+        except ValueError:
+            return _placeholder("JoinedStr", row)
+
+    def push(self, node, row):
+        self.operands.append((node, row, None))
+
+    def push_operator(self, prec, kind, op, row):
+        ops = self.ops
+        bound = prec if type(op) is ast.Pow else prec - 1
+        while type(ops[-1]) is tuple and ops[-1][0] > bound:
+            self.reduce(ops.pop())
+        ops.append((prec, kind, op, row))
+
+    def reduce_to(self, frame):
+        ops = self.ops
+        while ops[-1] is not frame:
+            self.reduce(ops.pop())
+
+    def reduce(self, entry):
+        _, kind, op, row = entry
+        operands = self.operands
+        if kind == "unary":
+            node = ast.UnaryOp(op, operands[-1][0], lineno=row)
+            operands[-1] = (node, row, ast.Not if type(op) is ast.Not else None)
+            return
+        if kind == "starred":
+            operands[-1] = (ast.Starred(operands[-1][0], lineno=row), row, ast.Starred)
+            return
+        right = operands.pop()[0]
+        left, start, chain = operands[-1]
+        if kind == "binary":
+            operands[-1] = (ast.BinOp(left, op, right, lineno=start), start, None)
+        elif kind == "compare" and chain is ast.Compare:
+            left.ops.append(op)
+            left.comparators.append(right)
+        elif kind == "compare":
+            node = ast.Compare(left, [op], [right], lineno=start)
+            operands[-1] = (node, start, ast.Compare)
+        elif chain is type(op):
+            left.values.append(right)
+        else:
+            node = ast.BoolOp(op, [left, right], lineno=start)
+            operands[-1] = (node, start, type(op))
+
+    def open(self, string, row, target):
+        if target is None:
+            kind = string
+        else:
+            kind = "call" if string == "(" else "subscript"
+        frame = _Frame(kind, row, target, len(self.operands))
+        self.frames.append(frame)
+        self.ops.append(frame)
+
+    def close_with(self, string, row):
+        frame = self.frames[-1]
+        if frame.kind == "top":
+            raise self.error(row, f"unmatched '{string}'")
+        opening = _OPENERS[frame.kind]
+        if _CLOSERS[string] != opening:
+            message = (
+                f"closing parenthesis '{string}' does not match "
+                f"opening parenthesis '{opening}'"
+            )
+            if frame.row != row:
+                message += f" on line {frame.row + self.offset}"
+            raise self.error(row, message)
+        self.close(frame)
+
+    def add_item(self, frame):
+        entry = self.operands.pop()
+        if frame.keyword is None:
+            frame.items.append(entry)
+        else:
+            arg = None if frame.keyword == "**" else frame.keyword
+            frame.keywords.append(ast.keyword(arg, entry[0]))
+            frame.keyword = None
+
+    def close(self, frame):
+        self.reduce_to(frame)
+        self.ops.pop()
+        self.frames.pop()
+        if len(self.operands) > frame.base:
+            self.add_item(frame)
+        items = [node for node, _, _ in frame.items]
+        kind = frame.kind
+        if frame.result is not None:
+            entry = (frame.result, frame.row, None)
+        elif kind == "call":
+            func, start, _ = frame.target
+            entry = (ast.Call(func, items, frame.keywords, lineno=start), start, None)
+        elif kind == "subscript":
+            value, start, _ = frame.target
+            index = (
+                ast.Tuple(items, lineno=frame.items[0][1]) if frame.comma else items[0]
+            )
+            entry = (ast.Subscript(value, index, lineno=start), start, None)
+        elif kind == "[":
+            entry = (ast.List(items, lineno=frame.row), frame.row, None)
+        elif frame.comma or not items:
+            entry = (ast.Tuple(items, lineno=frame.row), frame.row, "group")
+        else:
+            entry = (items[0], frame.row, "group")
+        if kind == "top":
+            return entry[0]
+        self.operands.append(entry)
+
+    def brace_kind(self):
+        tokens = self.tokens
+        depth = 1
+        mapping = comprehension = False
+        index = self.index
+        if index < len(tokens) and tokens[index][1] in ("}", "**"):
+            return "Dict"
+        while index < len(tokens) and depth:
+            kind, string, _ = tokens[index]
+            index += 1
+            if kind == "op" and string in ("(", "[", "{"):
+                depth += 1
+            elif kind == "op" and string in _CLOSERS:
+                depth -= 1
+            elif depth == 1:
+                mapping = mapping or string == ":"
+                comprehension = comprehension or string == "for"
+        if mapping:
+            return "DictComp" if comprehension else "Dict"
+        return "SetComp" if comprehension else "Set"
+
+    def abort(self, kind, row):
+        self.push(_placeholder(kind, row), row)
+        self.index = len(self.tokens)
+        self.aborted = True
+
+    def abort_frame(self, kind, row):
+        frame = self.frames[-1]
+        self.reduce_to(frame)
+        if len(self.operands) > frame.base:
+            row = self.operands.pop()[1]
+        if kind in ("ListComp", "GeneratorExp") and frame.kind != "call":
+            frame.result = _placeholder(kind, frame.row)
+        else:
+            self.push(_placeholder(kind, row), row)
+        self.index = len(self.tokens)
+        self.aborted = True
+
+
+def _placeholder(kind, row):
+    cls = getattr(ast, kind)
+    node = cls.__new__(cls)
+    node.lineno = row
+    return node
+
+
+def _invalid_target(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Tuple, ast.List)):
+            stack.extend(reversed(node.elts))
+        elif isinstance(node, ast.Starred):
+            stack.append(node.value)
+        elif not isinstance(node, (ast.Name, ast.Attribute, ast.Subscript)):
+            return node
+    return None
+
+
+def _target_name(node):
+    if type(node) is not ast.Constant:
+        return _TARGETS[type(node)]
+    if type(node.value) in (type(None), bool):
+        return str(node.value)
+    return "ellipsis" if node.value is ... else "literal"
+
+
+def _suggests_comparison(node, chain):
+    if chain is not None and chain != "group":
+        return False
+    if type(node) is ast.Constant and chain is None:
+        return type(node.value) not in (type(None), bool)
+    return type(node) not in (ast.List, ast.Tuple, ast.GeneratorExp)
+
+
+def _token_error(text, pos, row):
+    if text.startswith(("'''", '"""'), pos):
+        last = text.count("\n", 0, len(text.rstrip("\n"))) + 1
+        return f"unterminated triple-quoted string literal (detected at line {last})"
+    if text[pos] in "'\"":
+        return f"unterminated string literal (detected at line {row})"
+    return "invalid syntax"
+
+
+def _error(node, message, offset, filename):
+    return ValueError(f"{filename}:{node.lineno + offset}: {message}")
+
+
+def _convert_stmt(node, offset, filename):
+    match node:
+        case ast.Assign(targets=[ast.Name(id=var)], value=value):
+            return Assign([Name(var)], _convert_exp(value, offset, filename))
+        case ast.Expr(
+            value=ast.Call(func=ast.Name(id="print"), args=[arg], keywords=[])
+        ):
+            return Expr(Call(Name("print"), [_convert_exp(arg, offset, filename)]))
+        case ast.Expr(value=value):
+            return Expr(_convert_exp(value, offset, filename))
+        case ast.Assign():
+            raise _error(node, "unsupported assignment target", offset, filename)
+        case _:
+            message = f"unsupported statement: {type(node).__name__}"
+            raise _error(node, message, offset, filename)
+
+
+def _convert_exp(node, offset, filename):
+    results = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        kind = type(node)
+        if kind is ast.Name:
+            results.append(Name(node.id))
+        elif kind is ast.BinOp:
+            op = _BINARY_OPS.get(type(node.op))
+            if op is None:
+                message = f"unsupported operator: {type(node.op).__name__}"
+                raise _error(node, message, offset, filename)
+            stack.append(op)
+            stack.append(node.right)
+            stack.append(node.left)
+        elif kind is ast.Constant and type(node.value) is int:
+            results.append(Constant(node.value))
+        elif kind is Add or kind is Sub:
+            right = results.pop()
+            results[-1] = BinOp(results[-1], node, right)
+        elif kind is ast.UnaryOp:
+            if type(node.op) is not ast.USub:
+                message = f"unsupported operator: {type(node.op).__name__}"
+                raise _error(node, message, offset, filename)
+            stack.append(_NEG)
+            stack.append(node.operand)
+        elif kind is USub:
+            results[-1] = UnaryOp(node, results[-1])
+        elif kind is ast.Call:
+            results.append(_convert_call(node, offset, filename))
+        else:
+            message = f"unsupported expression: {kind.__name__}"
+            raise _error(node, message, offset, filename)
+    return results.pop()
+
+
+def _convert_call(node, offset, filename):
+    match node:
+        case ast.Call(func=ast.Name(id="input_int"), args=[], keywords=[]):
+            return Call(Name("input_int"), [])
+        case ast.Call(func=ast.Name(id=func)):
+            raise _error(node, f"unsupported call: {func}", offset, filename)
+        case _:
+            raise _error(node, "unsupported call", offset, filename)
+
+
+def unparse(module: Module) -> str:
+    return "".join(_unparse_stmt(stmt) + "\n" for stmt in module.body)
+
+
+def _unparse_stmt(stmt):
+    match stmt:
+        case Assign(targets=[Name(id=var)], value=value):
+            return f"{var} = {_unparse_exp(value)}"
+        case Expr(value=value):
+            return _unparse_exp(value)
+        case _:
+            raise ValueError(f"unsupported statement: {stmt!r}")
+
+
+def _unparse_exp(exp):
+    parts = []
+    stack = [exp]
+    while stack:
+        item = stack.pop()
+        match item:
+            case str():
+                parts.append(item)
+            case Constant(value=value):
+                parts.append(str(value))
+            case Name(id=var):
+                parts.append(var)
+            case Call(func=Name(id=func), args=args):
+                stack.append(")")
+                for index in reversed(range(len(args))):
+                    stack.append(args[index])
+                    if index:
+                        stack.append(", ")
+                stack.append(f"{func}(")
+            case UnaryOp(op=USub(), operand=BinOp() as operand):
+                stack.extend((")", operand, "-("))
+            case UnaryOp(op=USub(), operand=operand):
+                stack.extend((operand, "-"))
+            case BinOp(left=left, op=op, right=right):
+                symbol = " + " if isinstance(op, Add) else " - "
+                if isinstance(right, BinOp):
+                    stack.extend((")", right, "("))
+                else:
+                    stack.append(right)
+                stack.extend((symbol, left))
+            case _:
+                raise ValueError(f"unsupported expression: {item!r}")
+    return "".join(parts)
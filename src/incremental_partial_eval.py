@@ -0,0 +1,55 @@
+from ast_nodes import Module
+from partial_eval_var import PartialEvalVar
+from persistent_map import EMPTY_MAP, MapEnv
+
+
+class IncrementalPartialEvalVar(PartialEvalVar):
+    def __init__(self, module: Module, memoize=False):
+        super().__init__(module, memoize)
+        self.body = []
+        self.reevaluated = 0
+        self._envs = [EMPTY_MAP]
+        self._results = []
+        self.update(0, 0, module.body)
+
+    def pe(self):
+        return Module(list(self._results))
+
+    def env_before(self, index):
+        return self._envs[index]
+
+    def replace(self, index, stmt):
+        return self.update(index, index + 1, [stmt])
+
+    def insert(self, index, stmt):
+        return self.update(index, index, [stmt])
+
+    def delete(self, index):
+        return self.update(index, index + 1, [])
+
+    def update(self, start, stop, stmts):
+        stmts = list(stmts)
+        if not 0 <= start <= stop <= len(self.body):
+            raise IndexError(f"invalid statement range: {start}:{stop}")
+        old_envs = self._envs
+        old_results = self._results
+        shift = len(stmts) - (stop - start)
+        self.body[start:stop] = stmts
+        body = self.body
+        envs = old_envs[: start + 1]
+        results = old_results[:start]
+        env = MapEnv(old_envs[start])
+        resume = start + len(stmts)
+        index = start
+        while index < len(body):
+            if index >= resume and env.map == old_envs[index - shift]:
+                results.extend(old_results[index - shift :])
+                envs.extend(old_envs[index - shift + 1 :])
+                break
+            results.append(self.pe_stmt(body[index], env))
+            envs.append(env.map)
+            index += 1
+        self.reevaluated = index - start
+        self._envs = envs
+        self._results = results
+        return self.pe()
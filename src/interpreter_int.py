@@ -10,41 +10,56 @@ from ast_nodes import (
     USub,
     UnaryOp,
 )
+from io_channels import StdinInput, StdoutOutput
+from traversal import exp_children, postorder
 
 
 class InterpeterInt:
-    def __init__(self, module: Module):
+    def __init__(self, module: Module, input_channel=None, output_channel=None):
+        if input_channel is None:
+            input_channel = StdinInput()
+        if output_channel is None:
+            output_channel = StdoutOutput()
         self.module = module
+        self.input_channel = input_channel
+        self.output_channel = output_channel
 
     def interp_exp(self, exp, env=None):
+        if env is None:
+            env = {}
+        eval_exp = self.eval_exp
+        return postorder(
+            exp, self.exp_children, lambda node, values: eval_exp(node, values, env)
+        )
+
+    def exp_children(self, exp):
+        return exp_children(exp)
+
+    def eval_exp(self, exp, values, env):
         match exp:
             case Constant(value=value):
                 return value
             case Call(func=Name(id="input_int"), args=[]):
-                return int(input())
+                return self.input_channel.read_int()
             case Call():
                 raise ValueError(f"unsupported call expression: {exp!r}")
-            case UnaryOp(op=USub(), operand=operand):
-                return -self.interp_exp(operand, env)
+            case UnaryOp(op=USub()):
+                return -values[0]
             case UnaryOp(op=op):
                 raise ValueError(f"unsupported unary operator: {op!r}")
-            case BinOp(left=left, op=Add(), right=right):
-                return self.interp_exp(left, env) + self.interp_exp(right, env)
-            case BinOp(left=left, op=Sub(), right=right):
-                return self.interp_exp(left, env) - self.interp_exp(right, env)
+            case BinOp(op=Add()):
+                return values[0] + values[1]
+            case BinOp(op=Sub()):
+                return values[0] - values[1]
             case BinOp(op=op):
                 raise ValueError(f"unsupported binary operator: {op!r}")
             case _:
                 raise ValueError(f"unsupported expression: {exp!r}")
 
-    def interp_stmt(self, stmt, cont=None, env=None):
-        if cont is None:
-            cont = []
-        if env is None:
-            env = {}
+    def exec_stmt(self, stmt, env):
         match stmt:
             case Expr(value=Call(func=Name(id="print"), args=[arg])):
-                print(self.interp_exp(arg, env))
+                self.output_channel.write_int(self.interp_exp(arg, env))
             case Expr(value=Call(func=Name(id="print"), args=args)):
                 raise ValueError(
                     f"print expects one argument: Call(Name('print'), {args!r})"
@@ -53,6 +68,13 @@ class InterpeterInt:
                 self.interp_exp(value, env)
             case _:
                 raise ValueError(f"unsupported statement: {stmt!r}")
+
+    def interp_stmt(self, stmt, cont=None, env=None):
+        if cont is None:
+            cont = []
+        if env is None:
+            env = {}
+        self.exec_stmt(stmt, env)
         return self.interp_stmts(cont, env)
 
     def interp_stmts(self, stmts=None, env=None):
@@ -60,9 +82,13 @@ class InterpeterInt:
             stmts = self.module.body
         if env is None:
             env = {}
-        if not stmts:
-            return env
-        return self.interp_stmt(stmts[0], stmts[1:], env)
+        exec_stmt = self.exec_stmt
+        for stmt in stmts:
+            exec_stmt(stmt, env)
+        return env
 
     def interp(self, env=None):
-        return self.interp_stmts(self.module.body, env)
+        try:
+            return self.interp_stmts(self.module.body, env)
+        finally:
+            self.output_channel.flush()
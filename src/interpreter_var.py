@@ -4,20 +4,28 @@ from ast_nodes import (
     BinOp,
     Call,
     Constant,
-    Expr,
-    Module,
     Name,
     Sub,
     USub,
     UnaryOp,
 )
+from flat_ast import (
+    ADD,
+    ASSIGN,
+    CONST,
+    EXPR,
+    INPUT,
+    NAME,
+    NEG,
+    PRINT,
+    SUB,
+    FlatModule,
+)
 from interpreter_int import InterpeterInt
 
 
 class InterpreterVar(InterpeterInt):
-    def interp_exp(self, exp, env=None):
-        if env is None:
-            env = {}
+    def eval_exp(self, exp, values, env):
         match exp:
             case Name(id=var) if var not in ("print", "input_int"):
                 if var in env:
@@ -26,50 +34,66 @@ class InterpreterVar(InterpeterInt):
             case Constant(value=value):
                 return value
             case Call(func=Name(id="input_int"), args=[]):
-                return int(input())
+                return self.input_channel.read_int()
             case Call():
                 raise ValueError(f"unsupported call expression: {exp!r}")
-            case UnaryOp(op=USub(), operand=operand):
-                return -self.interp_exp(operand, env)
+            case UnaryOp(op=USub()):
+                return -values[0]
             case UnaryOp(op=op):
                 raise ValueError(f"unsupported unary operator: {op!r}")
-            case BinOp(left=left, op=Add(), right=right):
-                return self.interp_exp(left, env) + self.interp_exp(right, env)
-            case BinOp(left=left, op=Sub(), right=right):
-                return self.interp_exp(left, env) - self.interp_exp(right, env)
+            case BinOp(op=Add()):
+                return values[0] + values[1]
+            case BinOp(op=Sub()):
+                return values[0] - values[1]
             case BinOp(op=op):
                 raise ValueError(f"unsupported binary operator: {op!r}")
             case _:
                 raise ValueError(f"unsupported expression: {exp!r}")
 
-    def interp_stmt(self, stmt, cont=None, env=None):
-        if cont is None:
-            cont = []
-        if env is None:
-            env = {}
+    def exec_stmt(self, stmt, env):
         match stmt:
             case Assign(targets=[Name(id=var)], value=value):
                 env[var] = self.interp_exp(value, env)
-            case Expr(value=Call(func=Name(id="print"), args=[arg])):
-                print(self.interp_exp(arg, env))
-            case Expr(value=Call(func=Name(id="print"), args=args)):
-                raise ValueError(
-                    f"print expects one argument: Call(Name('print'), {args!r})"
-                )
-            case Expr(value=value):
-                self.interp_exp(value, env)
             case _:
-                raise ValueError(f"unsupported statement: {stmt!r}")
-        return self.interp_stmts(cont, env)
+                super().exec_stmt(stmt, env)
 
-    def interp_stmts(self, stmts=None, env=None):
-        if stmts is None:
-            stmts = self.module.body
+    def interp_flat(self, flat: FlatModule, env=None):
         if env is None:
             env = {}
-        if not stmts:
-            return env
-        return self.interp_stmt(stmts[0], stmts[1:], env)
-
-    def interp(self, env=None):
-        return self.interp_stmts(self.module.body, env)
+        consts = flat.consts
+        names = flat.names
+        read_int = self.input_channel.read_int
+        write_int = self.output_channel.write_int
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        try:
+            for kind, a in zip(flat.kinds, flat.left):
+                if kind == NAME:
+                    var = names[a]
+                    if var not in env:
+                        raise ValueError(f"undefined variable: {var}")
+                    push(env[var])
+                elif kind == CONST:
+                    push(consts[a])
+                elif kind == ADD:
+                    right = pop()
+                    stack[-1] += right
+                elif kind == SUB:
+                    right = pop()
+                    stack[-1] -= right
+                elif kind == ASSIGN:
+                    env[names[a]] = pop()
+                elif kind == NEG:
+                    stack[-1] = -stack[-1]
+                elif kind == INPUT:
+                    push(read_int())
+                elif kind == PRINT:
+                    write_int(pop())
+                elif kind == EXPR:
+                    pop()
+                else:
+                    raise ValueError(f"unknown node kind: {kind}")
+        finally:
+            self.output_channel.flush()
+        return env
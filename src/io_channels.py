@@ -0,0 +1,64 @@
+import mmap
+import sys
+from array import array
+
+
+class StdinInput:
+    def read_int(self):
+        return int(input())
+
+
+class BufferInput:
+    def __init__(self, values):
+        self._next = iter(values).__next__
+
+    def read_int(self):
+        try:
+            return int(self._next())
+        except StopIteration:
+            raise EOFError("input_int() called with no input left") from None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return cls(array("q"))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped).cast("q"))
+
+
+def write_int_file(path, values):
+    with open(path, "wb") as f:
+        array("q", values).tofile(f)
+
+
+class StdoutOutput:
+    def write_int(self, value):
+        print(value)
+
+    def flush(self):
+        pass
+
+
+class ListOutput:
+    def __init__(self):
+        self.values = []
+        self.write_int = self.values.append
+
+    def flush(self):
+        pass
+
+
+class BufferedOutput(ListOutput):
+    def __init__(self, stream=None):
+        super().__init__()
+        self._stream = stream
+        self._written = 0
+
+    def flush(self):
+        pending = self.values[self._written :]
+        if not pending:
+            return
+        stream = self._stream if self._stream is not None else sys.stdout
+        stream.write("\n".join(map(str, pending)) + "\n")
+        self._written = len(self.values)
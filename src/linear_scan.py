@@ -0,0 +1,128 @@
+from bisect import bisect_right
+from heapq import heappop, heappush
+
+from liveness import read_write_sets
+from register_allocation import ALLOCATABLE_REGISTERS
+from x86_ast import CALLEE_SAVED_REGISTERS, Callq, Reg, Var
+
+
+def live_intervals(program):
+    intervals = {}
+    fixed = {}
+    calls = []
+    for index, instr in enumerate(program.body):
+        reads, writes = read_write_sets(instr)
+        if isinstance(instr, Callq):
+            calls.append(index)
+            writes = ()
+        for loc in reads:
+            if isinstance(loc, Var):
+                _extend(intervals, loc, index)
+            else:
+                segments = fixed.setdefault(loc.name, [])
+                if segments:
+                    segments[-1][1] = index
+                else:
+                    segments.append([index, index])
+        for loc in writes:
+            if isinstance(loc, Var):
+                _extend(intervals, loc, index)
+            else:
+                fixed.setdefault(loc.name, []).append([index, index])
+    return intervals, fixed, calls
+
+
+def _extend(intervals, var, index):
+    interval = intervals.get(var)
+    if interval is None:
+        intervals[var] = [index, index]
+    else:
+        interval[1] = index
+
+
+def linear_scan(program, moves=None, registers=ALLOCATABLE_REGISTERS):
+    intervals, fixed, calls = live_intervals(program)
+    blocked = {
+        name: ([start for start, _ in segments], [end for _, end in segments])
+        for name, segments in fixed.items()
+        if name in registers
+    }
+    assignment = {}
+    spilled = []
+    active = []
+    free = set(registers)
+    for rank, (var, (start, end)) in enumerate(intervals.items()):
+        while active and active[0][0] <= start:
+            _, _, done = heappop(active)
+            free.add(assignment[done])
+        allowed = _allowed(start, end, registers, blocked, calls)
+        name = _hinted(var, moves, assignment, allowed, free)
+        if name is None:
+            name = next((name for name in allowed if name in free), None)
+        if name is not None:
+            free.discard(name)
+        else:
+            victim = _furthest(active, assignment, allowed, end)
+            if victim is None:
+                spilled.append(var)
+                continue
+            name = assignment.pop(victim)
+            active.remove(next(entry for entry in active if entry[2] is victim))
+            active.sort()
+            spilled.append(victim)
+        assignment[var] = name
+        heappush(active, (end, rank, var))
+    return assignment, _stack_slots(spilled, intervals)
+
+
+def _hinted(var, moves, assignment, allowed, free):
+    if moves:
+        for partner in moves.get(var, ()):
+            name = partner.name if isinstance(partner, Reg) else assignment.get(partner)
+            if name in free and name in allowed:
+                return name
+    return None
+
+
+def _allowed(start, end, registers, blocked, calls):
+    index = bisect_right(calls, start)
+    crosses_call = index < len(calls) and calls[index] < end
+    allowed = []
+    for name in registers:
+        if crosses_call and name not in CALLEE_SAVED_REGISTERS:
+            continue
+        segments = blocked.get(name)
+        if segments is not None:
+            starts, ends = segments
+            index = bisect_right(ends, start)
+            if index < len(starts) and starts[index] < end:
+                continue
+        allowed.append(name)
+    return allowed
+
+
+def _furthest(active, assignment, allowed, end):
+    victim, victim_end = None, end
+    for other_end, _, other in active:
+        if other_end > victim_end and assignment[other] in allowed:
+            victim, victim_end = other, other_end
+    return victim
+
+
+def _stack_slots(spilled, intervals):
+    slots = {}
+    active = []
+    free = []
+    count = 0
+    for var in sorted(spilled, key=lambda var: intervals[var][0]):
+        start, end = intervals[var]
+        while active and active[0][0] <= start:
+            heappush(free, heappop(active)[1])
+        if free:
+            slot = heappop(free)
+        else:
+            slot = count
+            count += 1
+        slots[var] = slot
+        heappush(active, (end, slot))
+    return slots
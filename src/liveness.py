@@ -0,0 +1,127 @@
+from bisect import bisect_right
+from heapq import heappop, heappush
+
+from x86_ast import (
+    ARGUMENT_REGISTERS,
+    CALLER_SAVED_REGISTERS,
+    Callq,
+    Instr,
+    Reg,
+    Var,
+)
+
+_CALL_CLOBBERS = frozenset(Reg(name) for name in CALLER_SAVED_REGISTERS)
+_CALL_ARGUMENTS = [
+    frozenset(Reg(name) for name in ARGUMENT_REGISTERS[:arity])
+    for arity in range(len(ARGUMENT_REGISTERS) + 1)
+]
+_FRAME_REGISTERS = frozenset(("rsp", "rbp"))
+
+
+def read_write_sets(instr):
+    match instr:
+        case Instr(op="movq", args=[src, dst]):
+            return _locations(src), _locations(dst)
+        case Instr(op="addq" | "subq", args=[src, dst]):
+            return _locations(src) | _locations(dst), _locations(dst)
+        case Instr(op="negq", args=[dst]):
+            written = _locations(dst)
+            return written, written
+        case Callq(arity=arity):
+            return _CALL_ARGUMENTS[arity], _CALL_CLOBBERS
+        case _:
+            raise ValueError(f"unsupported instruction in liveness: {instr!r}")
+
+
+def _locations(arg):
+    if isinstance(arg, Var):
+        return frozenset((arg,))
+    if isinstance(arg, Reg) and arg.name not in _FRAME_REGISTERS:
+        return frozenset((arg,))
+    return frozenset()
+
+
+def uncover_live(program):
+    body = program.body
+    live_after = [0] * len(body)
+    live = 0
+    bit_of = {}
+    ends = []
+    free = []
+    starts = []
+    owners = []
+    for index in range(len(body) - 1, -1, -1):
+        live_after[index] = live
+        reads, writes = read_write_sets(body[index])
+        for loc in writes:
+            bit = bit_of.pop(loc, None)
+            if bit is not None:
+                live ^= 1 << bit
+                heappush(free, bit)
+                starts[bit].append(index)
+                owners[bit].append(loc)
+        for loc in reads:
+            if loc not in bit_of:
+                if free:
+                    bit = heappop(free)
+                else:
+                    bit = len(ends)
+                    ends.append(0)
+                    starts.append([])
+                    owners.append([])
+                bit_of[loc] = bit
+                ends[bit] = index - 1
+                live |= 1 << bit
+    for loc, bit in bit_of.items():
+        if ends[bit] >= 0:
+            starts[bit].append(0)
+            owners[bit].append(loc)
+    for timeline in starts + owners:
+        timeline.reverse()
+    return Liveness(live_after, frozenset(bit_of), starts, owners)
+
+
+def _bits(bitset):
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+class Liveness:
+    __slots__ = ("live_after", "live_in", "_starts", "_owners")
+
+    def __init__(self, live_after, live_in, starts, owners):
+        self.live_after = live_after
+        self.live_in = live_in
+        self._starts = starts
+        self._owners = owners
+
+    def __len__(self):
+        return len(self.live_after)
+
+    def _owner(self, bit, index):
+        return self._owners[bit][bisect_right(self._starts[bit], index) - 1]
+
+    def live_after_set(self, index):
+        return {self._owner(bit, index) for bit in _bits(self.live_after[index])}
+
+    def is_live_after(self, index, loc):
+        return any(
+            self._owner(bit, index) == loc for bit in _bits(self.live_after[index])
+        )
+
+    def live_after_sets(self):
+        starts = self._starts
+        owners = self._owners
+        positions = [0] * len(starts)
+        for index, bitset in enumerate(self.live_after):
+            live = set()
+            for bit in _bits(bitset):
+                timeline = starts[bit]
+                position = positions[bit]
+                while position + 1 < len(timeline) and timeline[position + 1] <= index:
+                    position += 1
+                positions[bit] = position
+                live.add(owners[bit][position])
+            yield live
@@ -0,0 +1,122 @@
+from ast_nodes import (
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    UnaryOp,
+)
+
+
+class NodeFactory:
+    def __init__(self):
+        self._table = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def constant(self, value):
+        key = (Constant, type(value), value)
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = Constant(value)
+        return node
+
+    def name(self, id):
+        key = (Name, id)
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = Name(id)
+        return node
+
+    def unary_op(self, op, operand):
+        key = (UnaryOp, op, id(operand))
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = UnaryOp(op, operand)
+        return node
+
+    def bin_op(self, left, op, right):
+        key = (BinOp, id(left), op, id(right))
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = BinOp(left, op, right)
+        return node
+
+    def call(self, func, args):
+        key = (Call, id(func), tuple(map(id, args)))
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = Call(func, list(args))
+        return node
+
+    def expr(self, value):
+        key = (Expr, id(value))
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = Expr(value)
+        return node
+
+    def assign(self, targets, value):
+        key = (Assign, tuple(map(id, targets)), id(value))
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = Assign(list(targets), value)
+        return node
+
+    def intern(self, node):
+        done = {}
+        stack = [(node, False)]
+        while stack:
+            current, ready = stack.pop()
+            if id(current) in done:
+                continue
+            if ready:
+                done[id(current)] = self._rebuild(current, done)
+                continue
+            stack.append((current, True))
+            for child in current._children():
+                stack.append((child, False))
+        return done[id(node)]
+
+    def _rebuild(self, node, done):
+        if type(node) is Name:
+            return self.name(node.id)
+        match node:
+            case Constant(value=value):
+                return self.constant(value)
+            case UnaryOp(op=op, operand=operand):
+                return self.unary_op(op, done[id(operand)])
+            case BinOp(left=left, op=op, right=right):
+                return self.bin_op(done[id(left)], op, done[id(right)])
+            case Call(func=func, args=args):
+                return self.call(done[id(func)], [done[id(arg)] for arg in args])
+            case Expr(value=value):
+                return self.expr(done[id(value)])
+            case Assign(targets=targets, value=value):
+                targets = [done[id(target)] for target in targets]
+                return self.assign(targets, done[id(value)])
+            case Module(body=body):
+                return Module([done[id(stmt)] for stmt in body])
+            case _:
+                raise ValueError(f"cannot intern node: {node!r}")
+
+
+def count_nodes(node):
+    sizes = {}
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if id(current) in sizes:
+            stack.pop()
+            continue
+        pending = [child for child in current._children() if id(child) not in sizes]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        children = current._children()
+        sizes[id(current)] = 1 + sum(sizes[id(child)] for child in children)
+    return sizes[id(node)], len(sizes)
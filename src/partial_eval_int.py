@@ -10,6 +10,58 @@ from ast_nodes import (
     USub,
     UnaryOp,
 )
+from traversal import exp_children, postorder
+
+
+class Linear:
+    __slots__ = ("const", "terms", "negated")
+
+    def __init__(self, const, terms, negated):
+        self.const = const
+        self.terms = terms
+        self.negated = negated
+
+    @classmethod
+    def of(cls, value):
+        match value:
+            case Linear():
+                return value
+            case _:
+                return cls(0, value, False)
+
+    def signed_terms(self):
+        result = []
+        stack = [(self.terms, self.negated)]
+        while stack:
+            part, negated = stack.pop()
+            if type(part) is tuple:
+                left, left_negated, right, right_negated = part
+                stack.append((right, negated is not right_negated))
+                stack.append((left, negated is not left_negated))
+            else:
+                result.append((negated, part))
+        return result
+
+    def sealed(self):
+        if type(self.terms) is not tuple:
+            return self
+        return Linear(self.const, Linear(0, self.terms, self.negated).to_exp(), False)
+
+    def to_exp(self):
+        const = self.const
+        terms = self.signed_terms()
+        if terms[0][0] and const:
+            exp = Constant(const)
+        else:
+            negated, term = terms.pop(0)
+            exp = UnaryOp(USub(), term) if negated else term
+            if const > 0:
+                terms.append((False, Constant(const)))
+            elif const < 0:
+                terms.append((True, Constant(-const)))
+        for negated, term in terms:
+            exp = BinOp(exp, Sub() if negated else Add(), term)
+        return exp
 
 
 class PartialEvalInt:
@@ -17,38 +69,61 @@ class PartialEvalInt:
         self.module = module
 
     def pe_neg(self, value):
+        return self._residual(self.linear_neg(value))
+
+    def pe_add(self, left, right):
+        return self._residual(self.linear_add(left, right))
+
+    def pe_sub(self, left, right):
+        return self._residual(self.linear_sub(left, right))
+
+    def linear_neg(self, value):
         match value:
             case int() as n:
                 return -n
             case _:
-                return UnaryOp(USub(), self._to_exp(value))
+                linear = Linear.of(value)
+                return Linear(-linear.const, linear.terms, not linear.negated)
 
-    def pe_add(self, left, right):
+    def linear_add(self, left, right):
         match (left, right):
-            case (int() as l, int() as r):
-                return l + r
+            case (int(), int()):
+                return left + right
+            case (int() as n, _) | (_, int() as n):
+                linear = Linear.of(right if left is n else left)
+                return Linear(linear.const + n, linear.terms, linear.negated)
             case _:
-                return BinOp(self._to_exp(left), Add(), self._to_exp(right))
+                left_linear = Linear.of(left)
+                right_linear = Linear.of(right)
+                terms = (
+                    left_linear.terms,
+                    left_linear.negated,
+                    right_linear.terms,
+                    right_linear.negated,
+                )
+                return Linear(left_linear.const + right_linear.const, terms, False)
 
-    def pe_sub(self, left, right):
-        match (left, right):
-            case (int() as l, int() as r):
-                return l - r
-            case _:
-                return BinOp(self._to_exp(left), Sub(), self._to_exp(right))
+    def linear_sub(self, left, right):
+        return self.linear_add(left, self.linear_neg(right))
 
     def pe_exp(self, exp):
+        pe_node = self.pe_node
+        return self._residual(
+            postorder(exp, exp_children, lambda node, values: pe_node(node, values))
+        )
+
+    def pe_node(self, exp, values, env=None):
         match exp:
             case Constant(value=value):
                 return value
             case Call(func=Name(id="input_int"), args=[]):
                 return exp
-            case UnaryOp(op=USub(), operand=operand):
-                return self.pe_neg(self.pe_exp(operand))
-            case BinOp(left=left, op=Add(), right=right):
-                return self.pe_add(self.pe_exp(left), self.pe_exp(right))
-            case BinOp(left=left, op=Sub(), right=right):
-                return self.pe_sub(self.pe_exp(left), self.pe_exp(right))
+            case UnaryOp(op=USub()):
+                return self.linear_neg(values[0])
+            case BinOp(op=Add()):
+                return self.linear_add(values[0], values[1])
+            case BinOp(op=Sub()):
+                return self.linear_sub(values[0], values[1])
             case _:
                 raise ValueError(f"unsupported expression: {exp!r}")
 
@@ -67,10 +142,20 @@ class PartialEvalInt:
     def pe(self):
         return Module(self.pe_stmts(self.module.body))
 
+    @staticmethod
+    def _residual(value):
+        match value:
+            case Linear():
+                return value.to_exp()
+            case _:
+                return value
+
     @staticmethod
     def _to_exp(value):
         match value:
             case int() as n:
                 return Constant(n)
+            case Linear():
+                return value.to_exp()
             case _:
                 return value
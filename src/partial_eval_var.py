@@ -11,13 +11,67 @@ from ast_nodes import (
     USub,
     UnaryOp,
 )
-from partial_eval_int import PartialEvalInt
+from flat_ast import (
+    ADD,
+    ASSIGN,
+    CONST,
+    INPUT,
+    INT64_MIN,
+    INT64_MAX,
+    NAME,
+    NEG,
+    SUB,
+    FlatBuilder,
+    FlatModule,
+)
+from traversal import exp_children, postorder
+from partial_eval_int import Linear, PartialEvalInt
 
 
 class PartialEvalVar(PartialEvalInt):
+    def __init__(self, module: Module, memoize=False):
+        super().__init__(module)
+        self.memo = {} if memoize else None
+        self._memo_env = None
+        self._aliases = {}
+        self._alias_env = None
+
     def pe_exp(self, exp, env=None):
         if env is None:
             env = {}
+        pe_node = self.pe_node
+        memo = self.memo
+        if memo is None:
+            return self._residual(
+                postorder(
+                    exp, exp_children, lambda node, values: pe_node(node, values, env)
+                )
+            )
+        if env is not self._memo_env:
+            memo.clear()
+            self._memo_env = env
+
+        def children(node):
+            if id(node) in memo:
+                return ()
+            return exp_children(node)
+
+        def combine(node, values):
+            entry = memo.get(id(node))
+            if entry is None:
+                value = pe_node(node, values, env)
+                memo[id(node)] = (node, value, False)
+                return value
+            _, value, sealed = entry
+            if not sealed:
+                if type(value) is Linear:
+                    value = value.sealed()
+                memo[id(node)] = (node, value, True)
+            return value
+
+        return self._residual(postorder(exp, children, combine))
+
+    def pe_node(self, exp, values, env=None):
         match exp:
             case Constant(value=value):
                 return value
@@ -27,12 +81,12 @@ class PartialEvalVar(PartialEvalInt):
                 return exp
             case Call(func=Name(id="input_int"), args=[]):
                 return exp
-            case UnaryOp(op=USub(), operand=operand):
-                return self.pe_neg(self.pe_exp(operand, env))
-            case BinOp(left=left, op=Add(), right=right):
-                return self.pe_add(self.pe_exp(left, env), self.pe_exp(right, env))
-            case BinOp(left=left, op=Sub(), right=right):
-                return self.pe_sub(self.pe_exp(left, env), self.pe_exp(right, env))
+            case UnaryOp(op=USub()):
+                return self.linear_neg(values[0])
+            case BinOp(op=Add()):
+                return self.linear_add(values[0], values[1])
+            case BinOp(op=Sub()):
+                return self.linear_sub(values[0], values[1])
             case _:
                 raise ValueError(f"unsupported expression: {exp!r}")
 
@@ -42,10 +96,7 @@ class PartialEvalVar(PartialEvalInt):
         match stmt:
             case Assign(targets=[Name(id=var)], value=value):
                 pe_value = self.pe_exp(value, env)
-                if isinstance(pe_value, int):
-                    env[var] = pe_value
-                else:
-                    env.pop(var, None)
+                self._bind(env, var, pe_value)
                 return Assign([Name(var)], self._to_exp(pe_value))
             case Expr(value=Call(func=Name(id="print"), args=[arg])):
                 return Expr(Call(Name("print"), [self._to_exp(self.pe_exp(arg, env))]))
@@ -54,6 +105,44 @@ class PartialEvalVar(PartialEvalInt):
             case _:
                 raise ValueError(f"unsupported statement: {stmt!r}")
 
+    def _bind(self, env, var, value):
+        aliases = self._aliases_of(env)
+        old = env.pop(var, None)
+        stale = aliases.pop(var, ())
+        for alias in stale:
+            del env[alias]
+        if type(old) is Name:
+            aliases[old.id].discard(var)
+        if type(value) is Name:
+            if value.id == var:
+                value = None
+            else:
+                aliases.setdefault(value.id, set()).add(var)
+        elif not isinstance(value, int):
+            value = None
+        if value is not None:
+            env[var] = value
+        if stale or old != value:
+            self._forget()
+
+    def _aliases_of(self, env):
+        if env is not self._alias_env:
+            self._alias_env = env
+            self._aliases = self._index_aliases(env)
+        return self._aliases
+
+    @staticmethod
+    def _index_aliases(env):
+        aliases = {}
+        for var, value in env.items():
+            if type(value) is Name:
+                aliases.setdefault(value.id, set()).add(var)
+        return aliases
+
+    def _forget(self):
+        if self.memo:
+            self.memo.clear()
+
     def pe_stmts(self, stmts, env=None):
         if env is None:
             env = {}
@@ -61,3 +150,100 @@ class PartialEvalVar(PartialEvalInt):
 
     def pe(self):
         return Module(self.pe_stmts(self.module.body, {}))
+
+    def pe_flat(self, flat: FlatModule, env=None) -> FlatModule:
+        if env is None:
+            env = {}
+        consts = flat.consts
+        names = flat.names
+        out = FlatBuilder()
+        input_int = Call(Name("input_int"), [])
+        leaves = {}
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for kind, a in zip(flat.kinds, flat.left):
+            if kind == CONST:
+                push(consts[a])
+            elif kind == NAME:
+                var = names[a]
+                if var in env:
+                    push(env[var])
+                else:
+                    leaf = leaves.get(var)
+                    if leaf is None:
+                        leaf = leaves[var] = Name(var)
+                    push(leaf)
+            elif kind == INPUT:
+                push(input_int)
+            elif kind == NEG:
+                value = pop()
+                result = self.linear_neg(value)
+                if not _fits_int64(result):
+                    result = Linear.of(UnaryOp(USub(), self._to_exp(value)))
+                push(result)
+            elif kind == ADD or kind == SUB:
+                right = pop()
+                left = pop()
+                if kind == ADD:
+                    result = self.linear_add(left, right)
+                else:
+                    result = self.linear_sub(left, right)
+                if not _fits_int64(result):
+                    op = Add() if kind == ADD else Sub()
+                    exp = BinOp(self._to_exp(left), op, self._to_exp(right))
+                    result = Linear.of(exp)
+                push(result)
+            else:
+                value = pop()
+                value_index = self._emit_flat(out, value)
+                if kind == ASSIGN:
+                    var = names[a]
+                    if type(value) is Linear and value.const == 0 and not value.negated:
+                        value = value.terms
+                    self._bind(env, var, value)
+                    out.emit(ASSIGN, out.name_index(var), value_index)
+                else:
+                    out.emit(kind, value_index)
+                out.end_stmt()
+        return out.flat
+
+    def _emit_flat(self, out, value):
+        match value:
+            case int():
+                return out.emit(CONST, out.const_index(value))
+            case Name(id=var):
+                return out.emit(NAME, out.name_index(var))
+            case Call(func=Name(id="input_int"), args=[]):
+                return out.emit(INPUT)
+            case Linear():
+                return self._emit_flat_linear(out, value)
+            case _:
+                return out.add_exp(value)
+
+    def _emit_flat_linear(self, out, linear):
+        const = linear.const
+        terms = linear.signed_terms()
+        if terms[0][0] and const:
+            root = self._emit_flat(out, const)
+        else:
+            negated, term = terms.pop(0)
+            root = self._emit_flat(out, term)
+            if negated:
+                root = out.emit(NEG, root)
+            if const > 0 or const == INT64_MIN:
+                terms.append((False, const))
+            elif const < 0:
+                terms.append((True, -const))
+        for negated, term in terms:
+            right = self._emit_flat(out, term)
+            root = out.emit(SUB if negated else ADD, root, right)
+        return root
+
+
+def _fits_int64(value):
+    if type(value) is Linear:
+        value = value.const
+    elif type(value) is not int:
+        return True
+    return INT64_MIN <= value <= INT64_MAX
@@ -0,0 +1,172 @@
+from x86_ast import Deref, Immediate, Instr, X86Program
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+
+def _instr(instr, op, width):
+    return isinstance(instr, Instr) and instr.op == op and len(instr.args) == width
+
+
+def _legal(src, dst):
+    return not (isinstance(src, Deref) and isinstance(dst, Deref))
+
+
+def _immediate(value):
+    if _INT32_MIN <= value <= _INT32_MAX:
+        return Immediate(value)
+    return None
+
+
+def self_move(window):
+    [instr] = window
+    if _instr(instr, "movq", 2) and instr.args[0] == instr.args[1]:
+        return []
+    return None
+
+
+def add_zero(window):
+    [instr] = window
+    if (
+        isinstance(instr, Instr)
+        and instr.op in ("addq", "subq")
+        and instr.args[0] == Immediate(0)
+    ):
+        return []
+    return None
+
+
+def double_neg(window):
+    first, second = window
+    if _instr(first, "negq", 1) and _instr(second, "negq", 1):
+        if first.args == second.args:
+            return []
+    return None
+
+
+def redundant_reload(window):
+    first, second = window
+    if _instr(first, "movq", 2) and _instr(second, "movq", 2):
+        src, dst = first.args
+        if second.args == [dst, src]:
+            return [first]
+    return None
+
+
+def overwritten(window):
+    first, second = window
+    if not _instr(second, "movq", 2) or not isinstance(first, Instr):
+        return None
+    if first.op not in ("movq", "addq", "subq", "negq"):
+        return None
+    src, dst = second.args
+    if first.args[-1] == dst and src != dst:
+        return [second]
+    return None
+
+
+def zero_then_add(window):
+    first, second = window
+    if _instr(first, "movq", 2) and _instr(second, "addq", 2):
+        zero, dst = first.args
+        src = second.args[0]
+        if zero == Immediate(0) and second.args[1] == dst and src != dst:
+            if _legal(src, dst):
+                return [Instr("movq", [src, dst])]
+    return None
+
+
+def fold_immediates(window):
+    first, second = window
+    if not _instr(first, "movq", 2) or not isinstance(first.args[0], Immediate):
+        return None
+    value = first.args[0].value
+    dst = first.args[1]
+    match second:
+        case Instr(op="negq", args=[arg]) if arg == dst:
+            folded = _immediate(-value)
+        case Instr(op="addq", args=[Immediate(value=other), arg]) if arg == dst:
+            folded = _immediate(value + other)
+        case Instr(op="subq", args=[Immediate(value=other), arg]) if arg == dst:
+            folded = _immediate(value - other)
+        case _:
+            return None
+    if folded is None:
+        return None
+    return [Instr("movq", [folded, dst])]
+
+
+def neg_add_to_sub(window):
+    load, neg, add = window
+    if not (
+        _instr(load, "movq", 2) and _instr(neg, "negq", 1) and _instr(add, "addq", 2)
+    ):
+        return None
+    src, dst = load.args
+    other = add.args[0]
+    if neg.args[0] != dst or add.args[1] != dst or dst in (src, other):
+        return None
+    if not (_legal(other, dst) and _legal(src, dst)):
+        return None
+    return [Instr("movq", [other, dst]), Instr("subq", [src, dst])]
+
+
+PEEPHOLE_RULES = [
+    ("self_move", 1, ("movq",), self_move),
+    ("add_zero", 1, ("addq", "subq"), add_zero),
+    ("double_neg", 2, ("negq",), double_neg),
+    ("redundant_reload", 2, ("movq",), redundant_reload),
+    ("overwritten", 2, ("movq",), overwritten),
+    ("zero_then_add", 2, ("addq",), zero_then_add),
+    ("fold_immediates", 2, ("negq", "addq", "subq"), fold_immediates),
+    ("neg_add_to_sub", 3, ("addq",), neg_add_to_sub),
+]
+
+
+class PeepholeOptimizer:
+    def __init__(self, rules=None):
+        self.rules = list(PEEPHOLE_RULES if rules is None else rules)
+        self.stats = {name: 0 for name, _, _, _ in self.rules}
+        self.passes = 0
+        self._by_op = {}
+        for name, width, ops, rule in self.rules:
+            for op in ops:
+                self._by_op.setdefault(op, []).append((name, width, rule))
+
+    def optimize(self, program):
+        body = program.body
+        while True:
+            self.passes += 1
+            body, fired = self.run_pass(body)
+            if not fired:
+                break
+        return X86Program(
+            body,
+            stack_space=program.stack_space,
+            main_label=program.main_label,
+            homes=program.homes,
+            used_callee=program.used_callee,
+        )
+
+    def run_pass(self, body):
+        by_op = self._by_op
+        stats = self.stats
+        out = []
+        pending = list(reversed(body))
+        fired = 0
+        while pending:
+            instr = pending.pop()
+            out.append(instr)
+            if not isinstance(instr, Instr):
+                continue
+            for name, width, rule in by_op.get(instr.op, ()):
+                if len(out) < width:
+                    continue
+                replacement = rule(out[-width:])
+                if replacement is not None:
+                    del out[-width:]
+                    pending.extend(reversed(replacement))
+                    stats[name] += 1
+                    fired += 1
+                    break
+        return out, fired
@@ -0,0 +1,279 @@
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+_NODE = object()
+_MISSING = object()
+
+
+class _Bitmap:
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap, array):
+        self.bitmap = bitmap
+        self.array = array
+
+
+class _Collision:
+    __slots__ = ("hash", "array")
+
+    def __init__(self, hash, array):
+        self.hash = hash
+        self.array = array
+
+
+_EMPTY_NODE = _Bitmap(0, ())
+
+
+def _hash(key):
+    return hash(key) & _HASH_MASK
+
+
+def _find(node, h, key):
+    shift = 0
+    while True:
+        if type(node) is _Collision:
+            array = node.array
+            for index in range(0, len(array), 2):
+                if array[index] == key:
+                    return array[index + 1]
+            return _MISSING
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        index = 2 * (node.bitmap & (bit - 1)).bit_count()
+        k = node.array[index]
+        if k is _NODE:
+            node = node.array[index + 1]
+            shift += _BITS
+        elif k == key:
+            return node.array[index + 1]
+        else:
+            return _MISSING
+
+
+def _assoc(node, shift, h, key, value):
+    if type(node) is _Collision:
+        if node.hash == h:
+            array = node.array
+            for index in range(0, len(array), 2):
+                if array[index] == key:
+                    if array[index + 1] is value:
+                        return node, False
+                    array = array[: index + 1] + (value,) + array[index + 2 :]
+                    return _Collision(h, array), False
+            return _Collision(h, array + (key, value)), True
+        node = _Bitmap(1 << ((node.hash >> shift) & _MASK), (_NODE, node))
+    bitmap = node.bitmap
+    array = node.array
+    bit = 1 << ((h >> shift) & _MASK)
+    index = 2 * (bitmap & (bit - 1)).bit_count()
+    if not bitmap & bit:
+        return _Bitmap(bitmap | bit, array[:index] + (key, value) + array[index:]), True
+    k = array[index]
+    v = array[index + 1]
+    if k is _NODE:
+        child, added = _assoc(v, shift + _BITS, h, key, value)
+        if child is v:
+            return node, False
+    elif k == key:
+        if v is value:
+            return node, False
+        return (
+            _Bitmap(bitmap, array[: index + 1] + (value,) + array[index + 2 :]),
+            False,
+        )
+    else:
+        child = _split(shift + _BITS, k, v, h, key, value)
+        added = True
+    return _Bitmap(bitmap, array[:index] + (_NODE, child) + array[index + 2 :]), added
+
+
+def _split(shift, key1, value1, h2, key2, value2):
+    h1 = _hash(key1)
+    if h1 == h2:
+        return _Collision(h1, (key1, value1, key2, value2))
+    node, _ = _assoc(_EMPTY_NODE, shift, h1, key1, value1)
+    node, _ = _assoc(node, shift, h2, key2, value2)
+    return node
+
+
+def _dissoc(node, shift, h, key):
+    if type(node) is _Collision:
+        if node.hash != h:
+            return node
+        array = node.array
+        for index in range(0, len(array), 2):
+            if array[index] == key:
+                if len(array) == 2:
+                    return None
+                return _Collision(h, array[:index] + array[index + 2 :])
+        return node
+    bitmap = node.bitmap
+    array = node.array
+    bit = 1 << ((h >> shift) & _MASK)
+    if not bitmap & bit:
+        return node
+    index = 2 * (bitmap & (bit - 1)).bit_count()
+    k = array[index]
+    if k is _NODE:
+        child = _dissoc(array[index + 1], shift + _BITS, h, key)
+        if child is array[index + 1]:
+            return node
+        if child is not None:
+            return _Bitmap(bitmap, array[: index + 1] + (child,) + array[index + 2 :])
+    elif k != key:
+        return node
+    if bitmap == bit:
+        return None
+    return _Bitmap(bitmap ^ bit, array[:index] + array[index + 2 :])
+
+
+def _items(node):
+    stack = [node]
+    while stack:
+        array = stack.pop().array
+        for index in range(0, len(array), 2):
+            if array[index] is _NODE:
+                stack.append(array[index + 1])
+            else:
+                yield array[index], array[index + 1]
+
+
+def _same_shape(left, right):
+    stack = [(left, right)]
+    while stack:
+        left, right = stack.pop()
+        if left is right:
+            continue
+        if type(left) is not type(right) or len(left.array) != len(right.array):
+            return None
+        if type(left) is _Bitmap and left.bitmap != right.bitmap:
+            return None
+        if type(left) is _Collision:
+            return None
+        for k1, v1, k2, v2 in zip(
+            left.array[::2], left.array[1::2], right.array[::2], right.array[1::2]
+        ):
+            if k1 is _NODE and k2 is _NODE:
+                stack.append((v1, v2))
+            elif k1 is _NODE or k2 is _NODE or k1 != k2:
+                return None
+            elif v1 is not v2 and v1 != v2:
+                return False
+    return True
+
+
+class PersistentMap:
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items=()):
+        self._root = _EMPTY_NODE
+        self._size = 0
+        if isinstance(items, dict):
+            items = items.items()
+        for key, value in items:
+            self._root, added = _assoc(self._root, 0, _hash(key), key, value)
+            self._size += added
+
+    @classmethod
+    def _make(cls, root, size):
+        result = cls.__new__(cls)
+        result._root = root
+        result._size = size
+        return result
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return _find(self._root, _hash(key), key) is not _MISSING
+
+    def __getitem__(self, key):
+        value = _find(self._root, _hash(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = _find(self._root, _hash(key), key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return self._make(root, self._size + added)
+
+    def discard(self, key):
+        root = _dissoc(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        return self._make(_EMPTY_NODE if root is None else root, self._size - 1)
+
+    def __iter__(self):
+        for key, _ in _items(self._root):
+            yield key
+
+    def items(self):
+        return _items(self._root)
+
+    def __eq__(self, other):
+        if not isinstance(other, PersistentMap):
+            return NotImplemented
+        if self._size != other._size:
+            return False
+        same = _same_shape(self._root, other._root)
+        if same is not None:
+            return same
+        get = other.get
+        return all(get(key, _MISSING) == value for key, value in self.items())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PersistentMap({dict(self.items())!r})"
+
+
+EMPTY_MAP = PersistentMap()
+
+
+class MapEnv:
+    __slots__ = ("map",)
+
+    def __init__(self, map=EMPTY_MAP):
+        self.map = map
+
+    def __len__(self):
+        return len(self.map)
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __getitem__(self, key):
+        return self.map[key]
+
+    def get(self, key, default=None):
+        return self.map.get(key, default)
+
+    def __setitem__(self, key, value):
+        self.map = self.map.set(key, value)
+
+    def __delitem__(self, key):
+        if key not in self.map:
+            raise KeyError(key)
+        self.map = self.map.discard(key)
+
+    def pop(self, key, default=_MISSING):
+        value = self.map.get(key, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self.map = self.map.discard(key)
+        return value
+
+    def __iter__(self):
+        return iter(self.map)
+
+    def items(self):
+        return self.map.items()
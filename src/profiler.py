@@ -0,0 +1,172 @@
+import json
+import marshal
+from time import perf_counter_ns
+
+PROFILE_FILENAME = "<lvar>"
+STMT_FRAME = "<stmt>"
+
+
+class NodeProfiler:
+    def __init__(self):
+        self.entries = {}
+        self._stmt_index = -1
+        self._next_stmt_index = 0
+        self._child_ns = []
+        self._active = {}
+        self._frames = []
+
+    def attach(self, interp):
+        interp_fn = interp.interp
+        exec_stmt = interp.exec_stmt
+        exp_children = interp.exp_children
+        eval_exp = interp.eval_exp
+
+        def profiled_interp(env=None):
+            self._next_stmt_index = 0
+            return interp_fn(env)
+
+        def profiled_exec_stmt(stmt, env):
+            outer_index = self._stmt_index
+            self._stmt_index = self._next_stmt_index
+            self._next_stmt_index += 1
+            try:
+                return self._measure(STMT_FRAME, unwinding_exec_stmt, stmt, env)
+            finally:
+                self._stmt_index = outer_index
+
+        def unwinding_exec_stmt(stmt, env):
+            mark = len(self._frames)
+            try:
+                return exec_stmt(stmt, env)
+            finally:
+                while len(self._frames) > mark:
+                    self._exit()
+
+        def profiled_exp_children(exp):
+            self._enter(type(exp).__name__)
+            return exp_children(exp)
+
+        def profiled_eval_exp(exp, values, env):
+            try:
+                return eval_exp(exp, values, env)
+            finally:
+                self._exit()
+
+        interp.interp = profiled_interp
+        interp.exec_stmt = profiled_exec_stmt
+        interp.exp_children = profiled_exp_children
+        interp.eval_exp = profiled_eval_exp
+        return interp
+
+    @staticmethod
+    def detach(interp):
+        for hook in ("interp", "exec_stmt", "exp_children", "eval_exp"):
+            interp.__dict__.pop(hook, None)
+        return interp
+
+    def _measure(self, label, fn, node, env):
+        self._enter(label)
+        try:
+            return fn(node, env)
+        finally:
+            self._exit()
+
+    def _enter(self, label):
+        active = self._active
+        depth = active.get(label, 0)
+        active[label] = depth + 1
+        self._child_ns.append(0)
+        self._frames.append((self._stmt_index, label, depth, perf_counter_ns()))
+
+    def _exit(self):
+        index, label, depth, start = self._frames.pop()
+        elapsed = perf_counter_ns() - start
+        child_ns = self._child_ns
+        children = child_ns.pop()
+        if child_ns:
+            child_ns[-1] += elapsed
+        self._active[label] = depth
+        key = (index, label)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, 0, 0, 0]
+        entry[0] += 1
+        entry[2] += elapsed - children
+        if depth == 0:
+            entry[1] += 1
+            entry[3] += elapsed
+
+    def by_node_type(self):
+        return self._aggregate(lambda index, label: label, skip_stmts=True)
+
+    def by_statement(self):
+        return self._aggregate(lambda index, label: index, skip_stmts=False)
+
+    def _aggregate(self, group, skip_stmts):
+        totals = {}
+        for (index, label), (calls, _, self_ns, cum_ns) in self.entries.items():
+            if skip_stmts and label == STMT_FRAME:
+                continue
+            if not skip_stmts and label != STMT_FRAME:
+                continue
+            key = group(index, label)
+            count, total_self, total_cum = totals.get(key, (0, 0, 0))
+            totals[key] = (count + calls, total_self + self_ns, total_cum + cum_ns)
+        return totals
+
+    def pstats_dict(self):
+        stats = {}
+        for (index, label), (calls, primitive, self_ns, cum_ns) in self.entries.items():
+            func = (PROFILE_FILENAME, max(index, 0), label)
+            callers = {}
+            if label != STMT_FRAME:
+                callers[(PROFILE_FILENAME, max(index, 0), STMT_FRAME)] = (
+                    primitive,
+                    calls,
+                    self_ns / 1e9,
+                    cum_ns / 1e9,
+                )
+            stats[func] = (primitive, calls, self_ns / 1e9, cum_ns / 1e9, callers)
+        return stats
+
+    def dump_pstats(self, path):
+        with open(path, "wb") as f:
+            marshal.dump(self.pstats_dict(), f)
+
+    def speedscope(self, name="lvar"):
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+
+        def frame(label):
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({"name": label})
+            return frame_index[label]
+
+        for (index, label), (_, _, self_ns, _) in sorted(self.entries.items()):
+            stack = [frame(f"stmt {index}")]
+            if label != STMT_FRAME:
+                stack.append(frame(label))
+            samples.append(stack)
+            weights.append(self_ns)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "nanoseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def dump_speedscope(self, path, name="lvar"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(name), f)
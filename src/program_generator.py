@@ -0,0 +1,51 @@
+import random
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+
+
+def generate_program(
+    num_stmts, num_vars=8, max_depth=3, input_rate=0.1, print_rate=0.2, seed=0
+) -> Module:
+    rng = random.Random(seed)
+    defined = []
+    defined_set = set()
+    body = []
+    for _ in range(num_stmts):
+        exp = _random_exp(rng, defined, max_depth, input_rate)
+        if defined and rng.random() < print_rate:
+            body.append(Expr(Call(Name("print"), [exp])))
+            continue
+        var = f"v{rng.randrange(num_vars)}"
+        body.append(Assign([Name(var)], exp))
+        if var not in defined_set:
+            defined_set.add(var)
+            defined.append(var)
+    return Module(body)
+
+
+def _random_exp(rng, defined, depth, input_rate):
+    if depth == 0 or rng.random() < 0.3:
+        roll = rng.random()
+        if roll < input_rate:
+            return Call(Name("input_int"), [])
+        if defined and roll < 0.6:
+            return Name(rng.choice(defined))
+        return Constant(rng.randint(-100, 100))
+    if rng.random() < 0.2:
+        return UnaryOp(USub(), _random_exp(rng, defined, depth - 1, input_rate))
+    op = Add() if rng.random() < 0.5 else Sub()
+    left = _random_exp(rng, defined, depth - 1, input_rate)
+    right = _random_exp(rng, defined, depth - 1, input_rate)
+    return BinOp(left, op, right)
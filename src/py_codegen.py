@@ -0,0 +1,253 @@
+from collections import OrderedDict
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+
+MAX_NESTING = 64
+
+
+class PythonCodegen:
+    def __init__(self):
+        self._lines = []
+        self._locals = {}
+        self._tmp_counter = 0
+
+    def generate(self, module: Module) -> str:
+        self.__init__()
+        for stmt in module.body:
+            self._gen_stmt(stmt)
+        assigned = ", ".join(f"{var!r}: {local}" for var, local in self._locals.items())
+        lines = ["def lvar_main(_env, _read_int, _write_int):"]
+        lines.extend(f"    {line}" for line in self._lines)
+        lines.append(f"    _env.update({{{assigned}}})")
+        lines.append("    return _env")
+        return "\n".join(lines) + "\n"
+
+    def _gen_stmt(self, stmt):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                code = self._gen_exp(value)
+                if var not in self._locals:
+                    self._locals[var] = f"v{len(self._locals)}"
+                self._lines.append(f"{self._locals[var]} = {code}")
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                self._lines.append(f"_write_int({self._gen_exp(arg)})")
+            case Expr(value=Call(func=Name(id="print"), args=args)):
+                self._lines.append(
+                    _fail(f"print expects one argument: Call(Name('print'), {args!r})")
+                )
+            case Expr(value=value):
+                self._lines.append(self._gen_exp(value))
+            case _:
+                self._lines.append(_fail(f"unsupported statement: {stmt!r}"))
+
+    def _gen_exp(self, exp):
+        if _nesting(exp) <= MAX_NESTING:
+            return self._gen_nested(exp)
+        return self._gen_flat(exp)
+
+    def _gen_nested(self, exp):
+        match exp:
+            case BinOp(left=left, op=Add() | Sub() as op, right=right):
+                symbol = "+" if isinstance(op, Add) else "-"
+                return f"({self._gen_nested(left)} {symbol} {self._gen_nested(right)})"
+            case UnaryOp(op=USub(), operand=operand):
+                return f"(-{self._gen_nested(operand)})"
+            case _:
+                return self._gen_leaf(exp)
+
+    def _gen_flat(self, exp):
+        stack = [(exp, False)]
+        results = []
+        while stack:
+            node, expanded = stack.pop()
+            match node:
+                case BinOp(left=left, op=Add() | Sub() as op, right=right):
+                    if not expanded:
+                        stack.extend([(node, True), (right, False), (left, False)])
+                        continue
+                    right_code = results.pop()
+                    left_code = results.pop()
+                    symbol = "+" if isinstance(op, Add) else "-"
+                    results.append(self._new_tmp(f"{left_code} {symbol} {right_code}"))
+                case UnaryOp(op=USub(), operand=operand):
+                    if not expanded:
+                        stack.extend([(node, True), (operand, False)])
+                        continue
+                    results.append(self._new_tmp(f"-{results.pop()}"))
+                case Constant():
+                    results.append(self._gen_leaf(node))
+                case Name(id=var) if var in self._locals:
+                    results.append(self._gen_leaf(node))
+                case _:
+                    results.append(self._new_tmp(self._gen_leaf(node)))
+        return results.pop()
+
+    def _gen_leaf(self, exp):
+        match exp:
+            case Name(id=var) if var not in ("print", "input_int"):
+                if var in self._locals:
+                    return self._locals[var]
+                return f"_lookup(_env, {var!r})"
+            case Constant(value=value):
+                return repr(value)
+            case Call(func=Name(id="input_int"), args=[]):
+                return "_read_int()"
+            case Call():
+                return _fail(f"unsupported call expression: {exp!r}")
+            case UnaryOp(op=op):
+                return _fail(f"unsupported unary operator: {op!r}")
+            case BinOp(op=op):
+                return _fail(f"unsupported binary operator: {op!r}")
+            case _:
+                return _fail(f"unsupported expression: {exp!r}")
+
+    def _new_tmp(self, code):
+        tmp = f"t{self._tmp_counter}"
+        self._tmp_counter += 1
+        self._lines.append(f"{tmp} = {code}")
+        return tmp
+
+
+class CodeCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, module: Module):
+        key = structural_key(module)
+        main = self._entries.get(key)
+        if main is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return main
+        self.misses += 1
+        main = compile_module(module)
+        self._entries[key] = main
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return main
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+DEFAULT_CACHE = CodeCache()
+
+
+def generate_source(module: Module) -> str:
+    return PythonCodegen().generate(module)
+
+
+def compile_module(module: Module):
+    namespace = {"_lookup": _lookup, "_raise": _raise}
+    exec(compile(generate_source(module), "<lvar>", "exec"), namespace)
+    return namespace["lvar_main"]
+
+
+def structural_key(module: Module):
+    key = []
+    stack = list(reversed(module.body))
+    while stack:
+        node = stack.pop()
+        match node:
+            case Constant(value=value):
+                key.append((Constant, type(value), value))
+            case Name(id=var):
+                key.append((Name, var))
+            case UnaryOp(op=op, operand=operand):
+                key.append((UnaryOp, type(op)))
+                stack.append(operand)
+            case BinOp(left=left, op=op, right=right):
+                key.append((BinOp, type(op)))
+                stack.extend([right, left])
+            case Call(func=func, args=args):
+                key.append((Call, len(args)))
+                stack.extend(reversed(args))
+                stack.append(func)
+            case Expr(value=value):
+                key.append(Expr)
+                stack.append(value)
+            case Assign(targets=targets, value=value):
+                key.append((Assign, len(targets)))
+                stack.append(value)
+                stack.extend(reversed(targets))
+            case _:
+                key.append((type(node), repr(node)))
+    return tuple(key)
+
+
+class PyCodegenVar(InterpreterVar):
+    def __init__(
+        self, module: Module, input_channel=None, output_channel=None, cache=None
+    ):
+        super().__init__(module, input_channel, output_channel)
+        if cache is None:
+            cache = DEFAULT_CACHE
+        self._main = cache.get(module)
+
+    def interp(self, env=None):
+        if env is None:
+            env = {}
+        try:
+            return self._main(
+                env, self.input_channel.read_int, self.output_channel.write_int
+            )
+        finally:
+            self.output_channel.flush()
+
+    def run(self, inputs=()):
+        outputs = ListOutput()
+        self._main({}, BufferInput(inputs).read_int, outputs.write_int)
+        return outputs.values
+
+
+def _nesting(exp):
+    deepest = 0
+    stack = [(exp, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > deepest:
+            deepest = depth
+            if deepest > MAX_NESTING:
+                return deepest
+        match node:
+            case BinOp(left=left, right=right):
+                stack.extend([(left, depth + 1), (right, depth + 1)])
+            case UnaryOp(operand=operand):
+                stack.append((operand, depth + 1))
+    return deepest
+
+
+def _fail(message):
+    return f"_raise({message!r})"
+
+
+def _lookup(env, var):
+    if var in env:
+        return env[var]
+    raise ValueError(f"undefined variable: {var}")
+
+
+def _raise(message):
+    raise ValueError(message)
@@ -0,0 +1,240 @@
+from heapq import heappop, heappush
+
+from liveness import read_write_sets
+from x86_ast import CALLEE_SAVED_REGISTERS, CALLER_SAVED_REGISTERS, Instr, Reg, Var
+
+SCRATCH_REGISTER = "rax"
+
+ALLOCATABLE_REGISTERS = tuple(
+    name
+    for name in CALLER_SAVED_REGISTERS + CALLEE_SAVED_REGISTERS
+    if name != SCRATCH_REGISTER
+)
+
+
+def build_interference(program, liveness):
+    graph = {}
+    for instr, live in zip(program.body, liveness.live_after_sets()):
+        reads, writes = read_write_sets(instr)
+        for loc in _operands(instr, reads, writes):
+            graph.setdefault(loc, set())
+        if _is_move(instr):
+            live.difference_update(reads)
+        for dst in writes:
+            others = live - {dst}
+            graph[dst] |= others
+            for loc in others:
+                graph.setdefault(loc, set()).add(dst)
+    return graph
+
+
+def _operands(instr, reads, writes):
+    if isinstance(instr, Instr):
+        return [arg for arg in instr.args if arg in reads or arg in writes]
+    return sorted(reads | writes, key=lambda reg: reg.name)
+
+
+def _is_move(instr):
+    return isinstance(instr, Instr) and instr.op == "movq"
+
+
+def spill_costs(program):
+    costs = {}
+    for instr in program.body:
+        if isinstance(instr, Instr):
+            for arg in instr.args:
+                if isinstance(arg, Var):
+                    costs[arg] = costs.get(arg, 0) + 1
+    return costs
+
+
+def move_related(program):
+    moves = {}
+    for instr in program.body:
+        if _is_move(instr):
+            src, dst = instr.args
+            if src != dst and isinstance(dst, Var) and isinstance(src, (Var, Reg)):
+                moves.setdefault(src, {})[dst] = None
+                moves.setdefault(dst, {})[src] = None
+            elif isinstance(src, Var) and isinstance(dst, Reg):
+                moves.setdefault(src, {})[dst] = None
+    return moves
+
+
+def coalesce_moves(graph, moves, costs, registers=ALLOCATABLE_REGISTERS):
+    limit = len(registers)
+    aliases = {}
+    for loc, partners in moves.items():
+        for partner in partners:
+            keep, gone = _find(aliases, partner), _find(aliases, loc)
+            if isinstance(gone, Reg):
+                keep, gone = gone, keep
+            if keep == gone or isinstance(gone, Reg) or keep in graph[gone]:
+                continue
+            if isinstance(keep, Reg):
+                if keep.name not in registers or not _george(graph, keep, gone, limit):
+                    continue
+            elif not _briggs(graph, keep, gone, limit):
+                continue
+            for neighbor in graph.pop(gone):
+                graph[neighbor].discard(gone)
+                graph[neighbor].add(keep)
+                graph[keep].add(neighbor)
+            costs[keep] = costs.get(keep, 0) + costs.pop(gone, 0)
+            aliases[gone] = keep
+    return aliases
+
+
+def _find(aliases, loc):
+    while loc in aliases:
+        loc = aliases[loc]
+    return loc
+
+
+def _briggs(graph, left, right, limit):
+    significant = 0
+    left_neighbors = graph[left]
+    for neighbors, seen in ((left_neighbors, ()), (graph[right], left_neighbors)):
+        for neighbor in neighbors:
+            if neighbor in seen:
+                continue
+            if isinstance(neighbor, Reg) or len(graph[neighbor]) >= limit:
+                significant += 1
+                if significant >= limit:
+                    return False
+    return True
+
+
+def _george(graph, reg, var, limit):
+    interferes = graph[reg]
+    return all(
+        neighbor in interferes
+        or isinstance(neighbor, Reg)
+        or len(graph[neighbor]) < limit
+        for neighbor in graph[var]
+    )
+
+
+def expand_aliases(aliases, registers, slots):
+    registers = dict(registers)
+    slots = dict(slots)
+    for var in aliases:
+        home = _find(aliases, var)
+        if isinstance(home, Reg):
+            registers[var] = home.name
+        elif home in registers:
+            registers[var] = registers[home]
+        else:
+            slots[var] = slots[home]
+    return registers, slots
+
+
+def color_graph(graph, costs, moves=None, registers=ALLOCATABLE_REGISTERS):
+    register_colors = {name: color for color, name in enumerate(registers)}
+    colors = {}
+    for loc in graph:
+        if isinstance(loc, Reg) and loc.name in register_colors:
+            colors[loc] = register_colors[loc.name]
+    saturation = {loc: {} for loc in graph if isinstance(loc, Var)}
+    for loc, color in colors.items():
+        for neighbor in graph[loc]:
+            if neighbor in saturation:
+                _saturate(saturation[neighbor], color, 1)
+    rank = {var: index for index, var in enumerate(saturation)}
+    spilled = set()
+    heap = []
+
+    def push(var):
+        heappush(
+            heap,
+            (
+                -len(saturation[var]),
+                -costs.get(var, 0),
+                -len(graph[var]),
+                rank[var],
+                var,
+            ),
+        )
+
+    for var in saturation:
+        push(var)
+    while heap:
+        neg_saturation, _, _, _, var = heappop(heap)
+        if var in colors or var in spilled:
+            continue
+        taken = saturation[var]
+        if -neg_saturation != len(taken):
+            continue
+        color = _biased_color(var, moves, colors, taken)
+        if color is None:
+            color = next((c for c in range(len(registers)) if c not in taken), None)
+        if color is None:
+            color, holders = _cheapest_eviction(var, graph, colors, costs, registers)
+            if color is None:
+                spilled.add(var)
+                continue
+            for holder in holders:
+                del colors[holder]
+                spilled.add(holder)
+                for neighbor in graph[holder]:
+                    if neighbor in saturation:
+                        _saturate(saturation[neighbor], color, -1)
+                        if neighbor not in colors and neighbor not in spilled:
+                            push(neighbor)
+        colors[var] = color
+        for neighbor in graph[var]:
+            if neighbor in saturation:
+                _saturate(saturation[neighbor], color, 1)
+                if neighbor not in colors and neighbor not in spilled:
+                    push(neighbor)
+    assignment = {
+        var: registers[color] for var, color in colors.items() if isinstance(var, Var)
+    }
+    return assignment, _stack_slots(graph, costs, spilled)
+
+
+def _biased_color(var, moves, colors, taken):
+    if moves:
+        for partner in moves.get(var, ()):
+            color = colors.get(partner)
+            if color is not None and color not in taken:
+                return color
+    return None
+
+
+def _saturate(counts, color, delta):
+    count = counts.get(color, 0) + delta
+    if count:
+        counts[color] = count
+    else:
+        del counts[color]
+
+
+def _cheapest_eviction(var, graph, colors, costs, registers):
+    holders = {}
+    for neighbor in graph[var]:
+        color = colors.get(neighbor)
+        if color is not None:
+            holders.setdefault(color, []).append(neighbor)
+    best, best_cost = None, costs.get(var, 0)
+    for color in range(len(registers)):
+        group = holders[color]
+        if any(isinstance(holder, Reg) for holder in group):
+            continue
+        cost = sum(costs.get(holder, 0) for holder in group)
+        if cost < best_cost:
+            best, best_cost = color, cost
+    if best is None:
+        return None, ()
+    return best, holders[best]
+
+
+def _stack_slots(graph, costs, spilled):
+    slots = {}
+    for var in sorted(spilled, key=lambda var: (-costs.get(var, 0), var.name)):
+        taken = {slots[neighbor] for neighbor in graph[var] if neighbor in slots}
+        slot = 0
+        while slot in taken:
+            slot += 1
+        slots[var] = slot
+    return slots
@@ -0,0 +1,305 @@
+import mmap
+import struct
+import sys
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+
+MAGIC = b"LVAR"
+CORPUS_MAGIC = b"LVARCORP"
+VERSION = 1
+
+ASSIGN = 0
+PRINT = 1
+EXPR = 2
+CONST = 3
+NAME = 4
+INPUT = 5
+NEG = 6
+ADD = 7
+SUB = 8
+
+_HEADER = struct.Struct("<4sB")
+_CORPUS_HEADER = struct.Struct("<8sB")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class _Encoder:
+    def __init__(self):
+        self.names = {}
+        self.consts = {}
+        self.tags = bytearray()
+        self.count = 0
+
+    def name_index(self, var):
+        return self.names.setdefault(var, len(self.names))
+
+    def const_index(self, value):
+        return self.consts.setdefault(value, len(self.consts))
+
+    def add_stmt(self, stmt):
+        tags = self.tags
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                tags.append(ASSIGN)
+                _write_varint(tags, self.name_index(var))
+            case Expr(value=Call(func=Name(id="print"), args=[value])):
+                tags.append(PRINT)
+            case Expr(value=value):
+                tags.append(EXPR)
+            case _:
+                raise ValueError(f"cannot serialize statement: {stmt!r}")
+        self.count += 1
+        self.add_exp(value)
+
+    def add_exp(self, exp):
+        tags = self.tags
+        stack = [exp]
+        while stack:
+            node = stack.pop()
+            self.count += 1
+            match node:
+                case Constant(value=value) if type(value) is int:
+                    tags.append(CONST)
+                    _write_varint(tags, self.const_index(value))
+                case Name(id=var):
+                    tags.append(NAME)
+                    _write_varint(tags, self.name_index(var))
+                case Call(func=Name(id="input_int"), args=[]):
+                    tags.append(INPUT)
+                case UnaryOp(op=USub(), operand=operand):
+                    tags.append(NEG)
+                    stack.append(operand)
+                case BinOp(left=left, op=Add() | Sub() as op, right=right):
+                    tags.append(ADD if isinstance(op, Add) else SUB)
+                    stack.append(right)
+                    stack.append(left)
+                case _:
+                    raise ValueError(f"cannot serialize expression: {node!r}")
+
+    def finish(self, out):
+        _write_varint(out, len(self.names))
+        for var in self.names:
+            encoded = var.encode("utf-8")
+            _write_varint(out, len(encoded))
+            out += encoded
+        _write_varint(out, len(self.consts))
+        for value in self.consts:
+            _write_varint(out, _zigzag(value))
+        _write_varint(out, self.count)
+        out += self.tags
+
+
+def _encode(module, out):
+    encoder = _Encoder()
+    for stmt in module.body:
+        encoder.add_stmt(stmt)
+    encoder.finish(out)
+
+
+def _decode(data, pos):
+    count, pos = _read_varint(data, pos)
+    names = []
+    for _ in range(count):
+        size, pos = _read_varint(data, pos)
+        names.append(str(data[pos : pos + size], "utf-8"))
+        pos += size
+    count, pos = _read_varint(data, pos)
+    consts = []
+    for _ in range(count):
+        value, pos = _read_varint(data, pos)
+        consts.append(_unzigzag(value))
+    count, pos = _read_varint(data, pos)
+    tags = []
+    args = []
+    for _ in range(count):
+        tag = data[pos]
+        pos += 1
+        tags.append(tag)
+        if tag == CONST or tag == NAME or tag == ASSIGN:
+            arg = data[pos]
+            if arg < 0x80:
+                pos += 1
+            else:
+                arg, pos = _read_varint(data, pos)
+            args.append(arg)
+        else:
+            args.append(0)
+    values = []
+    push = values.append
+    pop = values.pop
+    body = []
+    for index in range(count - 1, -1, -1):
+        tag = tags[index]
+        if tag == NAME:
+            push(Name(names[args[index]]))
+        elif tag == CONST:
+            push(Constant(consts[args[index]]))
+        elif tag == ADD:
+            left = pop()
+            push(BinOp(left, Add(), pop()))
+        elif tag == SUB:
+            left = pop()
+            push(BinOp(left, Sub(), pop()))
+        elif tag == NEG:
+            push(UnaryOp(USub(), pop()))
+        elif tag == INPUT:
+            push(Call(Name("input_int"), []))
+        elif tag == ASSIGN:
+            body.append(Assign([Name(names[args[index]])], pop()))
+        elif tag == PRINT:
+            body.append(Expr(Call(Name("print"), [pop()])))
+        elif tag == EXPR:
+            body.append(Expr(pop()))
+        else:
+            raise ValueError(f"unknown tag: {tag}")
+    body.reverse()
+    return Module(body), pos
+
+
+def dumps(module: Module) -> bytes:
+    out = bytearray(_HEADER.pack(MAGIC, VERSION))
+    _encode(module, out)
+    return bytes(out)
+
+
+def loads(data) -> Module:
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a serialized LVar module")
+    if version != VERSION:
+        raise ValueError(f"unsupported format version: {version}")
+    module, _ = _decode(data, _HEADER.size)
+    return module
+
+
+class CorpusWriter:
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._file.write(_CORPUS_HEADER.pack(CORPUS_MAGIC, VERSION))
+        self._offsets = []
+        self._offset = _CORPUS_HEADER.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, module: Module):
+        out = bytearray()
+        _encode(module, out)
+        self._offsets.append(self._offset)
+        self._file.write(out)
+        self._offset += len(out)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._offsets.append(self._offset)
+        index = struct.pack(f"<{len(self._offsets)}Q", *self._offsets)
+        self._file.write(index)
+        count = len(self._offsets) - 1
+        self._file.write(_FOOTER.pack(self._offset, count, CORPUS_MAGIC))
+        self._file.close()
+
+
+def write_corpus(path, modules):
+    with CorpusWriter(path) as writer:
+        for module in modules:
+            writer.add(module)
+
+
+class CorpusReader:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._mmap)
+        magic, version = _CORPUS_HEADER.unpack_from(self._data, 0)
+        if magic != CORPUS_MAGIC:
+            self.close()
+            raise ValueError(f"not an LVar corpus: {path}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"unsupported corpus version: {version}")
+        footer = len(self._data) - _FOOTER.size
+        index_offset, count, _ = _FOOTER.unpack_from(self._data, footer)
+        if sys.byteorder == "little":
+            self._offsets = self._data[index_offset:footer].cast("Q")
+        else:
+            self._offsets = struct.unpack_from(
+                f"<{count + 1}Q", self._data, index_offset
+            )
+        self._count = count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("corpus index out of range")
+        module, _ = _decode(self._data, self._offsets[index])
+        return module
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        if self._mmap is None:
+            return
+        if isinstance(getattr(self, "_offsets", None), memoryview):
+            self._offsets.release()
+        self._data.release()
+        self._mmap.close()
+        self._mmap = None
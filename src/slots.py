@@ -0,0 +1,202 @@
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from partial_eval_var import PartialEvalVar
+
+
+class SlotName(Name):
+    __slots__ = ("slot",)
+    _fields = ("id", "slot")
+
+    def __init__(self, id, slot):
+        super().__init__(id)
+        self.slot = slot
+
+    def _structural_hash(self):
+        return hash((SlotName, self.id, self.slot))
+
+
+class SlotTable:
+    def __init__(self):
+        self.names = []
+        self.slots = {}
+        self.free = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def slot_of(self, var):
+        if var not in self.slots:
+            self.slots[var] = len(self.names)
+            self.names.append(var)
+        return self.slots[var]
+
+    def new_env(self):
+        return [None] * len(self.names)
+
+    def to_dict(self, env):
+        return {var: value for var, value in zip(self.names, env) if value is not None}
+
+
+def resolve_slots(module: Module, allow_free=False):
+    table = SlotTable()
+    assigned = set()
+
+    def resolve_exp(exp):
+        match exp:
+            case Name(id=var) if var not in ("print", "input_int"):
+                if var not in assigned:
+                    if not allow_free:
+                        raise ValueError(f"undefined variable: {var}")
+                    if var not in table.slots:
+                        table.free.append(var)
+                return SlotName(var, table.slot_of(var))
+            case UnaryOp(op=op, operand=operand):
+                return UnaryOp(op, resolve_exp(operand))
+            case BinOp(left=left, op=op, right=right):
+                return BinOp(resolve_exp(left), op, resolve_exp(right))
+            case Call(func=func, args=args):
+                return Call(func, [resolve_exp(arg) for arg in args])
+            case _:
+                return exp
+
+    body = []
+    for stmt in module.body:
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                value = resolve_exp(value)
+                body.append(Assign([SlotName(var, table.slot_of(var))], value))
+                assigned.add(var)
+            case Expr(value=value):
+                body.append(Expr(resolve_exp(value)))
+            case _:
+                body.append(stmt)
+    return Module(body), table
+
+
+class SlotInterpreterVar(InterpreterVar):
+    def __init__(self, module: Module, input_channel=None, output_channel=None):
+        super().__init__(module, input_channel, output_channel)
+        self.resolved, self.slots = resolve_slots(module, allow_free=True)
+
+    def eval_exp(self, exp, values, env):
+        match exp:
+            case SlotName(slot=slot):
+                return env[slot]
+            case Constant(value=value):
+                return value
+            case Call(func=Name(id="input_int"), args=[]):
+                return self.input_channel.read_int()
+            case Call():
+                raise ValueError(f"unsupported call expression: {exp!r}")
+            case UnaryOp(op=USub()):
+                return -values[0]
+            case UnaryOp(op=op):
+                raise ValueError(f"unsupported unary operator: {op!r}")
+            case BinOp(op=Add()):
+                return values[0] + values[1]
+            case BinOp(op=Sub()):
+                return values[0] - values[1]
+            case BinOp(op=op):
+                raise ValueError(f"unsupported binary operator: {op!r}")
+            case _:
+                raise ValueError(f"unsupported expression: {exp!r}")
+
+    def exec_stmt(self, stmt, env):
+        match stmt:
+            case Assign(targets=[SlotName(slot=slot)], value=value):
+                env[slot] = self.interp_exp(value, env)
+            case _:
+                super().exec_stmt(stmt, env)
+
+    def interp(self, env=None):
+        if env is None:
+            env = {}
+        for var in self.slots.free:
+            if var not in env:
+                raise ValueError(f"undefined variable: {var}")
+        slot_env = self.slots.new_env()
+        for var, value in env.items():
+            if var in self.slots.slots:
+                slot_env[self.slots.slots[var]] = value
+        try:
+            self.interp_stmts(self.resolved.body, slot_env)
+        finally:
+            self.output_channel.flush()
+        return self.slots.to_dict(slot_env)
+
+
+class SlotPartialEvalVar(PartialEvalVar):
+    def __init__(self, module: Module):
+        super().__init__(module)
+        self.resolved, self.slots = resolve_slots(module, allow_free=True)
+        self._names = [Name(var) for var in self.slots.names]
+
+    def pe_node(self, exp, values, env=None):
+        match exp:
+            case Constant(value=value):
+                return value
+            case SlotName(slot=slot):
+                value = env[slot]
+                if value is None:
+                    return self._names[slot]
+                return value
+            case Name():
+                return exp
+            case Call(func=Name(id="input_int"), args=[]):
+                return exp
+            case UnaryOp(op=USub()):
+                return self.linear_neg(values[0])
+            case BinOp(op=Add()):
+                return self.linear_add(values[0], values[1])
+            case BinOp(op=Sub()):
+                return self.linear_sub(values[0], values[1])
+            case _:
+                raise ValueError(f"unsupported expression: {exp!r}")
+
+    def pe_stmt(self, stmt, env=None):
+        match stmt:
+            case Assign(targets=[SlotName(slot=slot)], value=value):
+                pe_value = self.pe_exp(value, env)
+                self._bind(env, slot, pe_value)
+                return Assign([self._names[slot]], self._to_exp(pe_value))
+            case _:
+                return super().pe_stmt(stmt, env)
+
+    def _bind(self, env, slot, value):
+        aliases = self._aliases_of(env)
+        for alias in aliases.pop(slot, ()):
+            env[alias] = None
+        old = env[slot]
+        if type(old) is Name:
+            aliases[self.slots.slots[old.id]].discard(slot)
+        if type(value) is Name:
+            source = self.slots.slots[value.id]
+            if source == slot:
+                value = None
+            else:
+                aliases.setdefault(source, set()).add(slot)
+        elif not isinstance(value, int):
+            value = None
+        env[slot] = value
+
+    def _index_aliases(self, env):
+        aliases = {}
+        for slot, value in enumerate(env):
+            if type(value) is Name:
+                aliases.setdefault(self.slots.slots[value.id], set()).add(slot)
+        return aliases
+
+    def pe(self):
+        return Module(self.pe_stmts(self.resolved.body, self.slots.new_env()))
@@ -0,0 +1,58 @@
+from ast_nodes import BinOp, UnaryOp
+
+RECURSION_BUDGET = 100
+
+
+def exp_children(exp):
+    kind = type(exp)
+    if kind is BinOp:
+        return (exp.left, exp.right)
+    if kind is UnaryOp:
+        return (exp.operand,)
+    return ()
+
+
+def postorder(root, children, combine):
+    kids = children(root)
+    if not kids:
+        return combine(root, kids)
+    return _visit(root, kids, children, combine, 0)
+
+
+def _visit(node, kids, children, combine, depth):
+    if depth == RECURSION_BUDGET:
+        return _walk(node, kids, children, combine)
+    values = []
+    for kid in kids:
+        grandkids = children(kid)
+        if grandkids:
+            values.append(_visit(kid, grandkids, children, combine, depth + 1))
+        else:
+            values.append(combine(kid, grandkids))
+    return combine(node, values)
+
+
+def _walk(root, kids, children, combine):
+    values = []
+    push_value = values.append
+    stack = [(root, kids)]
+    push = stack.append
+    pop = stack.pop
+    for kid in reversed(kids):
+        push((kid, None))
+    while stack:
+        node, kids = pop()
+        if kids is None:
+            kids = children(node)
+            if kids:
+                push((node, kids))
+                for kid in reversed(kids):
+                    push((kid, None))
+                continue
+            push_value(combine(node, kids))
+        else:
+            count = len(kids)
+            args = values[-count:]
+            del values[-count:]
+            push_value(combine(node, args))
+    return values.pop()
@@ -0,0 +1,165 @@
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from traversal import exp_children, postorder
+
+
+def eliminate_common_subexpressions(module: Module) -> Module:
+    counter = ValueNumbering()
+    counter.run(module)
+    return ValueNumbering(counter.occurrences).run(module)
+
+
+def _program_variables(module: Module):
+    names = set()
+    stack = []
+    for stmt in module.body:
+        match stmt:
+            case Assign(targets=targets, value=value):
+                names.update(target.id for target in targets if type(target) is Name)
+                stack.append(value)
+            case Expr(value=Call(func=Name(id="print"), args=args)):
+                stack.extend(args)
+            case Expr(value=value):
+                stack.append(value)
+        while stack:
+            exp = stack.pop()
+            if type(exp) is Name:
+                names.add(exp.id)
+            else:
+                stack.extend(exp_children(exp))
+    return names
+
+
+class ValueNumbering:
+    def __init__(self, repeats=None):
+        self.repeats = repeats
+        self.occurrences = {}
+        self.numbers = {}
+        self.var_numbers = {}
+        self.holders = {}
+        self._count = 0
+        self._tmp_counter = 0
+        self._root = None
+        self._setup = []
+        self._reserved = set()
+
+    def run(self, module: Module) -> Module:
+        self._reserved = _program_variables(module)
+        body = []
+        for stmt in module.body:
+            match stmt:
+                case Assign(targets=[Name(id=var)], value=value):
+                    number, exp = self.number_exp(value, shared=False)
+                    body.extend(self._setup)
+                    if self.var_numbers.get(var) == number:
+                        continue
+                    self._bind(var, number)
+                    body.append(stmt if exp is value else Assign([Name(var)], exp))
+                case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                    _, exp = self.number_exp(arg)
+                    body.extend(self._setup)
+                    body.append(
+                        stmt if exp is arg else Expr(Call(Name("print"), [exp]))
+                    )
+                case Expr(value=value):
+                    _, exp = self.number_exp(value)
+                    body.extend(self._setup)
+                    body.append(stmt if exp is value else Expr(exp))
+                case _:
+                    raise ValueError(
+                        f"unsupported statement in value numbering: {stmt!r}"
+                    )
+        return Module(body)
+
+    def number_exp(self, exp, shared=True):
+        self._root = None if shared else exp
+        self._setup = []
+        return postorder(exp, exp_children, self._number_node)
+
+    def _number_node(self, node, values):
+        match node:
+            case Constant(value=value):
+                return self._number_key((Constant, value)), node
+            case Name(id=var):
+                number = self.var_numbers.get(var)
+                if number is None:
+                    number = self._fresh()
+                    self._bind(var, number)
+                return number, node
+            case Call(func=Name(id="input_int"), args=[]):
+                return self._fresh(), node
+            case UnaryOp(op=USub() as op):
+                [(number, operand)] = values
+                key = (USub, number)
+                exp = node if operand is node.operand else UnaryOp(op, operand)
+            case BinOp(op=Add() | Sub() as op):
+                [(left_number, left), (right_number, right)] = values
+                if isinstance(op, Add) and right_number < left_number:
+                    key = (Add, right_number, left_number)
+                else:
+                    key = (type(op), left_number, right_number)
+                if left is node.left and right is node.right:
+                    exp = node
+                else:
+                    exp = BinOp(left, op, right)
+            case _:
+                raise ValueError(f"unsupported expression in value numbering: {node!r}")
+        number = self.numbers.get(key)
+        if number is None:
+            number = self.numbers[key] = self._fresh()
+            self.occurrences[number] = 1
+            if self._worth_a_tmp(number, node):
+                tmp = self._new_tmp_name()
+                self._setup.append(Assign([Name(tmp)], exp))
+                self._bind(tmp, number)
+                return number, Name(tmp)
+            return number, exp
+        if self.repeats is None:
+            self.occurrences[number] += 1
+            for child_number, _ in values:
+                if child_number in self.occurrences:
+                    self.occurrences[child_number] -= 1
+        holders = self.holders.get(number)
+        if holders:
+            return number, Name(next(iter(holders)))
+        return number, exp
+
+    def _new_tmp_name(self):
+        while True:
+            name = f"cse_{self._tmp_counter}"
+            self._tmp_counter += 1
+            if name not in self._reserved:
+                return name
+
+    def _worth_a_tmp(self, number, node):
+        if self.repeats is None or node is self._root:
+            return False
+        return self.repeats.get(number, 0) > 1
+
+    def _number_key(self, key):
+        number = self.numbers.get(key)
+        if number is None:
+            number = self.numbers[key] = self._fresh()
+        return number
+
+    def _fresh(self):
+        self._count += 1
+        return self._count
+
+    def _bind(self, var, number):
+        old = self.var_numbers.get(var)
+        if old is not None:
+            del self.holders[old][var]
+        self.var_numbers[var] = number
+        self.holders.setdefault(number, {})[var] = None
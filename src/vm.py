@@ -0,0 +1,211 @@
+from array import array
+from dataclasses import dataclass
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+
+MOVE = 0
+NEG = 1
+ADD = 2
+SUB = 3
+READ_INT = 4
+PRINT = 5
+FAIL = 6
+
+OPCODE_NAMES = ["move", "neg", "add", "sub", "read_int", "print", "fail"]
+INSTR_WIDTH = 4
+
+
+@dataclass
+class Bytecode:
+    code: array
+    initial_regs: list
+    messages: list
+    var_regs: dict[str, int]
+
+
+class BytecodeCompiler:
+    def __init__(self):
+        self._code = array("q")
+        self._regs = []
+        self._messages = []
+        self._var_regs = {}
+        self._const_regs = {}
+        self._temp_base = 0
+        self._next_temp = 0
+
+    def compile(self, module: Module) -> Bytecode:
+        self.__init__()
+        for stmt in module.body:
+            self._collect_stmt(stmt)
+        self._temp_base = len(self._regs)
+        defined = set()
+        for stmt in module.body:
+            self._next_temp = self._temp_base
+            self._compile_stmt(stmt, defined)
+        return Bytecode(self._code, self._regs, self._messages, self._var_regs)
+
+    def _collect_stmt(self, stmt):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                self._var_reg(var)
+                self._collect_exp(value)
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                self._collect_exp(arg)
+            case Expr(value=value):
+                self._collect_exp(value)
+
+    def _collect_exp(self, exp):
+        stack = [exp]
+        while stack:
+            match stack.pop():
+                case Constant(value=value):
+                    self._const_reg(value)
+                case UnaryOp(operand=operand):
+                    stack.append(operand)
+                case BinOp(left=left, right=right):
+                    stack.append(right)
+                    stack.append(left)
+
+    def _var_reg(self, var):
+        if var not in self._var_regs:
+            self._var_regs[var] = len(self._regs)
+            self._regs.append(None)
+        return self._var_regs[var]
+
+    def _const_reg(self, value):
+        key = (type(value), value)
+        if key not in self._const_regs:
+            self._const_regs[key] = len(self._regs)
+            self._regs.append(value)
+        return self._const_regs[key]
+
+    def _new_temp(self):
+        reg = self._next_temp
+        self._next_temp += 1
+        if reg >= len(self._regs):
+            self._regs.append(None)
+        return reg
+
+    def _emit(self, op, a=0, b=0, c=0):
+        self._code.extend((op, a, b, c))
+
+    def _fail(self, message):
+        self._emit(FAIL, len(self._messages))
+        self._messages.append(message)
+
+    def _compile_stmt(self, stmt, defined):
+        match stmt:
+            case Assign(targets=[Name(id=var)], value=value):
+                self._compile_exp(value, defined, self._var_regs[var])
+                defined.add(var)
+            case Expr(value=Call(func=Name(id="print"), args=[arg])):
+                self._emit(PRINT, self._compile_exp(arg, defined))
+            case Expr(value=Call(func=Name(id="print"), args=args)):
+                self._fail(f"print expects one argument: Call(Name('print'), {args!r})")
+            case Expr(value=value):
+                self._compile_exp(value, defined)
+            case _:
+                self._fail(f"unsupported statement: {stmt!r}")
+
+    def _compile_exp(self, exp, defined, target=None):
+        match exp:
+            case Name(id=var) if var not in ("print", "input_int"):
+                if var not in defined:
+                    self._fail(f"undefined variable: {var}")
+                    return self._new_temp()
+                return self._move_to(self._var_regs[var], target)
+            case Constant(value=value):
+                return self._move_to(self._const_reg(value), target)
+            case Call(func=Name(id="input_int"), args=[]):
+                dst = self._new_temp() if target is None else target
+                self._emit(READ_INT, dst)
+                return dst
+            case Call():
+                self._fail(f"unsupported call expression: {exp!r}")
+            case UnaryOp(op=USub(), operand=operand):
+                src = self._compile_exp(operand, defined)
+                dst = self._new_temp() if target is None else target
+                self._emit(NEG, dst, src)
+                return dst
+            case UnaryOp(op=op):
+                self._fail(f"unsupported unary operator: {op!r}")
+            case BinOp(left=left, op=Add() | Sub() as op, right=right):
+                left_reg = self._compile_exp(left, defined)
+                right_reg = self._compile_exp(right, defined)
+                dst = self._new_temp() if target is None else target
+                self._emit(
+                    ADD if isinstance(op, Add) else SUB, dst, left_reg, right_reg
+                )
+                return dst
+            case BinOp(op=op):
+                self._fail(f"unsupported binary operator: {op!r}")
+            case _:
+                self._fail(f"unsupported expression: {exp!r}")
+        return self._new_temp()
+
+    def _move_to(self, reg, target):
+        if target is None or target == reg:
+            return reg
+        self._emit(MOVE, target, reg)
+        return target
+
+
+def compile_bytecode(module: Module) -> Bytecode:
+    return BytecodeCompiler().compile(module)
+
+
+def run_bytecode(bytecode: Bytecode, inputs=()):
+    regs = list(bytecode.initial_regs)
+    messages = bytecode.messages
+    next_input = iter(inputs).__next__
+    outputs = []
+    write = outputs.append
+    stream = iter(bytecode.code)
+    for op, a, b, c in zip(stream, stream, stream, stream):
+        if op == ADD:
+            regs[a] = regs[b] + regs[c]
+        elif op == SUB:
+            regs[a] = regs[b] - regs[c]
+        elif op == MOVE:
+            regs[a] = regs[b]
+        elif op == NEG:
+            regs[a] = -regs[b]
+        elif op == READ_INT:
+            try:
+                regs[a] = int(next_input())
+            except StopIteration:
+                raise EOFError("input_int() called with no input left") from None
+        elif op == PRINT:
+            write(regs[a])
+        else:
+            raise ValueError(messages[a])
+    return outputs
+
+
+def disassemble(bytecode: Bytecode):
+    lines = []
+    code = bytecode.code
+    for pc in range(0, len(code), INSTR_WIDTH):
+        op, a, b, c = code[pc : pc + INSTR_WIDTH]
+        name = OPCODE_NAMES[op]
+        if op in (ADD, SUB):
+            lines.append(f"{name} r{a}, r{b}, r{c}")
+        elif op in (MOVE, NEG):
+            lines.append(f"{name} r{a}, r{b}")
+        elif op in (READ_INT, PRINT):
+            lines.append(f"{name} r{a}")
+        else:
+            lines.append(f"{name} {bytecode.messages[a]!r}")
+    return lines
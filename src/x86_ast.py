@@ -1,6 +1,5 @@
 from dataclasses import dataclass, field
 
-
 VALID_REGISTERS = {
     "rsp",
     "rbp",
@@ -20,6 +19,12 @@ VALID_REGISTERS = {
     "r15",
 }
 
+CALLER_SAVED_REGISTERS = ("rax", "rcx", "rdx", "rsi", "rdi", "r8", "r9", "r10", "r11")
+
+CALLEE_SAVED_REGISTERS = ("rbx", "r12", "r13", "r14", "r15")
+
+ARGUMENT_REGISTERS = ("rdi", "rsi", "rdx", "rcx", "r8", "r9")
+
 
 @dataclass(frozen=True)
 class Immediate:
@@ -77,4 +82,5 @@ class X86Program:
     body: list
     stack_space: int = 0
     main_label: str = "_main"
-    homes: dict[str, Deref] = field(default_factory=dict)
+    homes: dict[str, Reg | Deref] = field(default_factory=dict)
+    used_callee: list = field(default_factory=list)
@@ -1,3 +1,5 @@
+import pickle
+
 from ast_nodes import (
     Add,
     BinOp,
@@ -6,6 +8,7 @@ from ast_nodes import (
     Expr,
     Module,
     Name,
+    Sub,
     USub,
     UnaryOp,
 )
@@ -48,3 +51,91 @@ def test_construct_lint_program_ast():
     assert isinstance(print_call.func, Name)
     assert print_call.func.id == "print"
     assert print_call.args == [ast1_1]
+
+
+def test_nodes_use_slots_instead_of_instance_dicts():
+    for node in [
+        Constant(1),
+        Name("x"),
+        UnaryOp(USub(), Constant(1)),
+        BinOp(Constant(1), Add(), Constant(2)),
+        Call(Name("input_int"), []),
+        Expr(Constant(1)),
+        Module([]),
+    ]:
+        assert not hasattr(node, "__dict__")
+
+
+def test_operators_are_singletons():
+    assert Add() is Add()
+    assert Sub() is Sub()
+    assert USub() is USub()
+    assert Add() is not Sub()
+
+
+def test_structurally_equal_trees_are_equal_and_hash_alike():
+    def build():
+        read = Call(Name("input_int"), [])
+        return Module([Expr(Call(Name("print"), [BinOp(read, Sub(), Constant(8))]))])
+
+    first, second = build(), build()
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert {first: "cached"}[second] == "cached"
+
+
+def test_structural_equality_distinguishes_shape_and_values():
+    assert BinOp(Constant(1), Add(), Constant(2)) != BinOp(
+        Constant(1), Sub(), Constant(2)
+    )
+    assert BinOp(Constant(1), Add(), Constant(2)) != BinOp(
+        Constant(2), Add(), Constant(1)
+    )
+    assert Constant(1) != Constant(True)
+    assert Name("x") != Constant("x")
+    assert Module([Expr(Name("x"))]) != Module([Expr(Name("x")), Expr(Name("x"))])
+
+
+def test_hash_is_cached_on_each_node():
+    exp = BinOp(Name("x"), Add(), Constant(1))
+
+    hash(exp)
+
+    assert exp._hash == hash(exp)
+    assert exp.left._hash == hash(Name("x"))
+
+
+def test_equality_ignores_hashes_cached_before_a_mutation():
+    first = BinOp(Name("x"), Add(), Constant(1))
+    second = BinOp(Name("x"), Add(), Constant(2))
+    hash(first)
+    hash(second)
+
+    second.right.value = 1
+
+    assert first == second
+
+
+def test_equality_and_hash_handle_deep_trees():
+    def chain(depth):
+        exp = Constant(0)
+        for i in range(depth):
+            exp = BinOp(exp, Add(), Constant(i))
+        return exp
+
+    first, second = chain(100_000), chain(100_000)
+
+    assert hash(first) == hash(second)
+    assert first == second
+
+
+def test_pickle_round_trip_recomputes_hash():
+    program = Module([Expr(Call(Name("print"), [UnaryOp(USub(), Constant(8))]))])
+    hash(program)
+
+    restored = pickle.loads(pickle.dumps(program))
+
+    assert restored == program
+    assert hash(restored) == hash(program)
+    assert restored.body[0].value.args[0].op is USub()
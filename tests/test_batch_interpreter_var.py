@@ -0,0 +1,106 @@
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from batch_interpreter_var import BatchInterpreterVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+
+
+def _single_run(program, inputs):
+    output = ListOutput()
+    InterpreterVar(program, BufferInput(inputs), output).interp()
+    return output.values
+
+
+def test_run_evaluates_each_stream():
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign([Name("y")], BinOp(Constant(10), Sub(), Name("x"))),
+            Expr(Call(Name("print"), [BinOp(Name("y"), Add(), Constant(1))])),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    outputs, errors = BatchInterpreterVar(program).run([[1], [2], [-5]])
+
+    assert outputs == [[10, 1], [9, 2], [16, -5]]
+    assert errors == [None, None, None]
+
+
+def test_constant_outputs_are_broadcast_to_every_lane():
+    program = Module(
+        [Expr(Call(Name("print"), [BinOp(Constant(1), Add(), Constant(2))]))]
+    )
+
+    outputs, _ = BatchInterpreterVar(program).run([[], [], []])
+
+    assert outputs == [[3], [3], [3]]
+
+
+def test_run_without_streams_returns_no_outputs():
+    program = Module([Expr(Call(Name("print"), [Constant(1)]))])
+
+    assert BatchInterpreterVar(program).run([]) == ([], [])
+
+
+def test_undefined_variable_raises_error():
+    program = Module([Expr(Call(Name("print"), [Name("y")]))])
+
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        BatchInterpreterVar(program).run([[1]])
+
+
+def test_short_input_stream_fails_only_its_own_lane():
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Call(Name("input_int"), [])])),
+            Expr(Call(Name("print"), [Call(Name("input_int"), [])])),
+        ]
+    )
+
+    outputs, errors = BatchInterpreterVar(program).run([[1, 2], [3], [], [4, 5]])
+
+    assert outputs == [[1, 2], [3], [], [4, 5]]
+    assert errors[0] is None and errors[3] is None
+    assert isinstance(errors[1], EOFError)
+    assert isinstance(errors[2], EOFError)
+
+
+def test_non_integer_input_fails_only_its_own_lane():
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Expr(Call(Name("print"), [Name("x")])),
+            Expr(Call(Name("print"), [Call(Name("input_int"), [])])),
+        ]
+    )
+
+    outputs, errors = BatchInterpreterVar(program).run([["1", "2"], ["3", "x"]])
+
+    assert outputs == [[1, 2], [3]]
+    assert errors[0] is None
+    assert isinstance(errors[1], ValueError)
+
+
+def test_deep_expressions_do_not_hit_recursion_limits():
+    exp = Call(Name("input_int"), [])
+    for i in range(50_000):
+        exp = BinOp(exp, Sub() if i % 2 else Add(), Constant(1))
+    program = Module([Expr(Call(Name("print"), [exp]))])
+
+    outputs, _ = BatchInterpreterVar(program).run([[1], [2]])
+
+    assert outputs == [[1], [2]]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_batch_matches_separate_runs_on_generated_programs(seed):
+    program = generate_program(60, max_depth=4, input_rate=0.2, seed=seed)
+    streams = [list(range(lane, lane + 200)) for lane in range(-4, 12)]
+
+    outputs, errors = BatchInterpreterVar(program).run(streams)
+
+    assert outputs == [_single_run(program, stream) for stream in streams]
+    assert errors == [None] * len(streams)
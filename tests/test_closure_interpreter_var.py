@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from closure_interpreter_var import ClosureInterpreterVar
+from interpreter_var import InterpreterVar
+from program_generator import generate_program
+
+
+def _walker_output(program, inputs, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(f"{n}\n" for n in inputs)))
+    InterpreterVar(program).interp()
+    return [int(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_run_returns_printed_values():
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign([Name("y")], BinOp(Name("x"), Sub(), Constant(2))),
+            Expr(Call(Name("print"), [Name("y")])),
+            Expr(Call(Name("print"), [BinOp(Name("x"), Add(), Name("y"))])),
+        ]
+    )
+
+    compiled = ClosureInterpreterVar(program)
+
+    assert compiled.run([10]) == [8, 18]
+    assert compiled.run([-1]) == [-3, -4]
+
+
+def test_interp_prints_and_returns_env(capsys):
+    program = Module(
+        [
+            Assign([Name("x")], Constant(40)),
+            Assign([Name("x")], BinOp(Name("x"), Add(), Constant(2))),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    env = ClosureInterpreterVar(program).interp()
+
+    assert env == {"x": 42}
+    assert capsys.readouterr().out == "42\n"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_run_matches_tree_walker_on_generated_programs(seed, monkeypatch, capsys):
+    program = generate_program(60, seed=seed)
+    compiled = ClosureInterpreterVar(program)
+
+    for run in range(3):
+        inputs = list(range(seed * 7 + run, seed * 7 + run + 100))
+        expected = _walker_output(program, inputs, monkeypatch, capsys)
+        assert compiled.run(inputs) == expected
+
+
+def test_undefined_variable_raises_when_reached():
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Constant(1)])),
+            Assign([Name("x")], Name("y")),
+        ]
+    )
+    compiled = ClosureInterpreterVar(program)
+
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        compiled.run()
+
+
+def test_unsupported_call_raises_when_reached():
+    program = Module([Expr(Call(Name("input_float"), []))])
+    compiled = ClosureInterpreterVar(program)
+
+    with pytest.raises(ValueError, match="unsupported call expression"):
+        compiled.run()
+
+
+def test_run_reports_exhausted_input():
+    program = Module([Expr(Call(Name("print"), [Call(Name("input_int"), [])]))])
+
+    with pytest.raises(EOFError):
+        ClosureInterpreterVar(program).run([])
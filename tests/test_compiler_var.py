@@ -53,6 +53,36 @@ def test_remove_complex_operands_introduces_temporaries():
     assert repr(lowered.body[2]) == repr(Expr(Call(Name("print"), [Name("tmp_1")])))
 
 
+def test_remove_complex_operands_emits_setup_in_evaluation_order():
+    compiler = CompilerVar()
+    neg_x = UnaryOp(USub(), Name("x"))
+    program = Module(
+        [
+            Assign(
+                [Name("y")],
+                BinOp(
+                    BinOp(neg_x, Sub(), Call(Name("input_int"), [])),
+                    Add(),
+                    BinOp(Constant(1), Add(), neg_x),
+                ),
+            )
+        ]
+    )
+
+    lowered = compiler.remove_complex_operands(program)
+
+    assert repr(lowered.body) == repr(
+        [
+            Assign([Name("tmp_0")], UnaryOp(USub(), Name("x"))),
+            Assign([Name("tmp_1")], Call(Name("input_int"), [])),
+            Assign([Name("tmp_2")], BinOp(Name("tmp_0"), Sub(), Name("tmp_1"))),
+            Assign([Name("tmp_3")], UnaryOp(USub(), Name("x"))),
+            Assign([Name("tmp_4")], BinOp(Constant(1), Add(), Name("tmp_3"))),
+            Assign([Name("y")], BinOp(Name("tmp_2"), Add(), Name("tmp_4"))),
+        ]
+    )
+
+
 def test_select_instructions_for_assign_and_print():
     compiler = CompilerVar()
     program = Module(
@@ -89,6 +119,90 @@ def test_assign_homes_maps_vars_to_stack_slots():
     assert homed.homes["y"] == Deref("rbp", -16)
 
 
+def test_select_instructions_when_right_operand_is_the_target():
+    compiler = CompilerVar()
+    program = compiler.select_instructions(
+        Module(
+            [
+                Assign([Name("x")], BinOp(Constant(1), Add(), Name("x"))),
+                Assign([Name("x")], BinOp(Constant(1), Sub(), Name("x"))),
+            ]
+        )
+    )
+
+    assert program.body == [
+        Instr("addq", [Immediate(1), Var("x")]),
+        Instr("negq", [Var("x")]),
+        Instr("addq", [Immediate(1), Var("x")]),
+    ]
+
+
+def test_allocate_registers_keeps_small_programs_out_of_memory():
+    compiler = CompilerVar()
+    program = compiler.select_instructions(
+        Module(
+            [
+                Assign([Name("x")], Call(Name("input_int"), [])),
+                Assign([Name("y")], BinOp(Name("x"), Add(), Constant(1))),
+                Expr(Call(Name("print"), [Name("y")])),
+                Expr(Call(Name("print"), [Name("x")])),
+            ]
+        )
+    )
+
+    allocated = compiler.allocate_registers(program)
+
+    assert allocated.homes["x"] == Reg("rbx")
+    assert isinstance(allocated.homes["y"], Reg)
+    assert allocated.used_callee == ["rbx"]
+    assert allocated.stack_space == 8
+    assert not any(
+        isinstance(arg, Deref)
+        for instr in allocated.body
+        if isinstance(instr, Instr)
+        for arg in instr.args
+    )
+
+
+def test_allocate_registers_coalesces_copies_away():
+    compiler = CompilerVar()
+    program = compiler.select_instructions(
+        Module(
+            [
+                Assign([Name("x")], Constant(1)),
+                Assign([Name("y")], BinOp(Name("x"), Add(), Constant(2))),
+                Expr(Call(Name("print"), [Name("y")])),
+            ]
+        )
+    )
+
+    patched = compiler.patch_instructions(compiler.allocate_registers(program))
+
+    assert patched.body == [
+        Instr("movq", [Immediate(1), Reg("rdi")]),
+        Instr("addq", [Immediate(2), Reg("rdi")]),
+        Callq("_print_int", 1),
+    ]
+
+
+def test_prelude_and_conclusion_save_used_callee_saved_registers():
+    compiler = CompilerVar()
+    wrapped = compiler.prelude_and_conclusion(
+        X86Program([], stack_space=0, used_callee=["rbx", "r12"])
+    )
+
+    assert wrapped.body == [
+        Instr("pushq", [Reg("rbp")]),
+        Instr("movq", [Reg("rsp"), Reg("rbp")]),
+        Instr("pushq", [Reg("rbx")]),
+        Instr("pushq", [Reg("r12")]),
+        Instr("popq", [Reg("r12")]),
+        Instr("popq", [Reg("rbx")]),
+        Instr("popq", [Reg("rbp")]),
+        Retq(),
+    ]
+
+
 def test_patch_instructions_rewrites_memory_to_memory_movq():
     compiler = CompilerVar()
     program = compiler.assign_homes(
@@ -127,6 +241,46 @@ def test_full_compile_produces_x86_program_with_retq():
     assert isinstance(result.body[-1], Retq)
 
 
+def test_compile_selects_the_allocator_per_call():
+    compiler = CompilerVar()
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Expr(Call(Name("print"), [BinOp(Name("x"), Add(), Constant(1))])),
+        ]
+    )
+
+    stack = compiler.compile(program, allocator="stack")
+    linear = compiler.compile(program, allocator="linear_scan")
+    graph = compiler.compile(program)
+
+    assert all(isinstance(home, Deref) for home in stack.homes.values())
+    assert all(isinstance(home, Reg) for home in linear.homes.values())
+    assert all(isinstance(home, Reg) for home in graph.homes.values())
+
+
+def test_compile_runs_the_peephole_pass_on_request():
+    program = Module(
+        [
+            Assign([Name("x")], UnaryOp(USub(), Constant(5))),
+            Expr(Call(Name("print"), [BinOp(Name("x"), Add(), Constant(7))])),
+        ]
+    )
+
+    compiler = CompilerVar()
+    plain = compiler.compile(program, allocator="stack")
+    assert compiler.peephole is None
+    optimized = compiler.compile(program, allocator="stack", peephole=True)
+
+    assert len(optimized.body) < len(plain.body)
+    assert sum(compiler.peephole.stats.values()) > 0
+
+
+def test_compile_rejects_unknown_allocator():
+    with pytest.raises(ValueError, match="unknown register allocator"):
+        CompilerVar().compile(Module([]), allocator="greedy")
+
+
 def _runtime_path():
     return Path(__file__).resolve().parent.parent / "runtime" / "runtime.c"
 
@@ -0,0 +1,103 @@
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from dead_stores import eliminate_dead_stores
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+
+def _print(exp):
+    return Expr(Call(Name("print"), [exp]))
+
+
+def _input():
+    return Call(Name("input_int"), [])
+
+
+def _run(program, inputs):
+    output = ListOutput()
+    InterpreterVar(program, BufferInput(inputs), output).interp()
+    return output.values
+
+
+def test_removes_stores_that_are_never_read():
+    program = Module(
+        [
+            Assign([Name("x")], Constant(1)),
+            Assign([Name("y")], BinOp(Name("x"), Add(), Constant(2))),
+            Assign([Name("x")], Constant(5)),
+            _print(Name("x")),
+            Assign([Name("z")], Name("x")),
+        ]
+    )
+
+    result = eliminate_dead_stores(program)
+
+    assert result == Module([Assign([Name("x")], Constant(5)), _print(Name("x"))])
+
+
+def test_keeps_input_int_calls_of_dead_stores_in_order():
+    program = Module(
+        [
+            Assign([Name("a")], BinOp(_input(), Sub(), _input())),
+            Assign([Name("b")], _input()),
+            Expr(BinOp(Name("b"), Add(), _input())),
+            _print(Name("b")),
+        ]
+    )
+
+    result = eliminate_dead_stores(program)
+
+    assert result == Module(
+        [
+            Expr(_input()),
+            Expr(_input()),
+            Assign([Name("b")], _input()),
+            Expr(_input()),
+            _print(Name("b")),
+        ]
+    )
+    assert _run(result, [1, 2, 3, 4]) == _run(program, [1, 2, 3, 4]) == [3]
+
+
+def test_keeps_dead_stores_that_read_undefined_variables():
+    program = Module(
+        [
+            Assign([Name("y")], Constant(1)),
+            Assign([Name("x")], BinOp(Name("y"), Add(), Name("undefined"))),
+            Expr(Name("missing")),
+            Assign([Name("z")], Name("y")),
+            _print(Constant(3)),
+        ]
+    )
+
+    result = eliminate_dead_stores(program)
+
+    assert result == Module(program.body[:3] + [program.body[4]])
+    with pytest.raises(ValueError, match="undefined variable: undefined"):
+        _run(result, [])
+
+
+def test_live_out_keeps_final_assignments():
+    program = Module([Assign([Name("x")], Constant(1)), Assign([Name("y")], Name("x"))])
+
+    assert eliminate_dead_stores(program, live_out={"y"}) == program
+    assert eliminate_dead_stores(program) == Module([])
+
+
+def test_after_partial_evaluation_preserves_output():
+    program = generate_program(500, seed=21)
+    residual = PartialEvalVar(program).pe()
+
+    result = eliminate_dead_stores(residual)
+
+    assert len(result.body) < len(residual.body)
+    inputs = list(range(10_000))
+    assert _run(result, inputs) == _run(program, inputs)
+
+
+def test_rejects_unsupported_statements():
+    with pytest.raises(ValueError, match="eliminate_dead_stores"):
+        eliminate_dead_stores(Module([Expr(Call(Name("len"), []))]))
@@ -0,0 +1,150 @@
+import pytest
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from compiler_var import CompilerVar
+from flat_ast import ADD, ASSIGN, CONST, NAME, PRINT, to_flat, to_module
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+
+def run(module, inputs=()):
+    output = ListOutput()
+    InterpreterVar(module, BufferInput(inputs), output).interp()
+    return output.values
+
+
+def run_flat(flat, inputs=()):
+    output = ListOutput()
+    InterpreterVar(Module([]), BufferInput(inputs), output).interp_flat(flat)
+    return output.values
+
+
+def test_to_flat_stores_nodes_in_postorder_arrays():
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(Constant(7), Add(), Name("y"))),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    flat = to_flat(program)
+
+    assert list(flat.kinds) == [CONST, NAME, ADD, ASSIGN, NAME, PRINT]
+    assert list(flat.left) == [0, 0, 0, 1, 1, 4]
+    assert list(flat.right) == [-1, -1, 1, 2, -1, -1]
+    assert list(flat.consts) == [7]
+    assert flat.names == ["y", "x"]
+    assert list(flat.stmts) == [3, 5]
+
+
+def test_round_trip_is_lossless():
+    program = generate_program(500, seed=11)
+
+    assert to_module(to_flat(program)) == program
+
+
+def test_to_flat_rejects_unsupported_nodes():
+    with pytest.raises(ValueError, match="cannot flatten expression"):
+        to_flat(Module([Expr(Call(Name("len"), []))]))
+    with pytest.raises(ValueError, match="64 bits"):
+        to_flat(Module([Expr(Constant(2**70))]))
+
+
+def test_interp_flat_matches_interp():
+    program = generate_program(1000, seed=12)
+    inputs = list(range(1000))
+
+    assert run_flat(to_flat(program), inputs) == run(program, inputs)
+
+
+def test_interp_flat_returns_environment_and_checks_names():
+    program = Module([Assign([Name("x")], Constant(3))])
+    interp = InterpreterVar(program, BufferInput([]), ListOutput())
+
+    assert interp.interp_flat(to_flat(program)) == {"x": 3}
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        interp.interp_flat(to_flat(Module([Expr(Name("y"))])))
+
+
+def test_interp_flat_handles_deep_expressions():
+    exp = Constant(0)
+    for i in range(100_000):
+        exp = BinOp(exp, Sub() if i % 2 else Add(), Constant(1))
+    program = Module([Expr(Call(Name("print"), [exp]))])
+
+    assert run_flat(to_flat(program)) == [0]
+
+
+def test_pe_flat_matches_pe():
+    program = generate_program(1000, seed=13)
+
+    expected = PartialEvalVar(program).pe()
+    result = PartialEvalVar(program).pe_flat(to_flat(program))
+
+    assert to_module(result) == expected
+
+
+def test_pe_flat_output_can_be_interpreted_directly():
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(Constant(2), Add(), Constant(3))),
+            Assign([Name("y")], Call(Name("input_int"), [])),
+            Expr(
+                Call(
+                    Name("print"),
+                    [BinOp(Name("x"), Sub(), BinOp(Name("y"), Add(), Name("x")))],
+                )
+            ),
+            Expr(Call(Name("print"), [UnaryOp(USub(), Name("x"))])),
+        ]
+    )
+
+    result = PartialEvalVar(program).pe_flat(to_flat(program))
+
+    assert list(result.consts) == [5, -5]
+    assert run_flat(result, [10]) == [-10, -5]
+
+
+def test_pe_flat_leaves_operations_that_overflow_64_bits_residual():
+    big = 2**63 - 1
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(Constant(big), Add(), Constant(1))),
+            Assign([Name("y")], UnaryOp(USub(), Constant(-(2**63)))),
+            Expr(
+                Call(
+                    Name("print"),
+                    [BinOp(BinOp(Name("x"), Add(), Name("y")), Sub(), Constant(2))],
+                )
+            ),
+            Expr(Call(Name("print"), [BinOp(Constant(-big), Sub(), Constant(1))])),
+        ]
+    )
+
+    result = PartialEvalVar(program).pe_flat(to_flat(program))
+
+    assert to_module(result).body[0].value == BinOp(Constant(big), Add(), Constant(1))
+    assert run_flat(result) == [2**64 - 2, -(2**63)]
+
+
+def test_remove_complex_operands_flat_matches_tree_version():
+    program = generate_program(1000, seed=14)
+
+    expected = CompilerVar().remove_complex_operands(program)
+    result = CompilerVar().remove_complex_operands_flat(to_flat(program))
+
+    assert to_module(result) == expected
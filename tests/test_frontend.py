@@ -0,0 +1,202 @@
+import pytest
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from flat_ast import to_flat
+from frontend import iter_modules, iter_statements, parse_file, parse_source, unparse
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+
+
+def run(module, inputs=()):
+    output = ListOutput()
+    InterpreterVar(module, BufferInput(inputs), output).interp_flat(to_flat(module))
+    return output.values
+
+
+def test_parse_source_builds_ast_nodes():
+    source = "x = input_int()\ny = x + -5 - (3 - x)\nprint(y)\n"
+
+    module = parse_source(source)
+
+    assert module == Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign(
+                [Name("y")],
+                BinOp(
+                    BinOp(Name("x"), Add(), UnaryOp(USub(), Constant(5))),
+                    Sub(),
+                    BinOp(Constant(3), Sub(), Name("x")),
+                ),
+            ),
+            Expr(Call(Name("print"), [Name("y")])),
+        ]
+    )
+
+
+def test_unparse_round_trips_generated_programs():
+    program = generate_program(500, seed=21)
+    inputs = list(range(500))
+
+    source = unparse(program)
+    module = parse_source(source)
+
+    assert unparse(module) == source
+    assert run(module, inputs) == run(program, inputs)
+
+
+def test_batches_do_not_change_result():
+    source = unparse(generate_program(200, seed=22)).replace("\n", "\n# note\n\n", 20)
+
+    expected = parse_source(source).body
+
+    for batch_size in (1, 3, 64):
+        assert list(iter_statements(source.splitlines(True), "f", batch_size)) == (
+            expected
+        )
+
+
+@pytest.mark.parametrize(
+    ("source", "message"),
+    [
+        ("x = 1\ny = x * 2\n", "<string>:2: unsupported operator: Mult"),
+        ("x = 1\nif x:\n    y = 2\n", "<string>:2: unsupported statement: If"),
+        ("x = len(2)\n", "<string>:1: unsupported call: len"),
+        ("a, b = 1, 2\n", "<string>:1: unsupported assignment target"),
+        ("x = 1.5\n", "<string>:1: unsupported expression: Constant"),
+        ("x = 1\ny = (2\n", "<string>:2: '(' was never closed"),
+        ("x = 1\ny = = 2\n", "<string>:2: invalid syntax"),
+    ],
+)
+def test_unsupported_constructs_report_line_numbers(source, message):
+    with pytest.raises(ValueError, match=message.replace("(", r"\(")):
+        parse_source(source)
+
+
+def test_line_numbers_are_absolute_across_batches():
+    source = "x = 1\n" * 10 + "y = x / 2\n"
+
+    with pytest.raises(ValueError, match="f:11: unsupported operator: Div"):
+        list(iter_statements(source.splitlines(True), "f", batch_size=3))
+
+
+def test_deep_expressions_do_not_hit_recursion_limits():
+    chain = " + ".join(["1"] * 50_000)
+    negations = "-" * 50_000
+    source = f"x = {chain}\ny = {negations}x\nprint(y - (1 - x) - ({chain}))\n"
+
+    module = parse_source(source)
+
+    assert run(module) == [49_999]
+
+
+def test_deeply_parenthesized_expressions_round_trip():
+    right = Name("x")
+    negated = Call(Name("input_int"), [])
+    for i in range(300):
+        right = BinOp(Constant(i), Sub() if i % 2 else Add(), right)
+        negated = UnaryOp(USub(), BinOp(negated, Add(), Name("x")))
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign([Name("y")], right),
+            Expr(Call(Name("print"), [BinOp(Name("y"), Sub(), negated)])),
+        ]
+    )
+
+    source = unparse(program)
+    module = parse_source(source)
+
+    assert module == program
+    assert unparse(module) == source
+    assert run(module, [5, 7]) == run(program, [5, 7])
+
+
+def test_errors_in_deeply_nested_statements_report_line_numbers():
+    deep = "(" * 300 + "x" + ")" * 300
+    source = f"x = 1\ny = {deep}\nz = {deep} * 2\n"
+
+    with pytest.raises(ValueError, match="<string>:3: unsupported operator: Mult"):
+        parse_source(source)
+
+
+def _parse_outcome(source):
+    try:
+        return parse_source(source)
+    except ValueError as error:
+        return str(error)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "y = 0x10 + 1_000 - 0o7 + {}",
+        "y = -{} - (x - 2)",
+        "x = 1; y = {}",
+        "print({})",
+        "y = {} * 2",
+        "y = 1.5 + {}",
+        "y = 2 ** -{}",
+        "y = 'a' + {}",
+        "y = {} < x < 2",
+        "y = not {} and x",
+        "y = {}.real",
+        "y = x[{}]",
+        "y = x[{}:]",
+        "y = len({})",
+        "y = input_int({})",
+        "print({}, end='')",
+        "y = {}, 1",
+        "y = [{}]",
+        "y = {{{}: 1}}",
+        "y = lambda: {}",
+        "y = {} if x else 1",
+        "y = [{} for x in y]",
+        "x += {}",
+        "{} = 1",
+        "y, {} = 1",
+        "y = z = {}",
+        "if {}:\n    y = 1",
+        "y = {} +",
+        "y = ({}",
+        "y = {})",
+        "y = ({}]",
+    ],
+)
+def test_statements_parse_the_same_above_the_nesting_limit(template):
+    def nested(depth):
+        return template.format("(" * depth + "x - 1" + ")" * depth)
+
+    below = _parse_outcome(f"x = 1\n{nested(190)}\n")
+    above = _parse_outcome(f"x = 1\n{nested(210)}\n")
+
+    assert above == below
+
+
+def test_parse_file_and_iter_modules_stream_files(tmp_path):
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"prog{seed}.py"
+        path.write_text(unparse(generate_program(50, seed=seed)))
+        paths.append(path)
+
+    modules = dict(iter_modules(paths))
+
+    assert list(modules) == paths
+    assert modules[paths[1]] == parse_file(paths[1])
+    with pytest.raises(ValueError, match=f"{paths[0]}:1: unsupported"):
+        paths[0].write_text("x = 1 * 2\n")
+        parse_file(paths[0])
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from ast_nodes import Assign, Call, Constant, Expr, Module, Name
+from incremental_partial_eval import IncrementalPartialEvalVar
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+
+def test_initial_result_matches_full_pe():
+    program = generate_program(500, seed=41)
+
+    assert IncrementalPartialEvalVar(program).pe() == PartialEvalVar(program).pe()
+
+
+@pytest.mark.parametrize("memoize", [False, True])
+def test_random_edits_match_full_pe(memoize):
+    rng = random.Random(7)
+    program = generate_program(400, seed=42)
+    donors = generate_program(100, seed=43).body
+    body = list(program.body)
+    incremental = IncrementalPartialEvalVar(program, memoize=memoize)
+    for _ in range(60):
+        index = rng.randrange(len(body))
+        roll = rng.random()
+        if roll < 0.5:
+            body[index] = rng.choice(donors)
+            result = incremental.replace(index, body[index])
+        elif roll < 0.75:
+            body.insert(index, rng.choice(donors))
+            result = incremental.insert(index, body[index])
+        else:
+            del body[index]
+            result = incremental.delete(index)
+
+        assert result == PartialEvalVar(Module(body)).pe()
+
+
+def test_stops_once_the_environment_matches_the_previous_run():
+    body = [Assign([Name("x")], Constant(1))]
+    body += [Expr(Call(Name("print"), [Name("x")])) for _ in range(1_000)]
+    body += [Assign([Name("x")], Constant(2)), Expr(Call(Name("print"), [Name("x")]))]
+    incremental = IncrementalPartialEvalVar(Module(body))
+
+    incremental.replace(500, Expr(Call(Name("print"), [Constant(0)])))
+    assert incremental.reevaluated == 1
+
+    result = incremental.replace(0, Assign([Name("x")], Constant(5)))
+    assert incremental.reevaluated == 1_002
+    assert result.body[1] == Expr(Call(Name("print"), [Constant(5)]))
+    assert result.body[-1] == Expr(Call(Name("print"), [Constant(2)]))
+    assert dict(incremental.env_before(1_001).items()) == {"x": 5}
+
+
+def test_rejects_invalid_ranges():
+    incremental = IncrementalPartialEvalVar(Module([]))
+
+    with pytest.raises(IndexError):
+        incremental.update(1, 0, [])
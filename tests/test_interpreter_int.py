@@ -74,3 +74,15 @@ def test_interp_convenience_method(capsys):
 
     captured = capsys.readouterr()
     assert captured.out == "42\n11\n"
+
+
+def test_interp_long_program_runs_without_recursion_error(capsys):
+    program = Module([Expr(Call(Name("print"), [Constant(i)])) for i in range(5000)])
+
+    InterpeterInt(program).interp()
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert len(lines) == 5000
+    assert lines[0] == "0"
+    assert lines[-1] == "4999"
@@ -104,3 +104,29 @@ def test_interp_stmt_runs_continuation_with_assignments(capsys):
 
     captured = capsys.readouterr()
     assert captured.out == "10\n"
+
+
+def test_interp_long_program_runs_without_recursion_error():
+    body = [Assign([Name("x")], Constant(0))]
+    body += [Assign([Name("x")], BinOp(Name("x"), Add(), Constant(1)))] * 5000
+    interp = InterpreterVar(Module(body))
+
+    env = interp.interp()
+
+    assert env["x"] == 5000
+
+
+def test_interp_stmts_stops_at_first_error(capsys):
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Constant(1)])),
+            Expr(Call(Name("print"), [Name("missing")])),
+            Expr(Call(Name("print"), [Constant(2)])),
+        ]
+    )
+
+    with pytest.raises(ValueError, match="undefined variable: missing"):
+        InterpreterVar(program).interp()
+
+    captured = capsys.readouterr()
+    assert captured.out == "1\n"
@@ -0,0 +1,117 @@
+import io
+from array import array
+
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Expr, Module, Name
+from interpreter_int import InterpeterInt
+from interpreter_var import InterpreterVar
+from io_channels import (
+    BufferedOutput,
+    BufferInput,
+    ListOutput,
+    StdinInput,
+    StdoutOutput,
+    write_int_file,
+)
+
+
+def _sum_program():
+    read = Call(Name("input_int"), [])
+    return Module(
+        [
+            Assign([Name("x")], read),
+            Assign([Name("y")], BinOp(Name("x"), Add(), read)),
+            Expr(Call(Name("print"), [Name("x")])),
+            Expr(Call(Name("print"), [Name("y")])),
+        ]
+    )
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.write_calls = 0
+
+    def write(self, text):
+        self.write_calls += 1
+        return super().write(text)
+
+
+def test_default_channels_are_stdin_and_stdout():
+    interp = InterpeterInt(Module([]))
+
+    assert isinstance(interp.input_channel, StdinInput)
+    assert isinstance(interp.output_channel, StdoutOutput)
+
+
+def test_buffer_input_reads_from_array():
+    channel = BufferInput(array("q", [7, -3]))
+
+    assert channel.read_int() == 7
+    assert channel.read_int() == -3
+    with pytest.raises(EOFError):
+        channel.read_int()
+
+
+def test_buffer_input_reads_from_iterator():
+    channel = BufferInput(iter(range(3)))
+
+    assert [channel.read_int() for _ in range(3)] == [0, 1, 2]
+
+
+def test_buffer_input_maps_binary_file(tmp_path):
+    path = tmp_path / "inputs.bin"
+    write_int_file(path, [1, 2**40, -5])
+
+    channel = BufferInput.from_file(path)
+
+    assert [channel.read_int() for _ in range(3)] == [1, 2**40, -5]
+    with pytest.raises(EOFError):
+        channel.read_int()
+
+
+def test_buffer_input_maps_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    write_int_file(path, [])
+
+    with pytest.raises(EOFError):
+        BufferInput.from_file(path).read_int()
+
+
+def test_buffered_output_writes_once_on_interp():
+    stream = CountingStream()
+    interp = InterpreterVar(
+        _sum_program(), BufferInput([10, 32]), BufferedOutput(stream)
+    )
+
+    env = interp.interp()
+
+    assert env["y"] == 42
+    assert stream.getvalue() == "10\n42\n"
+    assert stream.write_calls == 1
+
+
+def test_buffered_output_flushes_when_program_fails():
+    stream = io.StringIO()
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Call(Name("input_int"), [])])),
+            Expr(Call(Name("print"), [Name("missing")])),
+        ]
+    )
+    interp = InterpreterVar(program, BufferInput([5]), BufferedOutput(stream))
+
+    with pytest.raises(ValueError, match="undefined variable: missing"):
+        interp.interp()
+
+    assert stream.getvalue() == "5\n"
+
+
+def test_list_output_collects_values(capsys):
+    output = ListOutput()
+
+    InterpreterVar(_sum_program(), BufferInput([1, 2]), output).interp()
+
+    assert output.values == [1, 3]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,93 @@
+from linear_scan import linear_scan, live_intervals
+from register_allocation import ALLOCATABLE_REGISTERS, move_related
+from x86_ast import (
+    CALLEE_SAVED_REGISTERS,
+    Callq,
+    Immediate,
+    Instr,
+    Reg,
+    Var,
+    X86Program,
+)
+
+
+def test_live_intervals_span_first_to_last_occurrence():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("x")]),
+            Instr("movq", [Var("x"), Var("y")]),
+            Instr("movq", [Var("y"), Reg("rdi")]),
+            Callq("_print_int", 1),
+            Instr("addq", [Var("x"), Var("x")]),
+        ]
+    )
+
+    intervals, fixed, calls = live_intervals(program)
+
+    assert intervals == {Var("x"): [0, 4], Var("y"): [1, 2]}
+    assert fixed == {"rdi": [[2, 3]]}
+    assert calls == [3]
+
+
+def test_linear_scan_reuses_registers_after_intervals_end():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("a")]),
+            Instr("movq", [Var("a"), Var("b")]),
+            Instr("movq", [Var("b"), Var("c")]),
+        ]
+    )
+
+    registers, slots = linear_scan(program)
+
+    assert registers == {Var("a"): "rcx", Var("b"): "rcx", Var("c"): "rcx"}
+    assert slots == {}
+
+
+def test_linear_scan_keeps_call_crossing_values_in_callee_saved_registers():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("x")]),
+            Instr("movq", [Immediate(2), Var("y")]),
+            Instr("movq", [Var("y"), Reg("rdi")]),
+            Callq("_print_int", 1),
+            Instr("movq", [Var("x"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+
+    registers, _ = linear_scan(program)
+
+    assert registers[Var("x")] == CALLEE_SAVED_REGISTERS[0]
+    assert registers[Var("y")] == "rcx"
+
+
+def test_linear_scan_spills_the_interval_that_ends_last():
+    names = [f"v{index}" for index in range(len(ALLOCATABLE_REGISTERS))]
+    body = [Instr("movq", [Immediate(0), Var("long")])]
+    body.extend(Instr("movq", [Immediate(0), Var(name)]) for name in names)
+    body.extend(Instr("negq", [Var(name)]) for name in names)
+    body.append(Instr("negq", [Var("long")]))
+
+    registers, slots = linear_scan(X86Program(body))
+
+    assert slots == {Var("long"): 0}
+    assert len(registers) == len(names)
+
+
+def test_linear_scan_follows_move_hints():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("a")]),
+            Instr("movq", [Immediate(2), Var("b")]),
+            Instr("addq", [Var("b"), Var("a")]),
+            Instr("movq", [Var("a"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+
+    unhinted, _ = linear_scan(program)
+    hinted, _ = linear_scan(program, move_related(program))
+
+    assert unhinted[Var("a")] == "rcx"
+    assert hinted[Var("a")] == "rdi"
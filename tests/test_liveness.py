@@ -0,0 +1,66 @@
+import pytest
+
+from liveness import uncover_live
+from x86_ast import Callq, Immediate, Instr, Reg, Var, X86Program
+
+
+def test_uncover_live_computes_live_after_sets():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("x")]),
+            Instr("movq", [Var("x"), Var("y")]),
+            Instr("addq", [Var("x"), Var("y")]),
+            Instr("movq", [Var("y"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+    expected = [
+        {Var("x")},
+        {Var("x"), Var("y")},
+        {Var("y")},
+        {Reg("rdi")},
+        set(),
+    ]
+
+    liveness = uncover_live(program)
+
+    assert list(liveness.live_after_sets()) == expected
+    assert [liveness.live_after_set(index) for index in range(5)] == expected
+    assert liveness.live_in == set()
+
+
+def test_uncover_live_treats_calls_as_clobbering_caller_saved_registers():
+    program = X86Program(
+        [
+            Instr("movq", [Var("x"), Reg("rcx")]),
+            Callq("_read_int", 0),
+            Instr("addq", [Reg("rcx"), Var("x")]),
+        ]
+    )
+
+    liveness = uncover_live(program)
+
+    assert liveness.is_live_after(0, Var("x"))
+    assert not liveness.is_live_after(0, Reg("rcx"))
+    assert liveness.live_after_set(1) == {Var("x"), Reg("rcx")}
+    assert liveness.live_in == {Var("x")}
+
+
+def test_uncover_live_reuses_bits_for_values_with_disjoint_lifetimes():
+    body = []
+    for index in range(100_000):
+        body.append(Instr("movq", [Immediate(index), Var(f"tmp_{index}")]))
+        body.append(Instr("addq", [Var(f"tmp_{index}"), Var("total")]))
+    body.append(Instr("movq", [Var("total"), Reg("rdi")]))
+    body.append(Callq("_print_int", 1))
+
+    liveness = uncover_live(X86Program(body))
+
+    assert max(bitset.bit_length() for bitset in liveness.live_after) == 2
+    assert liveness.live_after_set(100_000) == {Var("tmp_50000"), Var("total")}
+    assert liveness.live_in == {Var("total")}
+
+
+def test_uncover_live_rejects_unknown_instructions():
+    with pytest.raises(ValueError, match="unsupported instruction in liveness"):
+        uncover_live(X86Program([Instr("imulq", [Var("x"), Var("y")])]))
@@ -0,0 +1,180 @@
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from compiler_var import CompilerVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from node_factory import NodeFactory, count_nodes
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+
+
+def neg8():
+    return UnaryOp(USub(), Constant(8))
+
+
+def doubling_exp(depth):
+    exp = neg8()
+    for _ in range(depth):
+        exp = BinOp(exp, Add(), exp)
+    return exp
+
+
+def run(module, inputs=()):
+    output = ListOutput()
+    InterpreterVar(module, BufferInput(inputs), output).interp()
+    return output.values
+
+
+def test_factory_returns_one_node_per_structure():
+    factory = NodeFactory()
+
+    first = factory.unary_op(USub(), factory.constant(8))
+    second = factory.unary_op(USub(), factory.constant(8))
+
+    assert first is second
+    assert factory.constant(1) is not factory.constant(True)
+    assert factory.name("x") is factory.name("x")
+    assert len(factory) == 5
+
+
+def test_intern_turns_repeated_subtrees_into_a_dag():
+    exp = BinOp(neg8(), Sub(), BinOp(neg8(), Add(), Name("x")))
+
+    interned = NodeFactory().intern(exp)
+
+    assert interned == exp
+    assert interned.left is interned.right.left
+    assert count_nodes(exp) == (7, 7)
+    assert count_nodes(interned) == (7, 5)
+
+
+def test_intern_module_preserves_semantics():
+    program = generate_program(300, num_vars=3, seed=4)
+    inputs = list(range(500))
+
+    interned = NodeFactory().intern(program)
+
+    assert interned == program
+    assert count_nodes(interned)[1] < count_nodes(program)[1]
+    assert run(interned, inputs) == run(program, inputs)
+
+
+def test_intern_keeps_separate_input_calls_evaluated_twice():
+    program = Module(
+        [
+            Assign(
+                [Name("x")],
+                BinOp(Call(Name("input_int"), []), Sub(), Call(Name("input_int"), [])),
+            ),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    interned = NodeFactory().intern(program)
+
+    assert interned.body[0].value.left is interned.body[0].value.right
+    assert run(interned, [10, 3]) == [7]
+
+
+def test_memoized_pe_matches_plain_pe():
+    program = NodeFactory().intern(generate_program(500, num_vars=4, seed=8))
+    inputs = list(range(500))
+
+    plain = PartialEvalVar(program).pe()
+    memoized = PartialEvalVar(program, memoize=True).pe()
+
+    assert run(memoized, inputs) == run(plain, inputs) == run(program, inputs)
+
+
+def test_memoized_pe_forgets_results_when_environment_changes():
+    factory = NodeFactory()
+    x_plus_1 = factory.bin_op(factory.name("x"), Add(), factory.constant(1))
+    program = Module(
+        [
+            Assign([Name("x")], Constant(1)),
+            Assign([Name("y")], x_plus_1),
+            Assign([Name("x")], Constant(5)),
+            Assign([Name("z")], x_plus_1),
+        ]
+    )
+    pe = PartialEvalVar(program, memoize=True)
+
+    result = pe.pe()
+
+    assert result.body[1].value == Constant(2)
+    assert result.body[3].value == Constant(6)
+
+
+def test_memoized_pe_handles_exponential_trees():
+    program = Module([Expr(Call(Name("print"), [doubling_exp(200)]))])
+
+    result = PartialEvalVar(program, memoize=True).pe()
+
+    assert result.body[0].value.args[0] == Constant(-8 * 2**200)
+
+
+def test_memoized_pe_keeps_symbolic_shared_subtrees_shared():
+    def program(depth):
+        exp = BinOp(Name("x"), Sub(), Constant(1))
+        for _ in range(depth):
+            exp = BinOp(exp, Add(), exp)
+        return Module(
+            [
+                Assign([Name("x")], Call(Name("input_int"), [])),
+                Expr(Call(Name("print"), [BinOp(exp, Add(), Constant(5))])),
+            ]
+        )
+
+    deep = PartialEvalVar(program(200), memoize=True).pe()
+    small = PartialEvalVar(program(4), memoize=True).pe()
+
+    assert count_nodes(deep)[1] < 100_000
+    assert run(small, [3]) == run(program(4), [3]) == [37]
+
+
+def test_memoized_rco_reuses_temporaries_for_shared_pure_subtrees():
+    program = Module([Assign([Name("x")], doubling_exp(3))])
+
+    plain = CompilerVar().remove_complex_operands(program)
+    memoized = CompilerVar(memoize=True).remove_complex_operands(program)
+
+    assert len(plain.body) == 15
+    assert len(memoized.body) == 4
+    assert run(Module(memoized.body + [Expr(Call(Name("print"), [Name("x")]))])) == [
+        -64
+    ]
+
+
+def test_memoized_rco_does_not_share_input_reads():
+    read = Call(Name("input_int"), [])
+    shared = UnaryOp(USub(), read)
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(shared, Sub(), shared)),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    rco = CompilerVar(memoize=True).remove_complex_operands(program)
+
+    assert run(rco, [10, 3]) == run(program, [10, 3]) == [-7]
+
+
+def test_memoized_rco_matches_plain_rco_semantics():
+    program = NodeFactory().intern(generate_program(300, num_vars=3, seed=2))
+    inputs = list(range(500))
+
+    rco = CompilerVar(memoize=True).remove_complex_operands(program)
+
+    assert run(rco, inputs) == run(program, inputs)
@@ -83,3 +83,28 @@ def test_pe_module_rewrites_statements():
     assert isinstance(expr_stmt.value.op, Sub)
     assert isinstance(expr_stmt.value.right, Constant)
     assert expr_stmt.value.right.value == 2
+
+
+def test_pe_exp_reassociates_constants_around_input_int():
+    read = Call(Name("input_int"), [])
+    exp = BinOp(BinOp(read, Add(), Constant(1)), Add(), Constant(2))
+
+    result = PartialEvalInt(Module([])).pe_exp(exp)
+
+    assert result == BinOp(read, Add(), Constant(3))
+
+
+def test_pe_exp_keeps_input_int_order_and_folds_one_constant():
+    first = Call(Name("input_int"), [])
+    second = Call(Name("input_int"), [])
+    exp = BinOp(
+        BinOp(Constant(4), Sub(), first),
+        Sub(),
+        UnaryOp(USub(), BinOp(second, Sub(), Constant(10))),
+    )
+
+    result = PartialEvalInt(Module([])).pe_exp(exp)
+
+    assert result == BinOp(BinOp(Constant(-6), Sub(), first), Add(), second)
+    assert result.left.right is first
+    assert result.right is second
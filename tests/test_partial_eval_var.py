@@ -116,3 +116,64 @@ def test_pe_handles_unary_with_known_variable():
     assert isinstance(out_program.body[1], Assign)
     assert isinstance(out_program.body[1].value, Constant)
     assert out_program.body[1].value.value == -5
+
+
+def test_pe_exp_folds_constants_across_linear_terms():
+    pe = PartialEvalVar(Module([]))
+    exp = BinOp(
+        BinOp(Name("x"), Add(), Constant(3)),
+        Sub(),
+        BinOp(Constant(5), Sub(), Name("x")),
+    )
+
+    result = pe.pe_exp(exp, {})
+
+    assert result == BinOp(BinOp(Name("x"), Add(), Name("x")), Sub(), Constant(2))
+
+
+def test_pe_exp_cancels_double_negation():
+    pe = PartialEvalVar(Module([]))
+
+    result = pe.pe_exp(UnaryOp(USub(), UnaryOp(USub(), Name("y"))), {})
+
+    assert result == Name("y")
+
+
+def test_pe_module_propagates_copies_to_the_original_atom():
+    program = Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign([Name("y")], Name("x")),
+            Assign([Name("z")], BinOp(Name("y"), Add(), Constant(1))),
+            Expr(Call(Name("print"), [Name("z")])),
+        ]
+    )
+
+    out_program = PartialEvalVar(program).pe()
+
+    assert out_program.body[2] == Assign(
+        [Name("z")], BinOp(Name("x"), Add(), Constant(1))
+    )
+
+
+def test_pe_module_invalidates_aliases_when_the_source_is_reassigned():
+    program = Module(
+        [
+            Assign([Name("y")], Name("x")),
+            Assign([Name("z")], Name("y")),
+            Assign([Name("x")], BinOp(Name("x"), Add(), Constant(1))),
+            Expr(Call(Name("print"), [BinOp(Name("z"), Sub(), Name("y"))])),
+            Assign([Name("y")], Name("y")),
+            Expr(Call(Name("print"), [Name("y")])),
+        ]
+    )
+    env = {}
+
+    out_program = Module(PartialEvalVar(program).pe_stmts(program.body, env))
+
+    assert out_program.body[1] == Assign([Name("z")], Name("x"))
+    assert out_program.body[3] == Expr(
+        Call(Name("print"), [BinOp(Name("z"), Sub(), Name("y"))])
+    )
+    assert out_program.body[5] == Expr(Call(Name("print"), [Name("y")]))
+    assert env == {}
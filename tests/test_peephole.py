@@ -0,0 +1,148 @@
+from peephole import PEEPHOLE_RULES, PeepholeOptimizer
+from x86_ast import Callq, Deref, Immediate, Instr, Reg, X86Program
+
+
+def _optimize(body, rules=None):
+    optimizer = PeepholeOptimizer(rules)
+    return optimizer.optimize(X86Program(body)).body, optimizer
+
+
+def test_peephole_drops_self_moves_and_zero_adds():
+    body, optimizer = _optimize(
+        [
+            Instr("movq", [Reg("rcx"), Reg("rcx")]),
+            Instr("addq", [Immediate(0), Reg("rdx")]),
+            Instr("subq", [Immediate(0), Reg("rdx")]),
+            Callq("_print_int", 1),
+        ]
+    )
+
+    assert body == [Callq("_print_int", 1)]
+    assert optimizer.stats["self_move"] == 1
+    assert optimizer.stats["add_zero"] == 2
+
+
+def test_peephole_replaces_zero_then_add_with_a_move():
+    body, _ = _optimize(
+        [
+            Instr("movq", [Immediate(0), Reg("rcx")]),
+            Instr("addq", [Reg("rdx"), Reg("rcx")]),
+        ]
+    )
+
+    assert body == [Instr("movq", [Reg("rdx"), Reg("rcx")])]
+
+
+def test_peephole_keeps_zero_then_add_that_would_need_two_memory_operands():
+    original = [
+        Instr("movq", [Immediate(0), Deref("rbp", -8)]),
+        Instr("addq", [Deref("rbp", -16), Deref("rbp", -8)]),
+    ]
+
+    body, _ = _optimize(list(original))
+
+    assert body == original
+
+
+def test_peephole_removes_reload_after_scratch_round_trip():
+    body, optimizer = _optimize(
+        [
+            Instr("movq", [Deref("rbp", -8), Reg("rax")]),
+            Instr("movq", [Reg("rax"), Deref("rbp", -16)]),
+            Instr("movq", [Deref("rbp", -16), Reg("rax")]),
+            Instr("addq", [Reg("rax"), Deref("rbp", -24)]),
+        ]
+    )
+
+    assert body == [
+        Instr("movq", [Deref("rbp", -8), Reg("rax")]),
+        Instr("movq", [Reg("rax"), Deref("rbp", -16)]),
+        Instr("addq", [Reg("rax"), Deref("rbp", -24)]),
+    ]
+    assert optimizer.stats["redundant_reload"] == 1
+
+
+def test_peephole_turns_negate_then_add_into_sub():
+    body, _ = _optimize(
+        [
+            Instr("movq", [Reg("rdx"), Reg("rcx")]),
+            Instr("negq", [Reg("rcx")]),
+            Instr("addq", [Reg("rsi"), Reg("rcx")]),
+        ]
+    )
+
+    assert body == [
+        Instr("movq", [Reg("rsi"), Reg("rcx")]),
+        Instr("subq", [Reg("rdx"), Reg("rcx")]),
+    ]
+
+
+def test_peephole_cascades_folds_to_a_single_move():
+    body, optimizer = _optimize(
+        [
+            Instr("movq", [Immediate(5), Reg("rcx")]),
+            Instr("negq", [Reg("rcx")]),
+            Instr("addq", [Immediate(7), Reg("rcx")]),
+            Instr("subq", [Immediate(1), Reg("rcx")]),
+            Instr("movq", [Reg("rcx"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+
+    assert body == [
+        Instr("movq", [Immediate(1), Reg("rcx")]),
+        Instr("movq", [Reg("rcx"), Reg("rdi")]),
+        Callq("_print_int", 1),
+    ]
+    assert optimizer.stats["fold_immediates"] == 3
+    assert optimizer.passes == 2
+
+
+def test_peephole_does_not_fold_past_32_bit_immediates():
+    original = [
+        Instr("movq", [Immediate(2**31 - 1), Deref("rbp", -8)]),
+        Instr("addq", [Immediate(1), Deref("rbp", -8)]),
+    ]
+
+    body, _ = _optimize(list(original))
+
+    assert body == original
+
+
+def test_peephole_drops_writes_that_are_overwritten():
+    body, optimizer = _optimize(
+        [
+            Instr("movq", [Reg("rdx"), Reg("rcx")]),
+            Instr("negq", [Reg("rcx")]),
+            Instr("movq", [Immediate(3), Reg("rcx")]),
+        ]
+    )
+
+    assert body == [Instr("movq", [Immediate(3), Reg("rcx")])]
+    assert optimizer.stats["overwritten"] == 2
+
+
+def test_peephole_accepts_a_custom_rule_table():
+    def drop_double_neg(window):
+        first, second = window
+        if first == second == Instr("negq", [Reg("rcx")]):
+            return []
+        return None
+
+    rules = [("drop_double_neg", 2, ("negq",), drop_double_neg)]
+    body, optimizer = _optimize(
+        [
+            Instr("negq", [Reg("rcx")]),
+            Instr("addq", [Immediate(0), Reg("rcx")]),
+            Instr("negq", [Reg("rcx")]),
+            Instr("negq", [Reg("rcx")]),
+        ],
+        rules,
+    )
+
+    assert body == [
+        Instr("negq", [Reg("rcx")]),
+        Instr("addq", [Immediate(0), Reg("rcx")]),
+    ]
+    assert optimizer.stats == {"drop_double_neg": 1}
+    assert len(PEEPHOLE_RULES) == 8
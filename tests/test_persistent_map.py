@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from persistent_map import EMPTY_MAP, MapEnv, PersistentMap
+
+
+class CollidingKey:
+    def __init__(self, name, hash_value):
+        self.name = name
+        self.hash_value = hash_value
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.name == other.name
+
+
+def test_set_and_discard_leave_earlier_versions_untouched():
+    first = EMPTY_MAP.set("x", 1)
+    second = first.set("y", 2).set("x", 3)
+    third = second.discard("x")
+
+    assert dict(first.items()) == {"x": 1}
+    assert dict(second.items()) == {"x": 3, "y": 2}
+    assert dict(third.items()) == {"y": 2}
+    assert "x" not in third
+    assert len(third) == 1
+    with pytest.raises(KeyError):
+        third["x"]
+
+
+def test_unchanged_updates_return_the_same_map():
+    value = object()
+    env = PersistentMap({"x": value})
+
+    assert env.set("x", value) is env
+    assert env.discard("missing") is env
+
+
+def test_matches_dict_under_random_updates_with_collisions():
+    rng = random.Random(3)
+    keys = [f"v{index}" for index in range(300)]
+    keys += [CollidingKey(index, rng.choice([1, 33, 2**40])) for index in range(30)]
+    expected = {}
+    env = EMPTY_MAP
+    for _ in range(3_000):
+        key = rng.choice(keys)
+        if rng.random() < 0.6:
+            expected[key] = rng.randrange(4)
+            env = env.set(key, expected[key])
+        else:
+            expected.pop(key, None)
+            env = env.discard(key)
+
+    assert len(env) == len(expected)
+    assert dict(env.items()) == expected
+    assert env == PersistentMap(expected)
+    assert env != PersistentMap(expected).set("extra", 0)
+
+
+def test_map_env_supports_the_dict_operations_used_by_the_evaluators():
+    env = MapEnv()
+    env["x"] = 1
+    env["y"] = 2
+    snapshot = env.map
+
+    del env["x"]
+
+    assert env.pop("y") == 2
+    assert env.pop("y", None) is None
+    assert len(env) == 0
+    assert dict(snapshot.items()) == {"x": 1, "y": 2}
+    with pytest.raises(KeyError):
+        del env["x"]
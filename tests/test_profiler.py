@@ -0,0 +1,112 @@
+import json
+import pstats
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from io_channels import ListOutput
+from profiler import NodeProfiler
+
+
+def _program():
+    return Module(
+        [
+            Assign(
+                [Name("x")], BinOp(Constant(1), Add(), UnaryOp(USub(), Constant(2)))
+            ),
+            Expr(Call(Name("print"), [BinOp(Name("x"), Add(), Name("x"))])),
+        ]
+    )
+
+
+def _profiled_run():
+    profiler = NodeProfiler()
+    output = ListOutput()
+    interp = profiler.attach(InterpreterVar(_program(), output_channel=output))
+    interp.interp()
+    return profiler, output
+
+
+def test_profiling_does_not_change_results():
+    _, output = _profiled_run()
+
+    assert output.values == [-2]
+
+
+def test_counts_evaluations_per_node_type():
+    profiler, _ = _profiled_run()
+
+    counts = {label: count for label, (count, _, _) in profiler.by_node_type().items()}
+
+    assert counts == {"BinOp": 2, "Constant": 2, "UnaryOp": 1, "Name": 2}
+
+
+def test_counts_and_times_per_statement_index():
+    profiler, _ = _profiled_run()
+
+    by_stmt = profiler.by_statement()
+
+    assert sorted(by_stmt) == [0, 1]
+    for count, self_ns, cum_ns in by_stmt.values():
+        assert count == 1
+        assert 0 <= self_ns <= cum_ns
+
+
+def test_nested_nodes_of_same_type_count_cumulative_time_once():
+    profiler = NodeProfiler()
+    exp = BinOp(BinOp(Constant(1), Add(), Constant(2)), Add(), Constant(3))
+    interp = profiler.attach(InterpreterVar(Module([Expr(exp)])))
+
+    interp.interp()
+
+    calls, primitive, self_ns, cum_ns = profiler.entries[(0, "BinOp")]
+    assert (calls, primitive) == (2, 1)
+    assert self_ns <= cum_ns
+
+
+def test_detach_removes_hooks():
+    profiler = NodeProfiler()
+    interp = profiler.attach(InterpreterVar(_program()))
+
+    NodeProfiler.detach(interp)
+
+    assert "exp_children" not in vars(interp)
+    assert "eval_exp" not in vars(interp)
+    assert "exec_stmt" not in vars(interp)
+    assert "interp" not in vars(interp)
+
+
+def test_dump_pstats_is_loadable(tmp_path):
+    profiler, _ = _profiled_run()
+    path = tmp_path / "lvar.prof"
+
+    profiler.dump_pstats(path)
+
+    stats = pstats.Stats(str(path))
+    labels = {func for (_, _, func) in stats.stats}
+    assert labels == {"<stmt>", "BinOp", "Constant", "UnaryOp", "Name"}
+    assert stats.total_calls == 9
+
+
+def test_speedscope_export_uses_sampled_profile(tmp_path):
+    profiler, _ = _profiled_run()
+    path = tmp_path / "lvar.speedscope.json"
+
+    profiler.dump_speedscope(path)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    profile = data["profiles"][0]
+    names = [frame["name"] for frame in data["shared"]["frames"]]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert {"stmt 0", "stmt 1", "BinOp"} <= set(names)
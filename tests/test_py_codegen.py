@@ -0,0 +1,159 @@
+import pytest
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+from py_codegen import MAX_NESTING, CodeCache, PyCodegenVar, generate_source
+
+
+def _program():
+    return Module(
+        [
+            Assign([Name("x")], Call(Name("input_int"), [])),
+            Assign([Name("y")], BinOp(Name("x"), Sub(), UnaryOp(USub(), Constant(2)))),
+            Expr(Call(Name("print"), [Name("y")])),
+        ]
+    )
+
+
+def test_generate_source_for_simple_program():
+    source = generate_source(_program())
+
+    assert source == (
+        "def lvar_main(_env, _read_int, _write_int):\n"
+        "    v0 = _read_int()\n"
+        "    v1 = (v0 - (-2))\n"
+        "    _write_int(v1)\n"
+        "    _env.update({'x': v0, 'y': v1})\n"
+        "    return _env\n"
+    )
+
+
+def test_interp_prints_and_returns_env(capsys, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda: "40")
+
+    env = PyCodegenVar(_program(), cache=CodeCache()).interp()
+
+    assert env == {"x": 40, "y": 42}
+    assert capsys.readouterr().out == "42\n"
+
+
+def test_interp_reads_preseeded_environment():
+    program = Module([Assign([Name("y")], BinOp(Name("x"), Add(), Constant(1)))])
+
+    env = PyCodegenVar(program, cache=CodeCache()).interp({"x": 41})
+
+    assert env == {"x": 41, "y": 42}
+
+
+def test_undefined_variable_raises_when_reached():
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Constant(1)])),
+            Expr(Call(Name("print"), [Name("missing")])),
+        ]
+    )
+    output = ListOutput()
+    interp = PyCodegenVar(program, output_channel=output, cache=CodeCache())
+
+    with pytest.raises(ValueError, match="undefined variable: missing"):
+        interp.interp()
+
+    assert output.values == [1]
+
+
+def test_deep_expression_is_flattened_into_temporaries():
+    exp = Call(Name("input_int"), [])
+    expected = 7
+    for i in range(5000):
+        if i % 2:
+            exp = BinOp(Constant(i), Sub(), exp)
+            expected = i - expected
+        else:
+            exp = BinOp(exp, Add(), Constant(i))
+            expected = expected + i
+    program = Module([Expr(Call(Name("print"), [exp]))])
+
+    assert "t4999 = " in generate_source(program)
+    assert PyCodegenVar(program, cache=CodeCache()).run([7]) == [expected]
+
+
+def test_deep_expression_reads_inputs_in_evaluation_order():
+    deep = Call(Name("input_int"), [])
+    for _ in range(MAX_NESTING + 6):
+        deep = UnaryOp(USub(), UnaryOp(USub(), deep))
+    program = Module(
+        [
+            Expr(
+                Call(
+                    Name("print"),
+                    [BinOp(Call(Name("input_int"), []), Sub(), deep)],
+                )
+            )
+        ]
+    )
+
+    expected = ListOutput()
+    InterpreterVar(program, BufferInput([100, 1]), expected).interp()
+
+    assert expected.values == [99]
+    assert PyCodegenVar(program, cache=CodeCache()).run([100, 1]) == [99]
+
+
+def test_cache_reuses_compiled_code_for_equal_modules():
+    cache = CodeCache()
+
+    first = PyCodegenVar(_program(), cache=cache)
+    second = PyCodegenVar(_program(), cache=cache)
+
+    assert first._main is second._main
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_recompiles_a_module_mutated_after_caching():
+    cache = CodeCache()
+    program = Module([Expr(Call(Name("print"), [Constant(1)]))])
+    assert PyCodegenVar(program, cache=cache).run() == [1]
+
+    program.body.append(Expr(Call(Name("print"), [Constant(2)])))
+
+    assert PyCodegenVar(program, cache=cache).run() == [1, 2]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = CodeCache(maxsize=2)
+    programs = [Module([Expr(Call(Name("print"), [Constant(i)]))]) for i in range(3)]
+
+    cache.get(programs[0])
+    cache.get(programs[1])
+    cache.get(programs[0])
+    cache.get(programs[2])
+    cache.get(programs[0])
+    cache.get(programs[1])
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_run_matches_interpreter_on_generated_programs(seed):
+    program = generate_program(80, max_depth=5, input_rate=0.2, seed=seed)
+    inputs = list(range(300))
+    expected = ListOutput()
+    InterpreterVar(program, BufferInput(inputs), expected).interp()
+
+    assert PyCodegenVar(program, cache=CodeCache()).run(inputs) == expected.values
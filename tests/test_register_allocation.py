@@ -0,0 +1,140 @@
+from liveness import uncover_live
+from register_allocation import (
+    ALLOCATABLE_REGISTERS,
+    build_interference,
+    coalesce_moves,
+    color_graph,
+    expand_aliases,
+    move_related,
+    spill_costs,
+)
+from x86_ast import (
+    CALLEE_SAVED_REGISTERS,
+    CALLER_SAVED_REGISTERS,
+    Callq,
+    Immediate,
+    Instr,
+    Reg,
+    Var,
+    X86Program,
+)
+
+
+def test_allocatable_registers_exclude_frame_and_scratch_registers():
+    assert "rsp" not in ALLOCATABLE_REGISTERS
+    assert "rbp" not in ALLOCATABLE_REGISTERS
+    assert "rax" not in ALLOCATABLE_REGISTERS
+    assert len(ALLOCATABLE_REGISTERS) == 13
+
+
+def test_build_interference_skips_move_source_and_adds_call_clobbers():
+    body = [
+        Instr("movq", [Immediate(1), Var("x")]),
+        Instr("movq", [Var("x"), Var("y")]),
+        Callq("_read_int", 0),
+        Instr("addq", [Var("x"), Var("y")]),
+    ]
+    program = X86Program(body)
+    graph = build_interference(program, uncover_live(program))
+
+    assert Var("y") not in graph[Var("x")]
+    for name in CALLER_SAVED_REGISTERS:
+        assert Var("x") in graph[Reg(name)]
+        assert Var("y") in graph[Reg(name)]
+
+
+def test_color_graph_keeps_values_live_across_calls_in_callee_saved_registers():
+    body = [
+        Callq("_read_int", 0),
+        Instr("movq", [Reg("rax"), Var("x")]),
+        Callq("_read_int", 0),
+        Instr("movq", [Reg("rax"), Var("y")]),
+        Instr("addq", [Var("x"), Var("y")]),
+        Instr("movq", [Var("y"), Reg("rdi")]),
+        Callq("_print_int", 1),
+    ]
+    program = X86Program(body)
+    graph = build_interference(program, uncover_live(program))
+
+    registers, slots = color_graph(graph, spill_costs(program))
+
+    assert registers[Var("x")] in CALLEE_SAVED_REGISTERS
+    assert registers[Var("y")] != registers[Var("x")]
+    assert slots == {}
+
+
+def test_color_graph_spills_the_cheapest_variables_under_pressure():
+    names = [f"v{index}" for index in range(len(ALLOCATABLE_REGISTERS) + 2)]
+    body = [
+        Instr("movq", [Immediate(index), Var(name)]) for index, name in enumerate(names)
+    ]
+    for name in names:
+        body.append(Instr("addq", [Var(name), Var(names[0])]))
+    for name in names[:-2]:
+        body.append(Instr("addq", [Var(name), Var(names[0])]))
+    program = X86Program(body)
+    graph = build_interference(program, uncover_live(program))
+
+    registers, slots = color_graph(graph, spill_costs(program))
+
+    assert set(slots) == {Var(names[-2]), Var(names[-1])}
+    assert sorted(slots.values()) == [0, 1]
+    assert len(set(registers.values())) == len(registers)
+
+
+def test_move_related_pairs_copies_between_locations():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("x")]),
+            Instr("movq", [Var("x"), Var("y")]),
+            Instr("movq", [Var("y"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+
+    assert move_related(program) == {
+        Var("x"): {Var("y"): None},
+        Var("y"): {Var("x"): None, Reg("rdi"): None},
+    }
+
+
+def test_coalesce_moves_merges_non_interfering_copies():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("x")]),
+            Instr("movq", [Var("x"), Var("y")]),
+            Instr("addq", [Immediate(2), Var("y")]),
+            Instr("movq", [Var("y"), Reg("rdi")]),
+            Callq("_print_int", 1),
+        ]
+    )
+    graph = build_interference(program, uncover_live(program))
+    costs = spill_costs(program)
+
+    aliases = coalesce_moves(graph, move_related(program), costs)
+    registers, slots = expand_aliases(aliases, *color_graph(graph, costs))
+
+    assert registers == {Var("x"): "rdi", Var("y"): "rdi"}
+    assert slots == {}
+
+
+def test_color_graph_biases_toward_move_partners():
+    program = X86Program(
+        [
+            Instr("movq", [Immediate(1), Var("a")]),
+            Instr("addq", [Var("a"), Var("a")]),
+            Instr("movq", [Immediate(2), Var("x")]),
+            Instr("addq", [Var("a"), Var("x")]),
+            Instr("addq", [Var("a"), Var("x")]),
+            Instr("movq", [Var("x"), Var("y")]),
+            Instr("negq", [Var("y")]),
+        ]
+    )
+    graph = build_interference(program, uncover_live(program))
+    costs = spill_costs(program)
+
+    unbiased, _ = color_graph(graph, costs)
+    biased, _ = color_graph(graph, costs, move_related(program))
+
+    assert unbiased[Var("y")] != unbiased[Var("x")]
+    assert biased[Var("y")] == biased[Var("x")]
@@ -0,0 +1,115 @@
+import pytest
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from program_generator import generate_program
+from serialize import (
+    CorpusReader,
+    CorpusWriter,
+    VERSION,
+    dumps,
+    loads,
+    write_corpus,
+)
+
+
+def test_round_trip_generated_program():
+    program = generate_program(500, seed=31)
+
+    assert loads(dumps(program)) == program
+
+
+def test_round_trip_keeps_large_and_negative_constants():
+    program = Module(
+        [
+            Assign([Name("x")], Constant(-(2**100))),
+            Assign([Name("y")], BinOp(Name("x"), Sub(), Constant(2**64 + 1))),
+            Expr(Call(Name("print"), [UnaryOp(USub(), Constant(-1))])),
+            Expr(Call(Name("input_int"), [])),
+        ]
+    )
+
+    assert loads(dumps(program)) == program
+
+
+def test_encoding_is_compact_prefix_order():
+    program = Module(
+        [Expr(Call(Name("print"), [BinOp(Constant(1), Add(), Name("x"))]))]
+    )
+
+    data = dumps(program)
+
+    assert data == b"LVAR\x01" + bytes([1, 1, ord("x"), 1, 2, 4, 1, 7, 3, 0, 4, 0])
+
+
+def test_deep_expressions_round_trip():
+    exp = Constant(0)
+    for _ in range(100_000):
+        exp = BinOp(exp, Add(), UnaryOp(USub(), Name("x")))
+    program = Module([Assign([Name("y")], exp)])
+
+    decoded = loads(dumps(program))
+
+    assert decoded == program
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError, match="not a serialized"):
+        loads(b"NOPE\x01")
+    with pytest.raises(ValueError, match="unsupported format version"):
+        loads(b"LVAR" + bytes([VERSION + 1]))
+    with pytest.raises(ValueError, match="cannot serialize expression"):
+        dumps(Module([Expr(Constant(1.5))]))
+
+
+def test_corpus_reader_decodes_programs_lazily(tmp_path):
+    path = tmp_path / "corpus.lvc"
+    programs = [generate_program(50, seed=seed) for seed in range(20)]
+    write_corpus(path, programs)
+
+    with CorpusReader(path) as reader:
+        assert len(reader) == 20
+        assert reader[13] == programs[13]
+        assert reader[-1] == programs[-1]
+        assert list(reader) == programs
+        with pytest.raises(IndexError):
+            reader[20]
+
+
+def test_corpus_writer_accepts_programs_incrementally(tmp_path):
+    path = tmp_path / "corpus.lvc"
+    with CorpusWriter(path) as writer:
+        writer.add(Module([]))
+        writer.add(generate_program(10, seed=1))
+
+    with CorpusReader(path) as reader:
+        assert list(reader) == [Module([]), generate_program(10, seed=1)]
+
+
+def test_corpus_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\x00" * 64)
+
+    with pytest.raises(ValueError, match="not an LVar corpus"):
+        CorpusReader(path)
+
+
+def test_corpus_reader_decodes_little_endian_offsets_on_any_host(tmp_path, monkeypatch):
+    path = tmp_path / "corpus.lvc"
+    programs = [generate_program(20, seed=seed) for seed in range(5)]
+    write_corpus(path, programs)
+    monkeypatch.setattr("serialize.sys.byteorder", "big")
+
+    with CorpusReader(path) as reader:
+        assert list(reader) == programs
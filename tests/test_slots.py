@@ -0,0 +1,132 @@
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from partial_eval_var import PartialEvalVar
+from program_generator import generate_program
+from slots import SlotInterpreterVar, SlotName, SlotPartialEvalVar, resolve_slots
+
+
+def test_resolve_slots_numbers_variables_densely():
+    program = Module(
+        [
+            Assign([Name("x")], Constant(1)),
+            Assign([Name("y")], BinOp(Name("x"), Add(), Constant(2))),
+            Assign([Name("x")], BinOp(Name("y"), Sub(), Name("x"))),
+        ]
+    )
+
+    resolved, table = resolve_slots(program)
+
+    assert table.names == ["x", "y"]
+    assert table.slots == {"x": 0, "y": 1}
+    target = resolved.body[2].targets[0]
+    assert isinstance(target, SlotName)
+    assert target.slot == 0
+    assert resolved.body[2].value.left.slot == 1
+
+
+def test_resolve_slots_reports_undefined_variable():
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Constant(1)])),
+            Assign([Name("x")], Name("y")),
+        ]
+    )
+
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        resolve_slots(program)
+
+
+def test_resolve_slots_allows_free_variables_on_request():
+    program = Module([Assign([Name("x")], BinOp(Name("y"), Add(), Constant(1)))])
+
+    _, table = resolve_slots(program, allow_free=True)
+
+    assert table.free == ["y"]
+    assert table.names == ["y", "x"]
+
+
+def test_slot_interpreter_reports_undefined_variable_before_running():
+    program = Module(
+        [
+            Expr(Call(Name("print"), [Constant(1)])),
+            Assign([Name("x")], Name("y")),
+        ]
+    )
+    output = ListOutput()
+
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        SlotInterpreterVar(program, output_channel=output).interp()
+    assert output.values == []
+
+
+def test_slot_interpreter_reads_variables_seeded_through_env():
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(Name("y"), Add(), Constant(1))),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+    output = ListOutput()
+
+    env = SlotInterpreterVar(program, output_channel=output).interp({"y": 41})
+
+    assert env == {"y": 41, "x": 42}
+    assert output.values == [42]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_slot_interpreter_matches_interpreter_var(seed):
+    program = generate_program(80, num_vars=20, input_rate=0.2, seed=seed)
+    inputs = list(range(300))
+    expected_out, slot_out = ListOutput(), ListOutput()
+
+    expected_env = InterpreterVar(program, BufferInput(inputs), expected_out).interp()
+    slot_env = SlotInterpreterVar(program, BufferInput(inputs), slot_out).interp()
+
+    assert slot_env == expected_env
+    assert slot_out.values == expected_out.values
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_slot_partial_evaluator_matches_partial_eval_var(seed):
+    program = generate_program(80, num_vars=20, input_rate=0.2, seed=seed)
+
+    expected = PartialEvalVar(program).pe()
+    result = SlotPartialEvalVar(program).pe()
+
+    assert repr(result) == repr(expected)
+
+
+def test_slot_partial_evaluator_keeps_free_variables_symbolic():
+    program = Module(
+        [
+            Assign([Name("x")], Constant(2)),
+            Assign([Name("y")], BinOp(Name("free"), Add(), Name("x"))),
+        ]
+    )
+
+    result = SlotPartialEvalVar(program).pe()
+
+    assert repr(result.body[1]) == repr(
+        Assign([Name("y")], BinOp(Name("free"), Add(), Constant(2)))
+    )
+
+
+def test_slot_partial_evaluator_propagates_and_invalidates_copies():
+    program = Module(
+        [
+            Assign([Name("y")], Name("x")),
+            Expr(Call(Name("print"), [Name("y")])),
+            Assign([Name("x")], Constant(1)),
+            Expr(Call(Name("print"), [Name("y")])),
+        ]
+    )
+
+    result = SlotPartialEvalVar(program).pe()
+
+    assert repr(result) == repr(PartialEvalVar(program).pe())
+    assert repr(result.body[1]) == repr(Expr(Call(Name("print"), [Name("x")])))
+    assert repr(result.body[3]) == repr(Expr(Call(Name("print"), [Name("y")])))
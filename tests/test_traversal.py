@@ -0,0 +1,76 @@
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Constant, Module, Name, Sub, USub, UnaryOp
+from compiler_var import CompilerVar
+from interpreter_var import InterpreterVar
+from partial_eval_var import PartialEvalVar
+from traversal import RECURSION_BUDGET, exp_children, postorder
+
+DEPTH = 10**6
+
+
+@pytest.fixture(scope="module")
+def deep_chain():
+    exp = Name("x")
+    for index in range(DEPTH):
+        exp = BinOp(exp, Add() if index % 2 else Sub(), Constant(1))
+    return exp
+
+
+def _count(exp):
+    return postorder(exp, exp_children, lambda node, values: 1 + sum(values))
+
+
+def test_postorder_visits_children_before_parents():
+    exp = BinOp(UnaryOp(USub(), Constant(1)), Add(), Name("x"))
+    seen = []
+
+    postorder(exp, exp_children, lambda node, values: seen.append(type(node).__name__))
+
+    assert seen == ["Constant", "UnaryOp", "Name", "BinOp"]
+
+
+@pytest.mark.parametrize("depth", [0, RECURSION_BUDGET, RECURSION_BUDGET + 1, 5_000])
+def test_postorder_combines_the_same_values_at_every_depth(depth):
+    exp = Constant(1)
+    for _ in range(depth):
+        exp = BinOp(UnaryOp(USub(), exp), Add(), BinOp(Constant(2), Sub(), Name("x")))
+
+    assert _count(exp) == 1 + 5 * depth
+
+
+def test_postorder_expands_each_node_once():
+    exp = Constant(0)
+    for _ in range(1_000):
+        exp = BinOp(Constant(1), Add(), exp)
+    expanded = []
+
+    def children(node):
+        expanded.append(node)
+        return exp_children(node)
+
+    postorder(exp, children, lambda node, values: None)
+
+    assert len(expanded) == 2_001
+
+
+def test_interp_exp_handles_deep_trees(deep_chain):
+    assert InterpreterVar(Module([])).interp_exp(deep_chain, {"x": 7}) == 7
+
+
+def test_pe_exp_handles_deep_trees(deep_chain):
+    assert PartialEvalVar(Module([])).pe_exp(deep_chain, {"x": 7}) == 7
+
+
+def test_rco_exp_handles_deep_trees(deep_chain):
+    compiler = CompilerVar()
+
+    module = compiler.remove_complex_operands(Module([Assign([Name("y")], deep_chain)]))
+
+    assert len(module.body) == DEPTH
+    assert module.body[0] == Assign(
+        [Name("tmp_0")], BinOp(Name("x"), Sub(), Constant(1))
+    )
+    assert module.body[-1] == Assign(
+        [Name("y")], BinOp(Name(f"tmp_{DEPTH - 2}"), Add(), Constant(1))
+    )
@@ -0,0 +1,137 @@
+import pytest
+
+from ast_nodes import Add, Assign, BinOp, Call, Constant, Expr, Module, Name, Sub
+from compiler_var import CompilerVar
+from interpreter_var import InterpreterVar
+from io_channels import BufferInput, ListOutput
+from program_generator import generate_program
+from value_numbering import eliminate_common_subexpressions
+
+
+def _print(exp):
+    return Expr(Call(Name("print"), [exp]))
+
+
+def _add(left, right):
+    return BinOp(left, Add(), right)
+
+
+def _input():
+    return Call(Name("input_int"), [])
+
+
+def _run(program, inputs):
+    output = ListOutput()
+    InterpreterVar(program, BufferInput(inputs), output).interp()
+    return output.values
+
+
+def test_reuses_a_variable_that_holds_the_value():
+    program = Module(
+        [
+            Assign([Name("x")], _add(Name("a"), Name("b"))),
+            Assign([Name("y")], BinOp(_add(Name("b"), Name("a")), Sub(), Constant(1))),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result.body[1] == Assign([Name("y")], BinOp(Name("x"), Sub(), Constant(1)))
+
+
+def test_introduces_a_tmp_for_repeated_subexpressions():
+    program = Module(
+        [
+            _print(_add(_add(Name("a"), Name("b")), Constant(1))),
+            _print(_add(_add(Name("a"), Name("b")), Constant(2))),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result == Module(
+        [
+            Assign([Name("cse_0")], _add(Name("a"), Name("b"))),
+            _print(_add(Name("cse_0"), Constant(1))),
+            _print(_add(Name("cse_0"), Constant(2))),
+        ]
+    )
+
+
+def test_tmp_names_skip_variables_the_program_already_uses():
+    program = Module(
+        [
+            Assign([Name("cse_0")], _input()),
+            _print(_add(_add(Name("a"), Name("cse_1")), Constant(1))),
+            _print(_add(_add(Name("a"), Name("cse_1")), Constant(2))),
+            _print(Name("cse_0")),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result.body[1] == Assign([Name("cse_2")], _add(Name("a"), Name("cse_1")))
+    env = {"a": 1, "cse_1": 2}
+    expected = ListOutput()
+    InterpreterVar(program, BufferInput([7]), expected).interp(dict(env))
+    actual = ListOutput()
+    InterpreterVar(result, BufferInput([7]), actual).interp(dict(env))
+    assert actual.values == expected.values == [4, 5, 7]
+
+
+def test_reassignment_stops_reuse_of_the_old_holder():
+    program = Module(
+        [
+            Assign([Name("x")], _add(Name("a"), Name("b"))),
+            Assign([Name("a")], Constant(0)),
+            Assign([Name("y")], _add(Name("a"), Name("b"))),
+            Assign([Name("x")], Constant(1)),
+            Assign([Name("z")], _add(Name("a"), Name("b"))),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result.body[2] == Assign([Name("y")], _add(Name("a"), Name("b")))
+    assert result.body[4] == Assign([Name("z")], Name("y"))
+
+
+def test_never_merges_input_int_calls():
+    program = Module(
+        [
+            Assign([Name("x")], _add(_input(), Constant(1))),
+            Assign([Name("y")], _add(_input(), Constant(1))),
+            _print(BinOp(Name("x"), Sub(), Name("y"))),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result == program
+    assert _run(result, [5, 7]) == [-2]
+
+
+def test_drops_assignments_of_the_value_already_held():
+    program = Module(
+        [
+            Assign([Name("x")], _add(Name("a"), Name("b"))),
+            Assign([Name("x")], _add(Name("b"), Name("a"))),
+            _print(Name("x")),
+        ]
+    )
+
+    result = eliminate_common_subexpressions(program)
+
+    assert result == Module([program.body[0], program.body[2]])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_preserves_behaviour_and_does_not_grow_compiled_code(seed):
+    program = generate_program(500, max_depth=5, input_rate=0.2, seed=seed)
+    inputs = list(range(2_000))
+
+    result = eliminate_common_subexpressions(program)
+
+    assert _run(result, inputs) == _run(program, inputs)
+    compiled = len(CompilerVar().compile(result).body)
+    assert compiled <= len(CompilerVar().compile(program).body)
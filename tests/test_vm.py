@@ -0,0 +1,92 @@
+import io
+
+import pytest
+
+from ast_nodes import (
+    Add,
+    Assign,
+    BinOp,
+    Call,
+    Constant,
+    Expr,
+    Module,
+    Name,
+    Sub,
+    USub,
+    UnaryOp,
+)
+from interpreter_var import InterpreterVar
+from program_generator import generate_program
+from vm import compile_bytecode, disassemble, run_bytecode
+
+
+def test_compile_assign_and_print():
+    program = Module(
+        [
+            Assign([Name("x")], BinOp(Constant(40), Add(), Constant(2))),
+            Expr(Call(Name("print"), [Name("x")])),
+        ]
+    )
+
+    bytecode = compile_bytecode(program)
+
+    assert disassemble(bytecode) == ["add r0, r1, r2", "print r0"]
+    assert run_bytecode(bytecode) == [42]
+
+
+def test_temporaries_are_reused_between_statements():
+    exp = BinOp(UnaryOp(USub(), Constant(1)), Sub(), UnaryOp(USub(), Constant(2)))
+    program = Module([Expr(Call(Name("print"), [exp]))] * 50)
+
+    bytecode = compile_bytecode(program)
+
+    assert len(bytecode.initial_regs) == 5
+    assert run_bytecode(bytecode) == [1] * 50
+
+
+def test_input_is_read_in_evaluation_order():
+    program = Module(
+        [
+            Expr(
+                Call(
+                    Name("print"),
+                    [
+                        BinOp(
+                            Call(Name("input_int"), []),
+                            Sub(),
+                            Call(Name("input_int"), []),
+                        )
+                    ],
+                )
+            )
+        ]
+    )
+
+    assert run_bytecode(compile_bytecode(program), [10, 3]) == [7]
+
+
+def test_undefined_variable_raises_at_run_time():
+    program = Module([Assign([Name("x")], Name("y"))])
+    bytecode = compile_bytecode(program)
+
+    with pytest.raises(ValueError, match="undefined variable: y"):
+        run_bytecode(bytecode)
+
+
+def test_run_reports_exhausted_input():
+    program = Module([Assign([Name("x")], Call(Name("input_int"), []))])
+
+    with pytest.raises(EOFError):
+        run_bytecode(compile_bytecode(program), [])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vm_matches_interpreter_on_generated_programs(seed, monkeypatch, capsys):
+    program = generate_program(80, max_depth=4, seed=seed)
+    inputs = list(range(-seed, 200))
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(f"{n}\n" for n in inputs)))
+
+    InterpreterVar(program).interp()
+    expected = [int(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert run_bytecode(compile_bytecode(program), inputs) == expected